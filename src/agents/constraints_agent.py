@@ -6,6 +6,7 @@ from ..models.scheduled_task import ScheduledTask
 from ..models.production_step import ProductionStep
 from ..models.employee import Employee
 from ..config import STATIONS_PER_DAY, WORKERS_PER_STATION, MAX_WORKER_TASKS_PER_DAY
+from ..utils.fingerprint import EvaluationMemo, schedule_key
 from datetime import date
 
 class ConstraintsAgent(BaseAgent):
@@ -26,13 +27,39 @@ class ConstraintsAgent(BaseAgent):
             - Dependency violations (dependent steps scheduled before prerequisites)
             """
         )
+        self.feasibility_memo = EvaluationMemo()
     
     def check_feasibility(self,
                          tasks: List[ScheduledTask],
                          steps: List[ProductionStep],
                          employees: List[Employee],
                          previous_reasoning: List[str] = None) -> Tuple[bool, List[Dict]]:
-        """Check schedule feasibility with comprehensive constraint checking."""
+        """Check schedule feasibility with comprehensive constraint checking.
+
+        Results are memoised by schedule and problem fingerprint, so checking
+        an unchanged schedule again is a cache hit (see feasibility_memo).
+        """
+        key = (schedule_key(tasks), self._problem_key(steps, employees))
+        result = self.feasibility_memo.get(key)
+        if result is None:
+            result = self._check_feasibility(tasks, steps, employees)
+            self.feasibility_memo.put(key, result)
+        is_feasible, violations = result
+        return is_feasible, [dict(v) for v in violations]
+
+    def _problem_key(self, steps: List[ProductionStep], employees: List[Employee]) -> int:
+        """Hash of the step and employee fields the feasibility check reads."""
+        return hash((
+            tuple((s.step_id, s.activity_id, tuple(s.depends_on), s.min_units_to_start) for s in steps),
+            tuple((e.id, tuple(e.skills), frozenset(e.availability), e.am_shift_available,
+                   e.pm_shift_available, frozenset((d, frozenset(slots)) for d, slots in e.shift_availability.items()))
+                  for e in employees)
+        ))
+
+    def _check_feasibility(self,
+                           tasks: List[ScheduledTask],
+                           steps: List[ProductionStep],
+                           employees: List[Employee]) -> Tuple[bool, List[Dict]]:
         
         violations = []
         
@@ -66,9 +93,12 @@ class ConstraintsAgent(BaseAgent):
                 tasks_by_step[task.step_id] = []
             tasks_by_step[task.step_id].append(task)
         
+        employee_map = {e.id: e for e in employees}
+        step_map = {s.step_id: s for s in steps}
+        
         # 1. Check worker availability and skills
         for (worker_id, day), worker_tasks in tasks_by_worker.items():
-            worker = next(e for e in employees if e.id == worker_id)
+            worker = employee_map[worker_id]
             
             # Check availability
             if day not in worker.availability:
@@ -81,7 +111,7 @@ class ConstraintsAgent(BaseAgent):
             
             # Check skills
             for task in worker_tasks:
-                step = next(s for s in steps if s.step_id == task.step_id)
+                step = step_map[task.step_id]
                 if step.activity_id not in worker.skills:
                     violations.append({
                         'type': 'skill_mismatch',
@@ -1,12 +1,18 @@
 from typing import List, Dict
 import datetime
 import json
+import logging
 from crewai import Task, Crew
 from .base_agent import BaseAgent
 from ..models.purchase_order import PurchaseOrder
 from ..models.production_step import ProductionStep
+from ..utils.dag import StepGraph
+from ..utils.critical_path import CriticalPathAnalysis
+from ..utils.priority_engine import PriorityEngine
 from ..config import STATIONS_PER_DAY
 
+logger = logging.getLogger(__name__)
+
 class PriorityAgent(BaseAgent):
     """
     Agent responsible for analyzing and adjusting priorities based on current state.
@@ -23,70 +29,45 @@ class PriorityAgent(BaseAgent):
             while considering deadlines, dependencies, and resource constraints.
             """
         )
+        self.critical_path_analysis = None  # Set by _calculate_critical_paths
     
     def update_priorities(self,
                          purchase_orders: List[PurchaseOrder],
                          steps: List[ProductionStep],
                          previous_reasoning: str = None,
-                         previous_violations: List[Dict] = None) -> None:
-        """Update priorities for our three orders (PO-101, PO-102, PO-103)."""
+                         previous_violations: List[Dict] = None,
+                         reference_date: datetime.date = None) -> None:
+        """Update effective priorities of all orders in one batch.
+
+        Scores base priority, deadline (days from reference_date, default
+        today), value and critical-path length; see PriorityEngine.
+        """
+        critical_paths = self._calculate_critical_paths(purchase_orders, steps)
+        path_days = {po_id: data['total_time'] for po_id, data in critical_paths.items()}
         
-        # Build dependency graph
-        dep_graph = self._build_dependency_graph(steps)
-        critical_paths = self._find_critical_paths(steps, dep_graph)
+        engine = PriorityEngine(reference_date)
+        priorities = engine.update(purchase_orders, path_days)
         
-        for po in purchase_orders:
-            # Base priority (0-100)
-            base_score = po.base_priority
-            
-            # Deadline factor (-20 to +20)
-            days_until_due = (po.due_date - datetime.date.today()).days
-            deadline_score = 20 - (days_until_due * 2)
-            
-            # Value factor (0 to 15)
-            max_value = max(p.value for p in purchase_orders)
-            value_score = (po.value / max_value) * 15
-            
-            # Calculate final priority
-            po.effective_priority = min(100, max(1,
-                base_score +
-                deadline_score +
-                value_score
-            ))
-            
-            print(f"Updated {po.id} priority to {po.effective_priority}")
-            print(f"- Base: {base_score}")
-            print(f"- Deadline ({days_until_due} days): {deadline_score}")
-            print(f"- Value (${po.value:,}): {value_score}")
+        logger.info("Updated priorities for %d orders", len(purchase_orders))
+        if logger.isEnabledFor(logging.INFO):
+            top = sorted(zip(priorities, (po.id for po in purchase_orders)), reverse=True)[:5]
+            if top:
+                logger.info("- Highest: %s", ", ".join(f"{po_id} ({priority:.1f})" for priority, po_id in top))
     
     def _build_dependency_graph(self, steps: List[ProductionStep]) -> Dict[str, List[str]]:
-        """Build graph of step dependencies."""
-        graph = {}
-        for step in steps:
-            graph[step.step_id] = []
-            for other in steps:
-                if step.step_id in other.depends_on:
-                    graph[step.step_id].append(other.step_id)
-        return graph
+        """Build graph of step dependencies (step_id -> dependent step ids)."""
+        graph = StepGraph.for_steps(steps)
+        return {step_id: graph.successors(step_id) for step_id in graph.step_ids}
     
-    def _find_critical_paths(self, steps: List[ProductionStep], 
-                           dep_graph: Dict[str, List[str]]) -> List[List[ProductionStep]]:
-        """Find critical paths in dependency graph."""
-        critical_paths = []
-        start_steps = [s for s in steps if not s.depends_on]
-        
-        for start in start_steps:
-            path = [start]
-            while True:
-                current = path[-1]
-                next_steps = [s for s in steps if s.step_id in dep_graph[current.step_id]]
-                if not next_steps:
-                    if len(path) > 2:  # Only consider significant paths
-                        critical_paths.append(path.copy())
-                    break
-                path.append(max(next_steps, key=lambda s: s.duration_days))
-        
-        return critical_paths
+    def _find_critical_paths(self, steps: List[ProductionStep]) -> List[List[ProductionStep]]:
+        """Find each PO's critical path by step duration."""
+        step_map = {step.step_id: step for step in steps}
+        analysis = CriticalPathAnalysis(steps, {step.step_id: step.duration_days for step in steps})
+        return [
+            [step_map[step_id] for step_id in path]
+            for _, path in analysis.critical_paths().values()
+            if len(path) > 2  # Only consider significant paths
+        ]
     
     def _calculate_processing_times(self, steps: List[ProductionStep]) -> Dict[str, float]:
         """Calculate total processing time needed for each PO."""
@@ -117,74 +98,42 @@ class PriorityAgent(BaseAgent):
         return count
 
     def _calculate_critical_paths(self, purchase_orders: List[PurchaseOrder], steps: List[ProductionStep]) -> Dict:
-        critical_paths = {}
-        
-        # Group steps by PO
-        po_steps = {}
-        for step in steps:
-            if step.purchase_order_id not in po_steps:
-                po_steps[step.purchase_order_id] = []
-            po_steps[step.purchase_order_id].append(step)
+        """Critical path and minimum completion time per PO, in one pass over all steps."""
+        po_map = {po.id: po for po in purchase_orders}
+        po_steps = [step for step in steps if step.purchase_order_id in po_map]
+        durations = {
+            step.step_id: self._step_processing_time(step, po_map[step.purchase_order_id].units)
+            for step in po_steps
+        }
+        self.critical_path_analysis = CriticalPathAnalysis(po_steps, durations)
         
+        critical_paths = {}
+        po_paths = self.critical_path_analysis.critical_paths()
         for po in purchase_orders:
-            if po.id not in po_steps:
+            if po.id not in po_paths:
                 continue
-                
-            # Calculate earliest possible completion time for each step
-            earliest_completion = {}  # step_id -> (time, path)
-            steps_to_process = po_steps[po.id].copy()
-            
-            # Start with steps that have no dependencies
-            ready_steps = [s for s in steps_to_process if not s.depends_on]
-            for step in ready_steps:
-                # Calculate time considering units and parallel processing
-                total_units = po.units
-                parallel_batches = (total_units + step.units_per_station - 1) // step.units_per_station
-                processing_time = parallel_batches * step.duration_days + step.setup_time_days + step.teardown_time_days
-                earliest_completion[step.step_id] = (processing_time, [step.step_id])
-                steps_to_process.remove(step)
-            
-            # Process remaining steps
-            while steps_to_process:
-                next_steps = []
-                for step in steps_to_process:
-                    # Check if all dependencies are processed
-                    if all(dep in earliest_completion for dep in step.depends_on):
-                        # Find the latest completing dependency
-                        dep_times = [(earliest_completion[dep][0], dep) for dep in step.depends_on]
-                        latest_dep_time, critical_dep = max(dep_times, key=lambda x: x[0])
-                        
-                        # Calculate this step's completion time
-                        total_units = po.units
-                        parallel_batches = (total_units + step.units_per_station - 1) // step.units_per_station
-                        processing_time = parallel_batches * step.duration_days + step.setup_time_days + step.teardown_time_days
-                        
-                        # Consider minimum units needed to start
-                        if step.min_units_to_start > 1:
-                            # Add time for initial units to complete
-                            initial_batch_time = (step.min_units_to_start / step.units_per_station) * step.duration_days
-                            processing_time += initial_batch_time
-                        
-                        total_time = latest_dep_time + processing_time
-                        critical_path = earliest_completion[critical_dep][1] + [step.step_id]
-                        
-                        earliest_completion[step.step_id] = (total_time, critical_path)
-                        next_steps.append(step)
-                
-                for step in next_steps:
-                    steps_to_process.remove(step)
-            
-            # Find the overall critical path
-            if earliest_completion:
-                latest_time, critical_path = max(earliest_completion.values(), key=lambda x: x[0])
-                critical_paths[po.id] = {
-                    'total_time': latest_time,
-                    'path': critical_path,
-                    'units': po.units
-                }
+            latest_time, critical_path = po_paths[po.id]
+            critical_paths[po.id] = {
+                'total_time': latest_time,
+                'path': critical_path,
+                'units': po.units
+            }
         
         return critical_paths
 
+    def _step_processing_time(self, step: ProductionStep, total_units: int) -> float:
+        """Days to run all units of a step, including setup and teardown."""
+        # Calculate time considering units and parallel processing
+        parallel_batches = (total_units + step.units_per_station - 1) // step.units_per_station
+        processing_time = parallel_batches * step.duration_days + step.setup_time_days + step.teardown_time_days
+        
+        # Consider minimum units needed to start
+        if step.depends_on and step.min_units_to_start > 1:
+            # Add time for initial units to complete
+            initial_batch_time = (step.min_units_to_start / step.units_per_station) * step.duration_days
+            processing_time += initial_batch_time
+        return processing_time
+
     def _format_critical_paths(self, critical_paths: Dict) -> str:
         formatted = []
         for po_id, data in critical_paths.items():
@@ -1,6 +1,11 @@
-from typing import List, Callable, Set, Dict
+from typing import List, Callable, Set, Dict, AsyncIterator
+import asyncio
+import functools
 import json
+import logging
 import datetime
+import threading
+import time
 from crewai import Task, Crew
 from .base_agent import BaseAgent
 from ..models.scheduled_task import ScheduledTask
@@ -9,9 +14,19 @@ from ..models.employee import Employee
 from ..models.purchase_order import PurchaseOrder
 from .constraints_agent import ConstraintsAgent
 from ..models.locked_assignment import LockedAssignment
-from ..config import STATIONS_PER_DAY, WORKERS_PER_STATION, MAX_WORKER_TASKS_PER_DAY
+from ..config import (
+    STATIONS_PER_DAY, WORKERS_PER_STATION, MAX_WORKER_TASKS_PER_DAY, TIME_SLOTS,
+    LOCAL_SEARCH_ENABLED, LOCAL_SEARCH_TIME_BUDGET, LOCAL_SEARCH_MAX_ITERATIONS, LOCAL_SEARCH_WORKERS,
+    ANYTIME_TIME_BUDGET, ANYTIME_SLICE
+)
+from ..utils.local_search import SearchState, LocalSearch, RefinementUpdate
+from ..utils.parallel_search import ParallelLocalSearch
+from ..utils.schedule_overlay import ScheduleOverlay
+from ..utils.llm_gateway import kickoff
 import copy
 
+logger = logging.getLogger(__name__)
+
 class RefinementAgent(BaseAgent):
     """
     Agent responsible for improving schedule quality through local modifications.
@@ -32,6 +47,7 @@ class RefinementAgent(BaseAgent):
             4. Keep critical paths moving
             """
         )
+        self.last_refinement_stats: Dict[str, int] = {}
     
     def refine_schedule(self,
                        scheduled_tasks: List[ScheduledTask],
@@ -48,8 +64,171 @@ class RefinementAgent(BaseAgent):
         previous_reasoning = previous_reasoning or {}
         previous_violations = previous_violations or []
         
-        current_score = scoring_func(scheduled_tasks)
+        result = self._request_improvements(
+            scheduled_tasks, scoring_func(scheduled_tasks), steps, employees,
+            purchase_orders, previous_reasoning, previous_violations
+        )
+        refined = self._apply_improvements(
+            result, scheduled_tasks, scoring_func, constraints_agent, steps, employees,
+            previous_reasoning, locked_assignments
+        )
+        if LOCAL_SEARCH_ENABLED:
+            refined = self.refine_locally(
+                refined, scoring_func, constraints_agent, steps, employees, locked_assignments
+            )
+        return refined
+
+    def refine_anytime(self,
+                       scheduled_tasks: List[ScheduledTask],
+                       scoring_func,
+                       constraints_agent,
+                       steps: List[ProductionStep],
+                       employees: List[Employee],
+                       purchase_orders: List[PurchaseOrder],
+                       time_budget: float = ANYTIME_TIME_BUDGET,
+                       on_improvement: Callable[[RefinementUpdate], None] = None,
+                       locked_assignments: Set[LockedAssignment] = None,
+                       previous_reasoning: Dict[str, str] = None,
+                       previous_violations: List[Dict] = None,
+                       use_llm: bool = True) -> List[ScheduledTask]:
+        """Refine within time_budget seconds and return the best schedule found.
+
+        The LLM request runs in a background thread while local search improves
+        the schedule in ANYTIME_SLICE slices.  Every better feasible schedule,
+        from either source, is passed to on_improvement as a RefinementUpdate.
+        The LLM's modifications are applied to the input schedule it was shown
+        and the result replaces the best schedule only if it scores at least as
+        well.  An LLM answer that arrives after the budget is abandoned.
+        """
+        if not scheduled_tasks:
+            return scheduled_tasks
+            
+        previous_reasoning = previous_reasoning or {}
+        previous_violations = previous_violations or []
+        start = time.perf_counter()
+        deadline = start + time_budget
+        
+        best = scheduled_tasks
+        best_score = scoring_func(best)
+        state = SearchState(best, steps, employees, locked_assignments)
+        search = LocalSearch(state)
+        best_raw = state.raw_score()
+        improvements = 0
+        
+        # Ask the LLM in the background; local search runs meanwhile
+        llm_answer = {}
+        def request_improvements():
+            try:
+                llm_answer["result"] = self._request_improvements(
+                    scheduled_tasks, best_score, steps, employees,
+                    purchase_orders, previous_reasoning, previous_violations
+                )
+            except Exception as e:
+                llm_answer["error"] = e
+        llm_thread = None
+        if use_llm:
+            llm_thread = threading.Thread(target=request_improvements, daemon=True)
+            llm_thread.start()
+        
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            source = None
+            
+            if llm_thread is not None and not llm_thread.is_alive():
+                llm_thread = None
+                if "error" in llm_answer:
+                    logger.warning("Refinement request failed (%s)", llm_answer['error'])
+                    continue
+                # The answer refers to the tasks of the schedule it was asked about
+                candidate = self._apply_improvements(
+                    llm_answer["result"], scheduled_tasks, scoring_func, constraints_agent,
+                    steps, employees, previous_reasoning, locked_assignments
+                )
+                if candidate is scheduled_tasks:
+                    continue
+                if scoring_func(candidate) < best_score:
+                    logger.info("LLM proposal is worse than the schedule found meanwhile; dropped")
+                    continue
+                state = SearchState(candidate, steps, employees, locked_assignments)
+                search = LocalSearch(state)
+                best, best_raw, source = candidate, state.raw_score(), "llm"
+            elif LOCAL_SEARCH_ENABLED:
+                result = search.run(time_budget=min(ANYTIME_SLICE, remaining))
+                if (result.score > best_raw and
+                        constraints_agent.check_feasibility(result.schedule, steps, employees)[0] and
+                        scoring_func(result.schedule) >= best_score):
+                    best, best_raw, source = result.schedule, result.score, "local_search"
+            elif llm_thread is not None:
+                llm_thread.join(timeout=remaining)
+            else:
+                break
+            
+            if source:
+                best_score = scoring_func(best)
+                improvements += 1
+                if on_improvement:
+                    on_improvement(RefinementUpdate(
+                        schedule=best,
+                        score=best_score,
+                        raw_score=best_raw,
+                        source=source,
+                        elapsed=time.perf_counter() - start
+                    ))
         
+        if llm_thread is not None:
+            logger.info("LLM refinement did not answer within the time budget")
+        logger.info("Anytime refinement: %d improvements in %.2fs, score %.1f",
+                    improvements, time.perf_counter() - start, best_score)
+        return best
+
+    async def refine_stream(self,
+                            scheduled_tasks: List[ScheduledTask],
+                            scoring_func,
+                            constraints_agent,
+                            steps: List[ProductionStep],
+                            employees: List[Employee],
+                            purchase_orders: List[PurchaseOrder],
+                            **kwargs) -> AsyncIterator[RefinementUpdate]:
+        """Async generator over the improvements of refine_anytime.
+
+        Refinement runs in the event loop's default executor; takes the same
+        keyword arguments as refine_anytime except on_improvement.  The last
+        update yielded holds the best schedule.
+        """
+        loop = asyncio.get_running_loop()
+        updates: asyncio.Queue = asyncio.Queue()
+        
+        def on_improvement(update: RefinementUpdate):
+            loop.call_soon_threadsafe(updates.put_nowait, update)
+        
+        refinement = loop.run_in_executor(None, functools.partial(
+            self.refine_anytime, scheduled_tasks, scoring_func, constraints_agent,
+            steps, employees, purchase_orders, on_improvement=on_improvement, **kwargs
+        ))
+        while True:
+            next_update = asyncio.ensure_future(updates.get())
+            done, _ = await asyncio.wait({next_update, refinement}, return_when=asyncio.FIRST_COMPLETED)
+            if next_update in done:
+                yield next_update.result()
+                continue
+            next_update.cancel()
+            break
+        while not updates.empty():
+            yield updates.get_nowait()
+        await refinement
+
+    def _request_improvements(self,
+                              scheduled_tasks: List[ScheduledTask],
+                              current_score: float,
+                              steps: List[ProductionStep],
+                              employees: List[Employee],
+                              purchase_orders: List[PurchaseOrder],
+                              previous_reasoning: Dict[str, str],
+                              previous_violations: List[Dict]):
+        """Ask the LLM for schedule modifications and return its raw answer."""
+
         task = Task(
             description=f"""
             Previous Agents' Reasoning:
@@ -144,6 +323,9 @@ class RefinementAgent(BaseAgent):
                 "modifications": [
                     {
                         "task_id": "ST-1",
+                        "station_id": "S1",
+                        "day": "2024-03-14",
+                        "time_slot": "AM",
                         "changes": {
                             "employee_id": "E2",
                             "day": "2024-03-15"
@@ -152,6 +334,8 @@ class RefinementAgent(BaseAgent):
                 ],
                 "expected_benefits": "Detailed explanation of how these changes improve throughput"
             }
+            station_id, day and time_slot next to task_id identify the task's current
+            slot when a step has several tasks; each modification is evaluated on its own.
             IMPORTANT: Ensure the response is ONLY the JSON array, with no additional text.
             """,
             agent=self.agent
@@ -163,54 +347,181 @@ class RefinementAgent(BaseAgent):
             verbose=True
         )
         
-        result = crew.kickoff()
+        return kickoff(crew)
+
+    def _apply_improvements(self,
+                            result,
+                            scheduled_tasks: List[ScheduledTask],
+                            scoring_func,
+                            constraints_agent,
+                            steps: List[ProductionStep],
+                            employees: List[Employee],
+                            previous_reasoning: Dict[str, str] = None,
+                            locked_assignments: Set[LockedAssignment] = None) -> List[ScheduledTask]:
+        """Apply the LLM's proposed modifications one task at a time.
+
+        Each change is tried on an incrementally evaluated SearchState and
+        kept only if it adds no violations and raises the score (or removes a
+        violation), so one bad proposal no longer discards the good ones.  The
+        kept changes are collected in a ScheduleOverlay and re-checked with
+        constraints_agent and scoring_func; otherwise scheduled_tasks is
+        returned.  Counts are left in last_refinement_stats.
+        """
+        stats = {'modifications': 0, 'accepted': 0, 'rejected': 0, 'locked': 0, 'unmatched': 0, 'invalid': 0}
+        self.last_refinement_stats = stats
         try:
-            # Clean the result string to ensure it's valid JSON
-            result_str = str(result).strip()
-            if result_str.startswith('```json'):
-                result_str = result_str.split('```json')[1]
-            if result_str.endswith('```'):
-                result_str = result_str.split('```')[0]
-            result_str = result_str.strip()
-            
-            improvements = json.loads(result_str)
-            
-            # Create a copy of the schedule to test modifications
-            test_schedule = [ScheduledTask(**vars(t)) for t in scheduled_tasks]
-            
-            # Apply proposed changes
-            for mod in improvements.get("modifications", []):
-                task_id = mod["task_id"]
-                change = mod["changes"]
-                
-                for task in test_schedule:
-                    if task.step_id == task_id:
-                        if "employee_id" in change:
-                            task.employee_id = change["employee_id"]
-                        if "day" in change:
-                            # Extract just the date part before "Date: " prefix
-                            date_str = change["day"].replace("Date: ", "")
-                            task.day = datetime.date.fromisoformat(date_str)
-                        if "time_slot" in change:
-                            # Extract just the shift part after "Shift: " prefix
-                            shift = change["time_slot"].replace("Shift: ", "")
-                            task.time_slot = shift
-                        if "station_id" in change:
-                            task.station_id = change["station_id"]
-            
-            # Verify the modified schedule is feasible
-            if constraints_agent.check_feasibility(test_schedule, steps, employees, previous_reasoning)[0]:  # Get first element of tuple
-                new_score = scoring_func(test_schedule)
-                if new_score > current_score:
-                    print(f"Schedule improved: {improvements['expected_benefits']}")
-                    return test_schedule
-            
-            print("Proposed improvements did not yield a better feasible schedule")
+            improvements = self._parse_improvements(result)
+            modifications = improvements.get("modifications", [])
+            if not isinstance(modifications, list):
+                raise TypeError(f"modifications must be a list, got {type(modifications).__name__}")
+        except (json.JSONDecodeError, AttributeError, TypeError) as e:
+            logger.warning("Could not parse refinement suggestions (%s)", e)
+            return scheduled_tasks
+        if not scheduled_tasks or not modifications:
+            logger.info("Proposed improvements did not yield a better feasible schedule")
             return scheduled_tasks
+        
+        current_score = scoring_func(scheduled_tasks)
+        test_schedule = ScheduleOverlay(scheduled_tasks)
+        state = SearchState(scheduled_tasks, steps, employees, locked_assignments)
+        objective, violations = state.objective(), state.violations()
+        
+        for mod in modifications:
+            stats['modifications'] += 1
+            if not isinstance(mod, dict):
+                stats['invalid'] += 1
+                continue
+            try:
+                fields = self._parse_changes(mod["changes"])
+                positions = self._match_tasks(test_schedule, mod)
+            except (KeyError, TypeError, ValueError, AttributeError):
+                stats['invalid'] += 1
+                continue
+            if not fields:
+                stats['invalid'] += 1
+                continue
+            if not positions:
+                stats['unmatched'] += 1
+                continue
             
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
-            print(f"Warning: Could not parse refinement suggestions ({str(e)})")
+            # Try the change on each matching task on its own
+            for position in positions:
+                if not state.is_movable(position):
+                    stats['locked'] += 1
+                    continue
+                undo = state.apply(("llm", ((position, fields),)))
+                new_objective, new_violations = state.objective(), state.violations()
+                if new_violations <= violations and (new_objective > objective or new_violations < violations):
+                    test_schedule.update(position, **fields)
+                    objective, violations = new_objective, new_violations
+                    stats['accepted'] += 1
+                else:
+                    state.apply(undo)
+                    stats['rejected'] += 1
+        
+        logger.info("LLM proposals: %d modifications, %d task changes accepted, %d rejected, "
+                    "%d locked, %d unmatched, %d invalid",
+                    stats['modifications'], stats['accepted'], stats['rejected'],
+                    stats['locked'], stats['unmatched'], stats['invalid'])
+        
+        # Verify the modified schedule is feasible
+        if (test_schedule.is_modified and
+                constraints_agent.check_feasibility(test_schedule, steps, employees, previous_reasoning)[0] and
+                scoring_func(test_schedule) >= current_score):
+            logger.info("Schedule improved: %s", improvements.get('expected_benefits', ''))
+            return test_schedule.commit()
+        
+        logger.info("Proposed improvements did not yield a better feasible schedule")
+        return scheduled_tasks
+
+    def _parse_improvements(self, result) -> Dict:
+        """Decode the LLM answer, tolerating a ```json fence."""
+        result_str = str(result).strip()
+        if result_str.startswith('```json'):
+            result_str = result_str.split('```json')[1]
+        if result_str.endswith('```'):
+            result_str = result_str.split('```')[0]
+        return json.loads(result_str.strip())
+
+    def _parse_changes(self, change: Dict) -> Dict:
+        """Task fields to set from one modification's "changes"."""
+        fields = {}
+        if "employee_id" in change:
+            fields["employee_id"] = change["employee_id"]
+        if "day" in change:
+            # Extract just the date part before "Date: " prefix
+            fields["day"] = self._parse_day(change["day"])
+        if "time_slot" in change:
+            # Extract just the shift part after "Shift: " prefix
+            time_slot = change["time_slot"].replace("Shift: ", "")
+            if time_slot not in TIME_SLOTS:
+                raise ValueError(f"Invalid time_slot: {time_slot}")
+            fields["time_slot"] = time_slot
+        if "station_id" in change:
+            fields["station_id"] = change["station_id"]
+        return fields
+
+    def _match_tasks(self, schedule: ScheduleOverlay, mod: Dict) -> List[int]:
+        """Positions of the tasks a modification refers to.
+
+        task_id names the step; station_id, day, time_slot, units_start and
+        units_end given next to it narrow the match to the task currently
+        scheduled there.
+        """
+        criteria = {}
+        for name in ("station_id", "time_slot", "units_start", "units_end"):
+            if name in mod:
+                criteria[name] = mod[name]
+        if "time_slot" in criteria:
+            criteria["time_slot"] = criteria["time_slot"].replace("Shift: ", "")
+        if "day" in mod:
+            criteria["day"] = self._parse_day(mod["day"])
+        return [
+            position for position in schedule.positions_for_step(mod["task_id"])
+            if all(getattr(schedule[position], name) == value for name, value in criteria.items())
+        ]
+
+    def _parse_day(self, value: str) -> datetime.date:
+        return datetime.date.fromisoformat(value.replace("Date: ", ""))
+
+    def refine_locally(self,
+                       scheduled_tasks: List[ScheduledTask],
+                       scoring_func,
+                       constraints_agent,
+                       steps: List[ProductionStep],
+                       employees: List[Employee],
+                       locked_assignments: Set[LockedAssignment] = None,
+                       time_budget: float = LOCAL_SEARCH_TIME_BUDGET,
+                       max_iterations: int = LOCAL_SEARCH_MAX_ITERATIONS,
+                       workers: int = LOCAL_SEARCH_WORKERS) -> List[ScheduledTask]:
+        """Improve a schedule with deterministic late-acceptance local search.
+
+        Moves relocate or swap tasks between stations and shifts, shift unit
+        ranges between tasks of a step and reassign workers.  With more than
+        one worker, independent searches with different seeds run in a process
+        pool and the best one is kept.  Runs stop after max_iterations moves,
+        so the result does not depend on machine speed; time_budget is only a
+        safety limit.  The result is re-checked with constraints_agent and
+        scoring_func before it replaces the input.
+        """
+        if not scheduled_tasks:
             return scheduled_tasks
+            
+        if workers > 1:
+            search = ParallelLocalSearch(scheduled_tasks, steps, employees, locked_assignments,
+                                         workers=workers)
+        else:
+            search = LocalSearch(SearchState(scheduled_tasks, steps, employees, locked_assignments))
+        result = search.run(time_budget=time_budget, max_iterations=max_iterations)
+        logger.info("Local search: %d moves in %.2fs (%.0f/s), %d accepted, raw score %.1f -> %.1f",
+                    result.iterations, result.elapsed, result.moves_per_second, result.accepted,
+                    result.initial_score, result.score)
+        
+        if (result.score > result.initial_score and
+                constraints_agent.check_feasibility(result.schedule, steps, employees)[0] and
+                scoring_func(result.schedule) >= scoring_func(scheduled_tasks)):
+            return result.schedule
+        return scheduled_tasks
     
     def _format_current_schedule(self, tasks: List[ScheduledTask]) -> str:
         # Group by day and shift
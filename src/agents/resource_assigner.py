@@ -1,20 +1,31 @@
 from typing import List, Dict, Set, Optional
 import json
+import logging
 from crewai import Task, Crew
 from .base_agent import BaseAgent
 from ..models.employee import Employee
 from ..models.scheduled_task import ScheduledTask
 from ..models.production_step import ProductionStep
 from ..models.locked_assignment import LockedAssignment
-from ..config import STATIONS_PER_DAY, WORKERS_PER_STATION, MAX_WORKER_TASKS_PER_DAY
+from ..config import (
+    STATIONS_PER_DAY, WORKERS_PER_STATION, MAX_WORKER_TASKS_PER_DAY, ASSIGNMENT_STRATEGY,
+    EXTRA_TASK_PENALTY, SHIFT_LIMIT_PENALTY, SKILL_SCARCITY_WEIGHT
+)
+from ..utils.worker_load import WorkerLoadIndex
+from ..utils.assignment_solver import solve_assignment, INFEASIBLE_COST
+from ..utils.availability import AvailabilityCalendar
+from ..utils.decision_log import get_decision_log
 import datetime
+import copy
+
+logger = logging.getLogger(__name__)
 
 class ResourceAssigner(BaseAgent):
     """
     Agent responsible for matching employees to scheduled tasks based on skills and availability.
     """
     
-    def __init__(self, employees: List[Employee]):
+    def __init__(self, employees: List[Employee], strategy: str = ASSIGNMENT_STRATEGY):
         super().__init__(
             name="Resource Manager",
             role="Resource Allocation Specialist",
@@ -25,9 +36,17 @@ class ResourceAssigner(BaseAgent):
             their skills, availability, and workload balance.
             """
         )
+        if strategy not in ("matching", "greedy"):
+            raise ValueError(f"Unknown assignment strategy: {strategy}")
         self.employees = employees
+        self.strategy = strategy
         self.current_tasks = []  # Track current assignments
         self.production_steps = None  # Will be set during assign_resources
+        self.load_index: Optional[WorkerLoadIndex] = None  # Built during assign_resources
+        self.calendar: Optional[AvailabilityCalendar] = None  # Built during assign_resources
+        self.last_assignment_stats: Dict[str, int] = {}
+        self._step_map: Dict[str, ProductionStep] = {}
+        self._assignments: Dict[tuple, List[ScheduledTask]] = {}  # Indexed assignments from the last call
     
     def assign_resources(self,
                         scheduled_tasks: List[ScheduledTask],
@@ -35,50 +54,239 @@ class ResourceAssigner(BaseAgent):
                         locked_assignments: Set[LockedAssignment] = None,
                         previous_violations: List[Dict] = None,
                         previous_reasoning: str = None) -> None:
-        """Assign resources using skill-based matching and workload balancing."""
+        """Assign resources using skill-based matching and workload balancing.
+
+        Workers from locked_assignments are kept fixed.  Load state is reused
+        from the previous call: tasks that are unchanged since then (same
+        shift, station, step and units) keep their worker, and only new or
+        changed tasks are assigned again.
+        """
         
         if not self.employees:
             raise ValueError("No employees available for assignment")
-            
-        # Store production steps for load calculations
-        self.production_steps = production_steps
 
         # Validate employee skills
         for emp in self.employees:
             if not emp.skills:
                 raise ValueError(f"Employee {emp.id} has no skills assigned")
 
-        # Group tasks by activity for better assignment
+        # Load state is only reusable for the same steps
+        if production_steps is not self.production_steps or self.load_index is None:
+            self._step_map = {s.step_id: s for s in production_steps}
+            self.load_index = WorkerLoadIndex(self.employees, self._step_map)
+            self._assignments = {}
+            
+        # Store production steps for load calculations
+        self.production_steps = production_steps
+        self.current_tasks = scheduled_tasks
+        step_map = self._step_map
+        self.calendar = AvailabilityCalendar(self.employees, {t.day for t in scheduled_tasks})
+
+        locked_workers = {
+            (lock.step_id, lock.station_id, lock.day, lock.time_slot): lock.employee_id
+            for lock in locked_assignments or ()
+            if lock.employee_id
+        }
+
+        previous = self._assignments  # task key -> List[task snapshots]
+        self._assignments = {}
+        stats = {'reused': 0, 'locked': 0, 'assigned': 0, 'removed': 0}
+        decisions = get_decision_log()
+        
+        # Group changed tasks by activity for better assignment
         activity_tasks = {}  # activity_id -> List[tasks]
         for task in scheduled_tasks:
-            step = next(s for s in production_steps if s.step_id == task.step_id)
+            step = step_map[task.step_id]
             if not step.activity_id:
                 raise ValueError(f"Task {task.step_id} has no activity")
+
+            key = self._task_key(task)
+            prior = previous.get(key)
+            snapshot = prior.pop() if prior else None
+            fixed_worker = task.employee_id or locked_workers.get(
+                (task.step_id, task.station_id, task.day, task.time_slot)
+            )
+
+            if snapshot and fixed_worker in (None, snapshot.employee_id):
+                # Unchanged since last call, its load is already indexed
+                task.employee_id = snapshot.employee_id
+                self._record_assignment(key, task)
+                stats['reused'] += 1
+                continue
+            if snapshot:
+                self.load_index.remove(snapshot)
+            if fixed_worker:
+                task.employee_id = fixed_worker
+                self.load_index.add(task)
+                self._record_assignment(key, task)
+                stats['locked'] += 1
+                if decisions.sample():
+                    self._record_decision(decisions, task, "fixed by lock or existing assignment")
+                continue
                 
             if step.activity_id not in activity_tasks:
                 activity_tasks[step.activity_id] = []
             activity_tasks[step.activity_id].append(task)
 
-        # Assign workers by activity
-        for activity_id, tasks in activity_tasks.items():
-            # Get qualified workers
-            qualified_workers = [
-                emp for emp in self.employees 
-                if activity_id in emp.skills
-            ]
-            
-            if not qualified_workers:
+        # Drop the load of tasks that are gone
+        for snapshots in previous.values():
+            for snapshot in snapshots:
+                self.load_index.remove(snapshot)
+                stats['removed'] += 1
+
+        for activity_id in activity_tasks:
+            if not self.load_index.qualified_workers(activity_id):
                 raise ValueError(f"No qualified workers for activity {activity_id}")
 
-            # Assign workers to tasks
-            for task in tasks:
-                if not task.employee_id:  # Only assign if not already assigned
+        if self.strategy == "matching":
+            unassigned = [task for tasks in activity_tasks.values() for task in tasks]
+            self._assign_by_matching(unassigned, step_map)
+        else:
+            # Assign workers by activity
+            for activity_id, tasks in activity_tasks.items():
+                for task in tasks:
                     # Find least loaded qualified worker
-                    best_worker = min(
-                        qualified_workers,
-                        key=lambda w: self._get_worker_load(w.id, task.day, task.time_slot, scheduled_tasks)
+                    task.employee_id = self.load_index.least_loaded(
+                        activity_id, task.day, task.time_slot
                     )
-                    task.employee_id = best_worker.id
+                    if decisions.sample():
+                        self._record_decision(decisions, task, "least loaded qualified worker", [
+                            (worker_id, self.load_index.get_load(worker_id, task.day, task.time_slot))
+                            for worker_id in self.load_index.qualified_workers(activity_id)
+                        ])
+                    self.load_index.add(task)
+
+        for tasks in activity_tasks.values():
+            for task in tasks:
+                self._record_assignment(self._task_key(task), task)
+                stats['assigned'] += 1
+
+        self.last_assignment_stats = stats
+        logger.info("Resource assignment: %d assigned, %d reused, %d fixed, %d removed",
+                    stats['assigned'], stats['reused'], stats['locked'], stats['removed'])
+
+    def _record_decision(self, decisions, task: ScheduledTask, reason: str, candidates=()) -> None:
+        """Write one worker choice to the decision log (candidates are (worker, cost) pairs)."""
+        decisions.record(
+            "assign",
+            day=task.day,
+            time_slot=task.time_slot,
+            station_id=task.station_id,
+            step_id=task.step_id,
+            units=[task.units_start, task.units_end],
+            employee_id=task.employee_id,
+            candidates=decisions.top_candidates(candidates),
+            reason=reason
+        )
+
+    def _task_key(self, task: ScheduledTask) -> tuple:
+        """Identity of a task for incremental assignment."""
+        return (task.day, task.time_slot, task.station_id, task.step_id, task.units_start, task.units_end)
+
+    def _record_assignment(self, key: tuple, task: ScheduledTask) -> None:
+        """Remember an indexed assignment so the next call can reuse or undo it."""
+        if key not in self._assignments:
+            self._assignments[key] = []
+        self._assignments[key].append(copy.copy(task))
+
+    def _assign_by_matching(self, tasks: List[ScheduledTask], step_map: Dict[str, ProductionStep]) -> None:
+        """Assign workers shift by shift as a min-cost bipartite matching.
+
+        Shifts are solved in chronological order so each day's earlier shifts
+        count towards max_shifts_per_day.  Workers appear as several columns
+        (copies), later copies penalised: for every activity a worker can do,
+        ceil(tasks / qualified workers) copies, so each activity has enough
+        columns among its own workers however scarce they are.  Column
+        potentials are carried over between shifts to warm-start the solver.
+        """
+        shift_tasks = {}  # (day, slot) -> List[tasks]
+        for task in tasks:
+            key = (task.day, task.time_slot)
+            if key not in shift_tasks:
+                shift_tasks[key] = []
+            shift_tasks[key].append(task)
+
+        emp_order = {emp.id: idx for idx, emp in enumerate(self.employees)}
+        potentials = {}  # (worker_id, copy) -> column potential
+        decisions = get_decision_log()
+
+        for (day, slot), shift in sorted(shift_tasks.items(), key=lambda item: (item[0][0], item[0][1])):
+            demand = {}  # activity_id -> tasks this shift
+            for task in shift:
+                activity_id = step_map[task.step_id].activity_id
+                demand[activity_id] = demand.get(activity_id, 0) + 1
+            team = self.calendar.team_mask(day, slot)
+            qualified = {  # activity_id -> qualified workers on shift
+                activity_id: (team & self.calendar.qualified_mask((activity_id,))).bit_count()
+                for activity_id in demand
+            }
+
+            # Tasks nobody on shift can do fall back to the least loaded qualified worker
+            matched = []
+            for task in shift:
+                if qualified[step_map[task.step_id].activity_id]:
+                    matched.append(task)
+                    continue
+                self._assign_least_loaded(task, step_map)
+                if decisions.sample():
+                    self._record_decision(decisions, task, "no qualified worker on shift, least loaded fallback")
+            if not matched:
+                continue
+            shift = matched
+
+            candidates = self.calendar.employees_in(
+                team & self.calendar.qualified_mask({a for a, count in qualified.items() if count})
+            )
+            columns = []
+            for emp in candidates:
+                copies = sum(-(-demand[a] // qualified[a]) for a in demand if qualified[a] and a in emp.skills)
+                columns.extend((emp, copy) for copy in range(copies))
+
+            cost = []
+            for task in shift:
+                step = step_map[task.step_id]
+                task_load = self.load_index.task_load(task)
+                row = []
+                for emp, copy in columns:
+                    if step.activity_id not in emp.skills:
+                        row.append(INFEASIBLE_COST)
+                        continue
+                    worked = self.load_index.shifts_worked(emp.id, day)
+                    value = self.load_index.get_load(emp.id, day, slot) + task_load
+                    value += copy * EXTRA_TASK_PENALTY
+                    value += (len(emp.skills) - 1) * SKILL_SCARCITY_WEIGHT
+                    if slot not in worked and len(worked) >= emp.max_shifts_per_day:
+                        value += SHIFT_LIMIT_PENALTY
+                    value += emp_order[emp.id] * 1e-6  # Deterministic tie-break
+                    row.append(value)
+                cost.append(row)
+
+            warm_start = [potentials.get((emp.id, copy), 0.0) for emp, copy in columns]
+            assignment, column_potentials = solve_assignment(cost, warm_start)
+            for (emp, copy), potential in zip(columns, column_potentials):
+                potentials[(emp.id, copy)] = potential
+
+            for row, (task, col) in enumerate(zip(shift, assignment)):
+                if cost[row][col] >= INFEASIBLE_COST:
+                    # No qualified worker available this shift
+                    self._assign_least_loaded(task, step_map)
+                    reason = "no qualified worker on shift, least loaded fallback"
+                else:
+                    task.employee_id = columns[col][0].id
+                    self.load_index.add(task)
+                    reason = "min-cost matching"
+                if decisions.sample():
+                    self._record_decision(decisions, task, reason, [
+                        (f"{emp.id}#{copy}" if copy else emp.id, value)
+                        for (emp, copy), value in zip(columns, cost[row]) if value < INFEASIBLE_COST
+                    ])
+
+    def _assign_least_loaded(self, task: ScheduledTask, step_map: Dict[str, ProductionStep]) -> None:
+        """Assign the least loaded qualified worker to a single task."""
+        task.employee_id = self.load_index.least_loaded(
+            step_map[task.step_id].activity_id, task.day, task.time_slot
+        )
+        self.load_index.add(task)
     
     def _format_employees(self, employees: List[Employee]) -> str:
         return "\n".join([
@@ -233,18 +441,23 @@ class ResourceAssigner(BaseAgent):
         
         return "\n".join(loads)
 
+    def _get_load_index(self) -> WorkerLoadIndex:
+        """Load index for current_tasks, built on demand."""
+        if self.load_index is None:
+            step_map = {s.step_id: s for s in self.production_steps}
+            self.load_index = WorkerLoadIndex.from_tasks(self.employees, step_map, self.current_tasks)
+        return self.load_index
+
+    def _get_calendar(self) -> AvailabilityCalendar:
+        """Availability calendar over the days of current_tasks, built on demand."""
+        if self.calendar is None:
+            self.calendar = AvailabilityCalendar(self.employees, {t.day for t in self.current_tasks})
+        return self.calendar
+
     def _check_worker_capacity(self, worker_id: str, day: datetime.date, slot: str,
                              new_units: int, step: ProductionStep) -> bool:
         """Check if worker has capacity for additional units."""
-        current_time = 0
-        for task in self.current_tasks:
-            if (task.employee_id == worker_id and 
-                task.day == day and 
-                task.time_slot == slot):
-                units = task.units_end - task.units_start + 1
-                task_step = next(s for s in self.production_steps if s.step_id == task.step_id)
-                current_time += units * task_step.duration_days
-        
+        current_time = self._get_load_index().get_load(worker_id, day, slot)
         new_time = new_units * step.duration_days
         return (current_time + new_time) <= 0.5  # Half day per shift
 
@@ -252,37 +465,30 @@ class ResourceAssigner(BaseAgent):
                              time_slot: str, units: int) -> Optional[str]:
         """Find a worker with capacity who has the required skills."""
         processing_time = units * step.duration_days
+        index = self._get_load_index()
+        calendar = self._get_calendar()
         
-        # Find qualified workers
-        qualified_workers = [
-            emp for emp in self.employees
-            if step.activity_id in emp.skills
-            and day in emp.availability
-        ]
-        
-        # Sort by current load (prefer less loaded workers)
-        worker_loads = {}
-        for worker in qualified_workers:
-            key = (worker.id, day, time_slot)
-            current_load = sum(
-                (t.units_end - t.units_start + 1) * 
-                next(s.duration_days for s in self.production_steps if s.step_id == t.step_id)
-                for t in self.current_tasks
-                if t.employee_id == worker.id and t.day == day and t.time_slot == time_slot
-            )
-            worker_loads[worker.id] = current_load
-        
-        # Sort workers by load
-        qualified_workers.sort(key=lambda w: worker_loads[w.id])
+        # Least loaded qualified worker (ties go to employee order)
+        best_worker = None
+        best_load = None
+        for worker_id in index.qualified_workers(step.activity_id):
+            if not calendar.is_available_on_day(worker_id, day):
+                continue
+            load = index.get_load(worker_id, day, time_slot)
+            if best_load is None or load < best_load:
+                best_worker, best_load = worker_id, load
         
-        # Find first worker with capacity
-        for worker in qualified_workers:
-            if worker_loads[worker.id] + processing_time <= 0.5:
-                return worker.id 
+        # The least loaded worker has the most spare capacity
+        if best_worker is not None and best_load + processing_time <= 0.5:
+            return best_worker
 
     def _get_worker_load(self, worker_id: str, day: datetime.date, time_slot: str, 
                         scheduled_tasks: List[ScheduledTask]) -> float:
         """Calculate worker's current load for a specific shift."""
+        if self.load_index is not None and scheduled_tasks is self.current_tasks:
+            return self.load_index.get_load(worker_id, day, time_slot)
+        
+        step_map = {s.step_id: s for s in self.production_steps}
         current_load = 0.0
         
         # Sum up processing time for all tasks assigned to this worker in this shift
@@ -290,9 +496,8 @@ class ResourceAssigner(BaseAgent):
             if (task.employee_id == worker_id and 
                 task.day == day and 
                 task.time_slot == time_slot):
-                # Get step info to calculate processing time
-                step = next(s for s in self.production_steps if s.step_id == task.step_id)
+                step = step_map[task.step_id]
                 units = task.units_end - task.units_start + 1
                 current_load += units * step.duration_days
         
-        return current_load 
\ No newline at end of file
+        return current_load
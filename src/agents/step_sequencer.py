@@ -7,9 +7,14 @@ from ..models.purchase_order import PurchaseOrder
 from ..models.production_step import ProductionStep
 from ..models.scheduled_task import ScheduledTask
 from ..models.locked_assignment import LockedAssignment
+from ..utils.dag import StepGraph
+from ..utils.decision_log import get_decision_log
 import json
+import logging
 from ..config import STATIONS_PER_DAY
 
+logger = logging.getLogger(__name__)
+
 class StepSequencer(BaseAgent):
     """
     Agent responsible for creating initial feasible schedules.
@@ -30,6 +35,7 @@ class StepSequencer(BaseAgent):
         self.date_list = date_list
         self.production_steps = None  # Will be set during create_schedule
         self.purchase_orders = None  # Will be set during create_schedule
+        self.carried_units: Dict[str, set] = {}  # step_id -> units finished before date_list[0]
     
     def create_schedule(self,
                        purchase_orders: List[PurchaseOrder],
@@ -44,8 +50,9 @@ class StepSequencer(BaseAgent):
         station_states = {s.id: s.current_activity_id for s in self.station_list}
         
         # Track progress per PO - moved outside day loop to persist across days
-        completed_units = {}  # step_id -> set(completed units)
+        completed_units = {step_id: set(units) for step_id, units in self.carried_units.items()}
         scheduled_tasks = []
+        decisions = get_decision_log()
 
         for current_day in self.date_list:
             for time_slot in ["AM", "PM"]:
@@ -104,6 +111,25 @@ class StepSequencer(BaseAgent):
                                 units_end=max(units)
                             )
                             
+                            if decisions.sample():
+                                previous_activity = station_states[best_station]
+                                decisions.record(
+                                    "sequence",
+                                    day=current_day,
+                                    time_slot=time_slot,
+                                    step_id=step.step_id,
+                                    purchase_order_id=po.id,
+                                    units=[task.units_start, task.units_end],
+                                    score=round(score, 4),
+                                    station_id=best_station,
+                                    candidates=decisions.top_candidates(
+                                        ((work[1].step_id, work[0]) for work in scored_work), reverse=True
+                                    ),
+                                    reason=("station already set up" if not needs_setup else
+                                            f"setup from {previous_activity}" if previous_activity else
+                                            "setup on idle station")
+                                )
+                            
                             scheduled_tasks.append(task)
                             scheduled_this_shift.add(best_station)
                             station_states[best_station] = step.activity_id
@@ -122,16 +148,16 @@ class StepSequencer(BaseAgent):
                                 available_work.append((step, po, new_units))
                             break
 
-                # Print end of day progress if PM shift
-                if time_slot == "PM":
-                    print(f"\n  End of Day Progress:")
+                # Log end of day progress if PM shift
+                if time_slot == "PM" and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("  End of Day Progress:")
                     for po in purchase_orders:
                         po_steps = [s for s in steps if s.purchase_order_id == po.id]
                         progress, active_steps = self._calculate_po_progress(
                             po, po_steps, completed_units
                         )
-                        print(f"    Order {po.id}: {progress:.1f}% complete "
-                              f"({active_steps}/8 steps active)")
+                        logger.debug("    Order %s: %.1f%% complete (%d/%d steps active)",
+                                     po.id, progress, active_steps, len(po_steps))
 
         return scheduled_tasks
 
@@ -544,12 +570,9 @@ class StepSequencer(BaseAgent):
         return priority_score + progress_score + dep_score + efficiency_score
 
     def _get_dependency_chain(self, step: ProductionStep) -> List[str]:
-        """Get all steps in this step's dependency chain."""
-        chain = [step.step_id]
-        for dep_id in step.depends_on:
-            dep_step = next(s for s in self.production_steps if s.step_id == dep_id)
-            chain.extend(self._get_dependency_chain(dep_step))
-        return chain
+        """Get all steps in this step's dependency chain (nearest dependencies first)."""
+        graph = StepGraph.for_steps(self.production_steps)
+        return [step.step_id] + graph.ids_in(graph.ancestor_mask(step.step_id))[::-1]
 
     def _fill_remaining_stations(self,
                                remaining_count: int,
@@ -640,14 +663,11 @@ class StepSequencer(BaseAgent):
         return None, True
 
     def _get_dependent_steps(self, step_id: str, steps: List[ProductionStep]) -> List[str]:
-        """Get all steps that depend on this one."""
-        dependent_steps = []
-        for step in steps:
-            if step_id in step.depends_on:
-                dependent_steps.append(step.step_id)
-                # Also get steps that depend on this dependent step
-                dependent_steps.extend(self._get_dependent_steps(step.step_id, steps))
-        return list(set(dependent_steps))  # Remove duplicates
+        """Get all steps that depend on this one, in topological order."""
+        graph = StepGraph.for_steps(steps)
+        if step_id not in graph:
+            return []
+        return graph.ids_in(graph.descendant_mask(step_id))
 
     def _can_start_step(self, step: ProductionStep, completed_units: Dict[str, set]) -> bool:
         """Check if a step can be started based on dependencies."""
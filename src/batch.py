@@ -0,0 +1,198 @@
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import csv
+import datetime
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import time
+from .config import (
+    config, LOG_LEVEL, SCHEDULE_EXPORT_PATH, REPORT_HTML_PATH, SERVICE_PLANNING_DAYS,
+    BATCH_INSTANCE_PATTERN, BATCH_WORKERS, BATCH_LLM_CALLS_PER_MINUTE, BATCH_LLM_CACHE_SIZE
+)
+from .agents.priority_agent import PriorityAgent
+from .agents.constraints_agent import ConstraintsAgent
+from .agents.step_sequencer import StepSequencer
+from .agents.resource_assigner import ResourceAssigner
+from .agents.refinement_agent import RefinementAgent
+from .orchestrator import SchedulingOrchestrator
+from .utils.logging import setup_logging, stop_logging
+from .utils.llm_gateway import RateLimiter, ResponseCache, configure_llm, llm_stats
+from .utils.report import ScheduleReport
+from .utils.schedule_writer import export_schedule
+from .utils.snapshot import ProblemInstance
+from .utils.erp_loader import load_erp_problem
+
+logger = logging.getLogger("src.batch")  # __name__ is "__main__" under python -m src.batch
+
+SUMMARY_COLUMNS = [
+    "instance", "status", "orders", "steps", "employees", "stations", "tasks", "unassigned",
+    "feasible", "seconds", "llm_calls", "llm_cache_hits", "llm_wait_seconds", "error",
+]
+
+def _init_worker(limiter: Optional[RateLimiter], cache: Optional[ResponseCache]) -> None:
+    """Pool initializer: send this worker's LLM calls through the shared limiter and cache."""
+    configure_llm(limiter, cache)
+
+def schedule_instance(path: str, output_dir: str, start: datetime.date, days: int,
+                      max_iterations: int = 3) -> Dict[str, Any]:
+    """
+    Schedule one snapshot or ERP export into output_dir/<instance>/; returns its summary row.
+
+    Failures are reported in the row instead of raised, so one bad instance
+    does not stop the batch.
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    instance_dir = os.path.join(output_dir, name)
+    os.makedirs(instance_dir, exist_ok=True)
+    setup_logging(LOG_LEVEL, os.path.join(instance_dir, "log.txt"), console=False)
+    before = llm_stats()
+    row: Dict[str, Any] = {"instance": name, "status": "ok", "error": ""}
+    started = time.perf_counter()
+    try:
+        dates = [start + datetime.timedelta(days=i) for i in range(days)]
+        if path.lower().endswith(".snap"):
+            with ProblemInstance(path) as instance:
+                purchase_orders, production_steps, employees, stations, _ = instance.load()
+        else:
+            purchase_orders, production_steps, employees, stations, _ = load_erp_problem(path, dates)
+        row.update(orders=len(purchase_orders), steps=len(production_steps),
+                   employees=len(employees), stations=len(stations))
+
+        orchestrator = SchedulingOrchestrator(
+            priority_agent=PriorityAgent(),
+            step_sequencer=StepSequencer(station_list=stations, date_list=dates),
+            resource_assigner=ResourceAssigner(employees=employees),
+            constraints_agent=ConstraintsAgent(),
+            refinement_agent=RefinementAgent()
+        )
+        schedule, feasible = orchestrator.run_scheduling_loop(
+            purchase_orders=purchase_orders,
+            production_steps=production_steps,
+            employees=employees,
+            max_iterations=max_iterations
+        )
+
+        export_schedule(schedule, os.path.join(instance_dir, SCHEDULE_EXPORT_PATH))
+        ScheduleReport(schedule, employees, production_steps, purchase_orders).write_html(
+            os.path.join(instance_dir, REPORT_HTML_PATH or "schedule_report.html"), title=f"Schedule {name}")
+        row.update(tasks=len(schedule), unassigned=sum(1 for task in schedule if not task.employee_id),
+                   feasible=feasible)
+    except Exception as exc:
+        logger.exception("Scheduling %s failed", path)
+        row.update(status="failed", error=f"{type(exc).__name__}: {exc}")
+    finally:
+        stop_logging()  # Pool workers exit without running atexit handlers
+
+    after = llm_stats()
+    row.update(
+        seconds=round(time.perf_counter() - started, 3),
+        llm_calls=after["calls"] - before["calls"],
+        llm_cache_hits=after["cache_hits"] - before["cache_hits"],
+        llm_wait_seconds=round(after["wait_seconds"] - before["wait_seconds"], 3),
+    )
+    return row
+
+def find_instances(input_dir: str, pattern: str = BATCH_INSTANCE_PATTERN) -> List[str]:
+    """Files of a directory matching comma-separated patterns, largest first so long runs start early."""
+    paths = {path for part in pattern.split(",") if part.strip()
+             for path in glob.glob(os.path.join(input_dir, part.strip()))}
+    return sorted(paths, key=lambda path: (-os.path.getsize(path), path))
+
+def run_batch(input_dir: str,
+              output_dir: str,
+              workers: int = BATCH_WORKERS,
+              pattern: str = BATCH_INSTANCE_PATTERN,
+              start: Optional[datetime.date] = None,
+              days: int = SERVICE_PLANNING_DAYS,
+              calls_per_minute: float = BATCH_LLM_CALLS_PER_MINUTE,
+              cache_size: int = BATCH_LLM_CACHE_SIZE,
+              erp_files: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Schedule every instance in input_dir, plus erp_files, on a pool of worker processes.
+
+    workers defaults to the core count and never exceeds the number of
+    instances.  All workers draw LLM calls from one rate limit and share one
+    answer cache, both held by a Manager process.  Writes each instance's
+    outputs to its own subdirectory plus summary.csv and summary.json, and
+    returns the summary rows in instance order.
+    """
+    paths = find_instances(input_dir, pattern)
+    paths += [path for path in erp_files or () if path not in paths]
+    if not paths:
+        logger.warning("No instances matching %s in %s", pattern, input_dir)
+        return []
+    os.makedirs(output_dir, exist_ok=True)
+    start = start or datetime.date.today()
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    logger.info("Scheduling %d instances with %d workers", len(paths), workers)
+
+    manager = multiprocessing.Manager() if calls_per_minute > 0 or cache_size > 0 else None
+    try:
+        limiter = RateLimiter(calls_per_minute, manager) if calls_per_minute > 0 else None
+        cache = ResponseCache(cache_size, manager) if cache_size > 0 else None
+        rows: Dict[str, Dict[str, Any]] = {}
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(limiter, cache)) as pool:
+            futures = {pool.submit(schedule_instance, path, output_dir, start, days): path for path in paths}
+            for future in as_completed(futures):
+                row = future.result()
+                rows[futures[future]] = row
+                logger.info("[%d/%d] %s: %s, %s tasks in %.1fs", len(rows), len(paths),
+                            row["instance"], row["status"], row.get("tasks", "-"), row["seconds"])
+        elapsed = time.perf_counter() - started
+    finally:
+        if manager is not None:
+            manager.shutdown()
+
+    ordered = [rows[path] for path in sorted(rows)]
+    write_summary(ordered, output_dir, elapsed, workers)
+    failed = sum(1 for row in ordered if row["status"] != "ok")
+    logger.info("Batch finished in %.1fs: %d ok, %d failed", elapsed, len(ordered) - failed, failed)
+    return ordered
+
+def write_summary(rows: List[Dict[str, Any]], output_dir: str, elapsed: float, workers: int) -> None:
+    with open(os.path.join(output_dir, "summary.csv"), "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(os.path.join(output_dir, "summary.json"), "w", encoding="utf-8") as handle:
+        json.dump({
+            "instances": len(rows),
+            "failed": sum(1 for row in rows if row["status"] != "ok"),
+            "workers": workers,
+            "seconds": round(elapsed, 3),
+            "instance_seconds": round(sum(row["seconds"] for row in rows), 3),
+            "tasks": sum(row.get("tasks", 0) for row in rows),
+            "llm_calls": sum(row["llm_calls"] for row in rows),
+            "llm_cache_hits": sum(row["llm_cache_hits"] for row in rows),
+            "results": rows,
+        }, handle, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Schedule a directory of problem snapshots in parallel.")
+    parser.add_argument("input_dir")
+    parser.add_argument("output_dir")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="Worker processes (0 = all cores)")
+    parser.add_argument("--pattern", default=BATCH_INSTANCE_PATTERN)
+    parser.add_argument("--start", type=datetime.date.fromisoformat, help="First planning day (default today)")
+    parser.add_argument("--days", type=int, default=SERVICE_PLANNING_DAYS)
+    parser.add_argument("--calls-per-minute", type=float, default=BATCH_LLM_CALLS_PER_MINUTE)
+    parser.add_argument("--cache-size", type=int, default=BATCH_LLM_CACHE_SIZE)
+    parser.add_argument("--erp", action="append", default=[], metavar="PATH",
+                        help="ERP export (.json or .xlsx) to schedule as well; may be repeated")
+    args = parser.parse_args()
+
+    setup_logging()
+    if not config.validate():
+        logger.error("Error: Invalid configuration. Please check your .env file.")
+        return
+    run_batch(args.input_dir, args.output_dir, args.workers, args.pattern, args.start, args.days,
+              args.calls_per_minute, args.cache_size, args.erp)
+
+if __name__ == "__main__":
+    main()
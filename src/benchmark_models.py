@@ -0,0 +1,105 @@
+from typing import Callable, Dict, List, Tuple
+import argparse
+import datetime
+import gc
+import time
+import tracemalloc
+from .models.scheduled_task import ScheduledTask
+from .models.locked_assignment import LockedAssignment
+from .models.production_step import ProductionStep
+from .models.employee import Employee
+from .models.compact import (
+    CompactScheduledTask, FrozenScheduledTask, CompactLockedAssignment,
+    CompactProductionStep, FrozenProductionStep, CompactEmployee, FrozenEmployee
+)
+
+def _measure(build: Callable[..., object], make_args: Callable[[int], tuple], count: int) -> Tuple[float, float]:
+    """Bytes per object kept alive and microseconds per construction."""
+    # Memory: arguments are made per object and dropped, so only what the objects keep is counted
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build(*make_args(i)) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+
+    # Time: construction only, from prepared arguments and without tracing
+    arguments = [make_args(i) for i in range(count)]
+    gc.collect()
+    gc.disable()  # Collections triggered by the growing list would dominate the timing
+    try:
+        started = time.perf_counter()
+        objects = [build(*args) for args in arguments]
+        elapsed = time.perf_counter() - started
+    finally:
+        gc.enable()
+    del objects
+    return size / count, elapsed / count * 1e6
+
+def _task_args(i: int) -> tuple:
+    # IDs are built at runtime, as when parsed from files or JSON, so they are not interned yet
+    day = datetime.date(2025, 1, 1) + datetime.timedelta(days=i % 90)
+    return (f"S{i % 12}", day, "AM" if i % 2 else "PM", f"PO-{i % 50}", f"ST-{i % 500}",
+            f"A{i % 8}", f"E{i % 40}", 0.0, i % 10, i % 10 + 1)
+
+def _step_args(i: int) -> tuple:
+    return (f"ST-{i}", f"PO-{i % 50}", f"A{i % 8}", i % 6, 0.5, 0.1, 0.1, 1, 1,
+            [f"ST-{i - 1}", f"ST-{i - 2}"])
+
+def _employee_args(i: int) -> tuple:
+    days = {datetime.date(2025, 1, 1) + datetime.timedelta(days=d) for d in range(10)}
+    return (f"E{i}", f"Worker {i}", {f"A{i % 8}", f"A{(i + 1) % 8}"}, days)
+
+def _lock_args(i: int) -> tuple:
+    station_id, day, time_slot, _, step_id, activity_id, employee_id = _task_args(i)[:7]
+    return (step_id, station_id, day, time_slot, activity_id, employee_id)
+
+# model -> (argument maker, [(variant, constructor)]); the first variant is the baseline
+CASES: Dict[str, Tuple[Callable[[int], tuple], List[Tuple[str, Callable[..., object]]]]] = {
+    "ScheduledTask": (_task_args, [
+        ("dataclass", ScheduledTask),
+        ("compact", CompactScheduledTask),
+        ("compact.create", CompactScheduledTask.create),
+        ("frozen", FrozenScheduledTask),
+    ]),
+    "LockedAssignment": (_lock_args, [
+        ("dataclass", LockedAssignment),
+        ("compact", CompactLockedAssignment),
+    ]),
+    "ProductionStep": (_step_args, [
+        ("dataclass", ProductionStep),
+        ("compact", CompactProductionStep),
+        ("frozen", FrozenProductionStep),
+    ]),
+    "Employee": (_employee_args, [
+        ("dataclass", Employee),
+        ("compact", CompactEmployee),
+        ("frozen", FrozenEmployee),
+    ]),
+}
+
+def run(count: int) -> List[Tuple[str, str, float, float]]:
+    """(model, variant, bytes per object, microseconds per construction) for every case."""
+    results = []
+    for model, (make_args, variants) in CASES.items():
+        n = count if model != "Employee" else max(1, count // 100)
+        for variant, build in variants:
+            size, micros = _measure(build, make_args, n)
+            results.append((model, variant, size, micros))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and construction cost of the model classes.")
+    parser.add_argument("--count", type=int, default=200000, help="Objects per case (employees: count / 100)")
+    args = parser.parse_args()
+
+    print(f"{'model':<18}{'variant':<16}{'bytes/obj':>10}{'saved':>8}{'us/obj':>9}{'time':>7}")
+    baseline = {}
+    for model, variant, size, micros in run(args.count):
+        base_size, base_micros = baseline.setdefault(model, (size, micros))
+        saved = 1 - size / base_size
+        print(f"{model:<18}{variant:<16}{size:>10.0f}{saved:>8.0%}{micros:>9.2f}{micros / base_micros:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
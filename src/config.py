@@ -1,4 +1,5 @@
 import os
+import logging
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -34,7 +35,7 @@ class Config:
         is_valid = True
         for var_name, value in required_vars:
             if not value:
-                print(f"Missing required environment variable: {var_name}")
+                logging.getLogger(__name__).error("Missing required environment variable: %s", var_name)
                 is_valid = False
         
         return is_valid
@@ -42,6 +43,12 @@ class Config:
 # Global config instance
 config = Config()
 
+# Logging (utils/logging.py)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")  # DEBUG adds agent outputs, full schedules and progress
+LOG_FILE = "log.txt"
+LOG_QUIET = os.getenv("LOG_QUIET", "") == "1"  # Warnings and errors only
+LOG_FILE_FLUSH_RECORDS = 200  # Records written between log file flushes
+
 # Scheduling Configuration
 STATIONS_PER_DAY = 12  # Number of parallel stations that can run per day
 WORKERS_PER_STATION = 1  # Number of workers needed per station
@@ -58,4 +65,84 @@ SHIFT_HOURS = {
 MIN_SHIFT_GAP = 1.0
 
 # Maximum shifts per worker per day
-MAX_SHIFTS_PER_WORKER = 2 
\ No newline at end of file
+MAX_SHIFTS_PER_WORKER = 2
+
+# Worker assignment strategy: "matching" solves each shift as a min-cost
+# assignment problem, "greedy" picks the least loaded worker task by task.
+# "matching" is the default; "greedy" reproduces the original assignments.
+ASSIGNMENT_STRATEGY = "matching"
+
+# Matching cost weights (in days of processing time)
+EXTRA_TASK_PENALTY = 1.0  # Each additional task for the same worker in one shift
+SHIFT_LIMIT_PENALTY = 10.0  # Assignment beyond the worker's max_shifts_per_day
+SKILL_SCARCITY_WEIGHT = 0.05  # Per extra skill, keeps multi-skill workers free
+
+# Local search refinement
+LOCAL_SEARCH_ENABLED = True
+LOCAL_SEARCH_MAX_ITERATIONS = 5000  # Moves per refinement; fixed so results do not depend on CPU speed
+LOCAL_SEARCH_TIME_BUDGET = 10.0  # Safety limit in seconds; runs normally end at LOCAL_SEARCH_MAX_ITERATIONS
+LOCAL_SEARCH_HISTORY = 50  # Late-acceptance history length
+LOCAL_SEARCH_SEED = 0
+LOCAL_SEARCH_DOUBLE_BOOKING_PENALTY = 5.0  # Per extra task for a worker in one shift
+LOCAL_SEARCH_WORKERS = 1  # Independent searches run in parallel (seeds seed, seed + 1, ...); 1 runs the serial search
+
+# Memoised evaluation of identical schedules
+EVALUATION_MEMO_SIZE = 1024  # Entries per cache; 0 disables caching
+
+# Anytime refinement
+ANYTIME_TIME_BUDGET = 2.0  # Seconds until the best schedule is returned
+ANYTIME_SLICE = 0.1  # Seconds of local search between improvement reports
+
+# Priority scoring
+PRIORITY_CRITICAL_PATH_WEIGHT = 5.0  # Points per ratio of critical path length to days until due
+PRIORITY_CRITICAL_PATH_CAP = 2.0  # Ratio above which an order gets no further boost
+
+# ERP operation exports (utils/erp_loader.py)
+ERP_HOURS_PER_DAY = 8.0  # Working hours in one scheduling day
+ERP_PROCESS_TIME_PER_UNIT = False  # True if StandardProcessTime is per unit rather than per operation
+ERP_DEFAULT_PRIORITY = 50  # base_priority of imported orders
+ERP_DEFAULT_VALUE = 0.0  # value of imported orders
+ERP_READ_CHUNK_SIZE = 1 << 16  # Characters read from an export at a time
+ERP_MAX_ROW_CHARS = 1 << 20  # Longest row accepted; longer or malformed rows raise ValueError
+ERP_RESOURCE_GROUP_ACTIVITIES = {}  # ResourceGrpID -> activity_id; unmapped groups become their own activity
+ERP_STATIONS_PER_ACTIVITY = 1  # Stations set up per imported activity (exports carry no plant data)
+ERP_EMPLOYEES_PER_ACTIVITY = 2  # Workers trained per imported activity, available every planning day
+
+# Outputs of main and rolling_horizon (batch writes into its own output directory)
+OUTPUT_DIR = os.getenv("OUTPUT_DIR") or "output"  # Export, schema and report go here
+
+# Schedule export (utils/schedule_writer.py)
+SCHEDULE_EXPORT_PATH = "schedule.csv"  # Columnar task list; schema goes to schedule.schema.json
+SCHEDULE_EXPORT_CHUNK_SIZE = 10000  # Rows written at a time
+
+# Decision log (utils/decision_log.py)
+DECISION_LOG_PATH = os.getenv("DECISION_LOG") or None  # JSONL file; None keeps the log off
+DECISION_LOG_SAMPLE_RATE = 1.0  # Fraction of decisions recorded
+DECISION_LOG_MAX_PER_SECOND = 1000.0  # Rate limit on records; 0 disables the limit
+DECISION_LOG_MAX_CANDIDATES = 5  # Best alternatives stored per decision
+
+# Schedule report (utils/report.py)
+REPORT_HTML_PATH = "schedule_report.html"  # Static HTML report written by main; None skips it
+
+# LLM calls (utils/llm_gateway.py)
+LLM_CALLS_PER_MINUTE = 0  # Rate limit on crew kickoffs; 0 disables the limit
+LLM_CACHE_SIZE = 0  # Answers cached by prompt; 0 disables the cache
+
+# Scheduling service (service.py)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_MAX_BODY = 16 * 1024 * 1024  # Bytes accepted in one request
+SERVICE_PLANNING_DAYS = 10  # Days from today covered by the schedule
+SERVICE_MAX_ITERATIONS = 3  # Orchestrator iterations per reschedule
+
+# Batch scheduling (batch.py)
+BATCH_INSTANCE_PATTERN = "*.snap,*.json,*.xlsx"  # Snapshots and ERP exports picked up from the input directory
+BATCH_WORKERS = 0  # Worker processes; 0 uses every core
+BATCH_LLM_CALLS_PER_MINUTE = 60  # Shared by all workers; 0 disables the limit
+BATCH_LLM_CACHE_SIZE = 10000  # Answers shared by all workers; 0 disables the cache
+
+# Rolling horizon (rolling_horizon.py)
+ROLLING_HORIZON_DAYS = 90  # Total planning horizon
+ROLLING_WINDOW_DAYS = 10  # Days scheduled at once
+ROLLING_FREEZE_DAYS = 5  # Leading days of each window that are frozen before sliding
+ROLLING_ORDER_LOOKAHEAD_DAYS = 30  # Orders due this long after a window's end take part; None for all
@@ -1,11 +1,13 @@
+import argparse
 import datetime
+import logging
+import os
 from .config import config
 from .models.activity import Activity
 from .models.station import Station
 from .models.employee import Employee
 from .models.purchase_order import PurchaseOrder
 from .models.production_step import ProductionStep
-from .models.scheduled_task import ScheduledTask
 from .agents.priority_agent import PriorityAgent
 from .agents.constraints_agent import ConstraintsAgent
 from .agents.step_sequencer import StepSequencer
@@ -21,80 +23,50 @@ from .example_data import (
 )
 from typing import List
 from .utils.logging import setup_logging
+from .utils.schedule_writer import export_schedule
+from .utils.decision_log import enable_decision_log
+from .utils.report import ScheduleReport
+from .utils.erp_loader import load_erp_problem
+from .config import SCHEDULE_EXPORT_PATH, DECISION_LOG_PATH, REPORT_HTML_PATH, OUTPUT_DIR
+
+logger = logging.getLogger("src.main")  # __name__ is "__main__" under python -m src.main
 
 def main():
+    parser = argparse.ArgumentParser(description="Schedule the example data or an ERP export.")
+    parser.add_argument("--erp", help="ERP operation export (.json or .xlsx) to schedule instead of the example data")
+    parser.add_argument("--sheet", help="Worksheet of an .xlsx export (default: the first)")
+    args = parser.parse_args()
+
     # Setup logging first
     setup_logging()
+    decisions = enable_decision_log(DECISION_LOG_PATH)
     
     # Log initial configuration and data
-    print("\n=== INITIAL CONFIGURATION AND DATA ===\n")
+    logger.info("=== INITIAL CONFIGURATION AND DATA ===")
     
-    # Load example data
-    activities = create_activities()
-    stations = create_stations()
+    # Create date range for schedule (next 10 days)
     today = datetime.date.today()
     dates = [today + datetime.timedelta(days=i) for i in range(10)]
-    employees = create_employees(dates)
-    purchase_orders = create_purchase_orders(today)
-    production_steps = create_production_steps()
-    
-    # Log activities
-    print("\nActivities:")
-    for activity in activities:
-        print(f"  {activity.id}: {activity.description}")  # Changed from name to description
-    
-    # Log stations
-    print("\nStations:")
-    for station in stations:
-        print(f"  {station.id}: Currently set up for {station.current_activity_id or 'None'}")
-    
-    # Log employees
-    print("\nEmployees:")
-    for emp in employees:
-        print(f"  {emp.name} (ID: {emp.id})")
-        print(f"    Skills: {emp.skills}")
-        print(f"    Available: {len(emp.availability)} days")
-        print(f"    Max Shifts/Day: {emp.max_shifts_per_day}")
-    
-    # Log purchase orders
-    print("\nPurchase Orders:")
-    for po in purchase_orders:
-        print(f"  {po.id}:")
-        print(f"    Units: {po.units}")
-        print(f"    Due Date: {po.due_date}")
-        print(f"    Value: ${po.value:,.2f}")
-        print(f"    Base Priority: {po.base_priority}")
-    
-    # Log production steps
-    print("\nProduction Steps:")
-    for step in production_steps:
-        print(f"  {step.step_id}:")
-        print(f"    PO: {step.purchase_order_id}")
-        print(f"    Activity: {step.activity_id}")
-        print(f"    Dependencies: {step.depends_on}")
-        print(f"    Units/Station: {step.units_per_station}")
-        print(f"    Min Units to Start: {step.min_units_to_start}")
-    
-    print("\n=== SCHEDULING PROCESS BEGINS ===\n")
+    if args.erp:
+        purchase_orders, production_steps, employees, stations, activities = load_erp_problem(
+            args.erp, dates, args.sheet)
+    else:
+        activities = create_activities()
+        stations = create_stations()
+        employees = create_employees(dates)
+        purchase_orders = create_purchase_orders(today)
+        production_steps = create_production_steps()
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        log_input_data(activities, stations, employees, purchase_orders, production_steps)
+    
+    logger.info("=== SCHEDULING PROCESS BEGINS ===")
 
     # Validate configuration
     if not config.validate():
-        print("Error: Invalid configuration. Please check your .env file.")
+        logger.error("Error: Invalid configuration. Please check your .env file.")
         return
 
-    # Load example data
-    activities = create_activities()
-    stations = create_stations()
-    
-    # Create date range for schedule (next 10 days)
-    today = datetime.date.today()
-    dates = [today + datetime.timedelta(days=i) for i in range(10)]
-    
-    # Load remaining data
-    employees = create_employees(dates)
-    purchase_orders = create_purchase_orders(today)
-    production_steps = create_production_steps()
-    
     # Initialize agents
     priority_agent = PriorityAgent()
     constraints_agent = ConstraintsAgent()
@@ -119,8 +91,8 @@ def main():
     )
     
     # Calculate and display shift utilization
-    print("\n=== Schedule Statistics ===")
-    print(f"Schedule Feasibility: {'FEASIBLE' if is_feasible else 'UNFEASIBLE'}")
+    logger.info("=== Schedule Statistics ===")
+    logger.info(f"Schedule Feasibility: {'FEASIBLE' if is_feasible else 'UNFEASIBLE'}")
     
     shift_usage = {"AM": 0, "PM": 0}
     station_shifts = {}  # (station_id, day) -> set(shifts)
@@ -140,114 +112,78 @@ def main():
         if task.employee_id:
             worker_assignments[task.employee_id] = worker_assignments.get(task.employee_id, 0) + 1
     
-    total_slots = 12 * 10  # stations * days per shift
-    print("\nUtilization:")
-    print(f"AM Shift: {(shift_usage['AM'] / total_slots) * 100:.1f}%")
-    print(f"PM Shift: {(shift_usage['PM'] / total_slots) * 100:.1f}%")
-    print(f"Overall: {((shift_usage['AM'] + shift_usage['PM']) / (total_slots * 2)) * 100:.1f}%")
-    
-    print("\nSchedule Metrics:")
-    print(f"Total Tasks: {len(final_schedule)}")
-    print(f"Stations Used Both Shifts: {sum(1 for shifts in station_shifts.values() if len(shifts) == 2)}")
-    print(f"Workers Assigned: {len(worker_assignments)} of {len(employees)}")
-    print(f"Unassigned Tasks: {sum(1 for t in final_schedule if not t.employee_id)}")
-    
-    # Print detailed schedule report
-    print_schedule_report(
-        final_schedule, 
-        employees, 
-        production_steps,
-        purchase_orders
-    )
+    total_slots = len(stations) * len(dates)  # stations * days per shift
+    logger.info("Utilization:")
+    logger.info(f"AM Shift: {(shift_usage['AM'] / total_slots) * 100:.1f}%")
+    logger.info(f"PM Shift: {(shift_usage['PM'] / total_slots) * 100:.1f}%")
+    logger.info(f"Overall: {((shift_usage['AM'] + shift_usage['PM']) / (total_slots * 2)) * 100:.1f}%")
+    
+    logger.info("Schedule Metrics:")
+    logger.info(f"Total Tasks: {len(final_schedule)}")
+    logger.info(f"Stations Used Both Shifts: {sum(1 for shifts in station_shifts.values() if len(shifts) == 2)}")
+    logger.info(f"Workers Assigned: {len(worker_assignments)} of {len(employees)}")
+    logger.info(f"Unassigned Tasks: {sum(1 for t in final_schedule if not t.employee_id)}")
+    
+    # Detailed schedule report
+    report = ScheduleReport(final_schedule, employees, production_steps, purchase_orders)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("%s", report.render_text())
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    if REPORT_HTML_PATH:
+        report_path = os.path.join(OUTPUT_DIR, REPORT_HTML_PATH)
+        report.write_html(report_path)
+        logger.info("Report written to %s", report_path)
 
-def print_schedule_report(schedule: List[ScheduledTask], 
-                         employees: List[Employee], 
-                         steps: List[ProductionStep],
-                         purchase_orders: List[PurchaseOrder]):
-    """Print detailed schedule report with shift and activity analysis."""
-    print("\n=== Schedule Report ===")
-    
-    # Track order progress
-    order_progress = {}  # (po_id, day) -> {step_id: completed_units}
-    order_total_units = {}  # po_id -> total_units
-    order_steps = {}  # po_id -> set(step_ids)
-    
-    # Initialize tracking
-    for step in steps:
-        if step.purchase_order_id not in order_steps:
-            order_steps[step.purchase_order_id] = set()
-        order_steps[step.purchase_order_id].add(step.step_id)
-    
-    # Group by day and shift
-    day_shift_tasks = {}
-    for task in sorted(schedule, key=lambda t: (t.day, t.time_slot)):
-        key = (task.day, task.time_slot)
-        if key not in day_shift_tasks:
-            day_shift_tasks[key] = []
-        day_shift_tasks[key].append(task)
-        
-        # Track progress
-        po_id = task.purchase_order_id
-        if po_id not in order_progress:
-            order_progress[po_id] = {}
-        if task.day not in order_progress[po_id]:
-            order_progress[po_id][task.day] = {}
-        if task.step_id not in order_progress[po_id][task.day]:
-            order_progress[po_id][task.day][task.step_id] = set()
-        
-        # Add completed units
-        order_progress[po_id][task.day][task.step_id].update(
-            range(task.units_start, task.units_end + 1)
-        )
-    
-    # Print schedule by day/shift with order progress
-    current_day = None
-    for (day, shift), tasks in sorted(day_shift_tasks.items()):
-        print(f"\n{day} - {shift} Shift:")
-        for task in sorted(tasks, key=lambda t: t.station_id):
-            emp = next((e for e in employees if e.id == task.employee_id), None)
-            emp_name = emp.name if emp else "Unassigned"
-            step = next((s for s in steps if s.step_id == task.step_id), None)
-            activity = step.activity_id if step else "Unknown"
-            print(f"  Station {task.station_id} (Activity {activity}): {task.step_id} ({emp_name})")
-        
-        # Print order progress at end of day
-        if shift == "PM" and day != current_day:
-            current_day = day
-            print(f"\n  End of Day Progress:")
-            for po_id, days in order_progress.items():
-                if day in days:  # Only show active orders
-                    total_steps = len(order_steps[po_id])
-                    completed_steps = 0
-                    total_units = 0
-                    
-                    # Get total units needed for this PO
-                    po_total_units = next(po.units for po in purchase_orders if po.id == po_id)
-                    
-                    # Count completed steps and units
-                    for step_id in order_steps[po_id]:
-                        units = len(days[day].get(step_id, set()))
-                        if units > 0:
-                            total_units += units
-                            completed_steps += 1
-                    
-                    if completed_steps > 0:  # Only show if order had activity
-                        avg_completion = (total_units / (total_steps * po_total_units)) * 100
-                        print(f"    Order {po_id}: {avg_completion:.1f}% complete "
-                              f"({completed_steps}/{total_steps} steps active)")
-    
-    # Print station activity changes
-    print("\n=== Station Activity Changes ===")
-    for station_id in sorted({t.station_id for t in schedule}):
-        print(f"\nStation {station_id} activities:")
-        station_tasks = sorted(
-            [t for t in schedule if t.station_id == station_id],
-            key=lambda t: (t.day, t.time_slot)
-        )
-        for task in station_tasks:
-            step = next((s for s in steps if s.step_id == task.step_id), None)
-            activity = step.activity_id if step else "Unknown"
-            print(f"  {task.day} {task.time_slot}: Activity {activity}")
+    # Export the schedule for downstream systems
+    export_path = os.path.join(OUTPUT_DIR, SCHEDULE_EXPORT_PATH)
+    rows = export_schedule(final_schedule, export_path)
+    logger.info("Exported %d tasks to %s", rows, export_path)
+    if decisions.enabled:
+        decisions.close()
+        logger.info("Decision log written to %s", DECISION_LOG_PATH)
+
+def log_input_data(activities: List[Activity],
+                   stations: List[Station],
+                   employees: List[Employee],
+                   purchase_orders: List[PurchaseOrder],
+                   production_steps: List[ProductionStep]):
+    """Log every input record at debug level."""
+    # Log activities
+    logger.debug("Activities:")
+    for activity in activities:
+        logger.debug(f"  {activity.id}: {activity.description}")  # Changed from name to description
+    
+    # Log stations
+    logger.debug("Stations:")
+    for station in stations:
+        logger.debug(f"  {station.id}: Currently set up for {station.current_activity_id or 'None'}")
+    
+    # Log employees
+    logger.debug("Employees:")
+    for emp in employees:
+        logger.debug(f"  {emp.name} (ID: {emp.id})")
+        logger.debug(f"    Skills: {emp.skills}")
+        logger.debug(f"    Available: {len(emp.availability)} days")
+        logger.debug(f"    Max Shifts/Day: {emp.max_shifts_per_day}")
+    
+    # Log purchase orders
+    logger.debug("Purchase Orders:")
+    for po in purchase_orders:
+        logger.debug(f"  {po.id}:")
+        logger.debug(f"    Units: {po.units}")
+        logger.debug(f"    Due Date: {po.due_date}")
+        logger.debug(f"    Value: ${po.value:,.2f}")
+        logger.debug(f"    Base Priority: {po.base_priority}")
+    
+    # Log production steps
+    logger.debug("Production Steps:")
+    for step in production_steps:
+        logger.debug(f"  {step.step_id}:")
+        logger.debug(f"    PO: {step.purchase_order_id}")
+        logger.debug(f"    Activity: {step.activity_id}")
+        logger.debug(f"    Dependencies: {step.depends_on}")
+        logger.debug(f"    Units/Station: {step.units_per_station}")
+        logger.debug(f"    Min Units to Start: {step.min_units_to_start}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,291 @@
+"""
+Slot-based variants of the hot model classes.
+
+They have the same fields and methods as ScheduledTask, LockedAssignment,
+ProductionStep and Employee, so code reading attributes works with either,
+but no per-instance __dict__.  Construction interns the ID strings, so the
+many tasks of one step share a single copy of each ID.  The Frozen* variants
+are immutable and hashable, with list and set fields stored as tuples and
+frozensets.
+
+CompactScheduledTask.create() is the cheaper way to build many tasks: it
+skips the dataclass __init__/__post_init__ machinery and validates the time
+slot with one dict lookup, which also yields the interned slot string.
+Interning still costs a hash and lookup per ID, so construction from freshly
+parsed strings is slower than the plain dataclass (see
+python -m src.benchmark_models); the variants trade that for memory.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+from datetime import date
+import sys
+from .scheduled_task import ScheduledTask
+from .locked_assignment import LockedAssignment
+from .production_step import ProductionStep
+from .employee import Employee
+from ..config import TIME_SLOTS
+
+_intern = sys.intern
+_new = object.__new__
+_TIME_SLOTS = {slot: _intern(slot) for slot in TIME_SLOTS}
+
+def _intern_optional(value: Optional[str]) -> Optional[str]:
+    return None if value is None else _intern(value)
+
+def _time_slot(value: str) -> str:
+    slot = _TIME_SLOTS.get(value)
+    if slot is None:
+        raise ValueError(f"Invalid time_slot: {value}. Must be one of {TIME_SLOTS}")
+    return slot
+
+@dataclass(slots=True)
+class CompactScheduledTask:
+    """ScheduledTask without __dict__ and with interned IDs."""
+    station_id: str
+    day: date
+    time_slot: str
+    purchase_order_id: str
+    step_id: str
+    activity_id: str
+    employee_id: Optional[str] = None
+    percent_complete: float = 0.0
+    units_start: int = 1
+    units_end: int = 1
+
+    def __post_init__(self):
+        self.time_slot = _time_slot(self.time_slot)
+        self.station_id = _intern(self.station_id)
+        self.purchase_order_id = _intern(self.purchase_order_id)
+        self.step_id = _intern(self.step_id)
+        self.activity_id = _intern(self.activity_id)
+        self.employee_id = _intern_optional(self.employee_id)
+
+    @classmethod
+    def create(cls, station_id: str, day: date, time_slot: str, purchase_order_id: str,
+               step_id: str, activity_id: str, employee_id: Optional[str] = None,
+               percent_complete: float = 0.0, units_start: int = 1,
+               units_end: int = 1) -> "CompactScheduledTask":
+        """Validated constructor without the __init__/__post_init__ overhead, for building many tasks."""
+        slot = _TIME_SLOTS.get(time_slot)
+        if slot is None:
+            _time_slot(time_slot)  # Raises the ValueError
+        task = _new(cls)
+        task.station_id = _intern(station_id)
+        task.day = day
+        task.time_slot = slot
+        task.purchase_order_id = _intern(purchase_order_id)
+        task.step_id = _intern(step_id)
+        task.activity_id = _intern(activity_id)
+        task.employee_id = None if employee_id is None else _intern(employee_id)
+        task.percent_complete = percent_complete
+        task.units_start = units_start
+        task.units_end = units_end
+        return task
+
+    @classmethod
+    def from_model(cls, task: ScheduledTask) -> "CompactScheduledTask":
+        return cls.create(task.station_id, task.day, task.time_slot, task.purchase_order_id,
+                          task.step_id, task.activity_id, task.employee_id, task.percent_complete,
+                          task.units_start, task.units_end)
+
+    def to_model(self) -> ScheduledTask:
+        return ScheduledTask(self.station_id, self.day, self.time_slot, self.purchase_order_id,
+                             self.step_id, self.activity_id, self.employee_id, self.percent_complete,
+                             self.units_start, self.units_end)
+
+@dataclass(frozen=True, slots=True)
+class FrozenScheduledTask:
+    """Immutable, hashable CompactScheduledTask."""
+    station_id: str
+    day: date
+    time_slot: str
+    purchase_order_id: str
+    step_id: str
+    activity_id: str
+    employee_id: Optional[str] = None
+    percent_complete: float = 0.0
+    units_start: int = 1
+    units_end: int = 1
+
+    def __post_init__(self):
+        setter = object.__setattr__
+        setter(self, "time_slot", _time_slot(self.time_slot))
+        setter(self, "station_id", _intern(self.station_id))
+        setter(self, "purchase_order_id", _intern(self.purchase_order_id))
+        setter(self, "step_id", _intern(self.step_id))
+        setter(self, "activity_id", _intern(self.activity_id))
+        setter(self, "employee_id", _intern_optional(self.employee_id))
+
+    @classmethod
+    def from_model(cls, task: ScheduledTask) -> "FrozenScheduledTask":
+        return cls(task.station_id, task.day, task.time_slot, task.purchase_order_id, task.step_id,
+                   task.activity_id, task.employee_id, task.percent_complete, task.units_start, task.units_end)
+
+    def to_model(self) -> ScheduledTask:
+        return ScheduledTask(self.station_id, self.day, self.time_slot, self.purchase_order_id,
+                             self.step_id, self.activity_id, self.employee_id, self.percent_complete,
+                             self.units_start, self.units_end)
+
+@dataclass(frozen=True, slots=True)
+class CompactLockedAssignment:
+    """LockedAssignment (already frozen) without __dict__ and with interned IDs."""
+    step_id: str
+    station_id: str
+    day: date
+    time_slot: str
+    activity_id: str
+    employee_id: str = None
+    percent_complete: float = 0.0
+
+    def __post_init__(self):
+        setter = object.__setattr__
+        setter(self, "time_slot", _time_slot(self.time_slot))
+        setter(self, "step_id", _intern(self.step_id))
+        setter(self, "station_id", _intern(self.station_id))
+        setter(self, "activity_id", _intern(self.activity_id))
+        setter(self, "employee_id", _intern_optional(self.employee_id))
+
+    @classmethod
+    def from_model(cls, lock: LockedAssignment) -> "CompactLockedAssignment":
+        return cls(lock.step_id, lock.station_id, lock.day, lock.time_slot, lock.activity_id,
+                   lock.employee_id, lock.percent_complete)
+
+    def to_model(self) -> LockedAssignment:
+        return LockedAssignment(self.step_id, self.station_id, self.day, self.time_slot, self.activity_id,
+                                self.employee_id, self.percent_complete)
+
+@dataclass(slots=True)
+class CompactProductionStep:
+    """ProductionStep without __dict__ and with interned IDs."""
+    step_id: str
+    purchase_order_id: str
+    activity_id: str
+    step_order: int
+    duration_days: float
+    setup_time_days: float
+    teardown_time_days: float
+    units_per_station: int = 1
+    min_units_to_start: int = 1
+    depends_on: List[str] = field(default_factory=list)
+    percent_complete: float = 0.0
+
+    def __post_init__(self):
+        self.step_id = _intern(self.step_id)
+        self.purchase_order_id = _intern(self.purchase_order_id)
+        self.activity_id = _intern(self.activity_id)
+        self.depends_on = [_intern(dep) for dep in self.depends_on or ()]
+
+    @classmethod
+    def from_model(cls, step: ProductionStep) -> "CompactProductionStep":
+        return cls(step.step_id, step.purchase_order_id, step.activity_id, step.step_order,
+                   step.duration_days, step.setup_time_days, step.teardown_time_days,
+                   step.units_per_station, step.min_units_to_start, list(step.depends_on),
+                   step.percent_complete)
+
+    def to_model(self) -> ProductionStep:
+        return ProductionStep(self.step_id, self.purchase_order_id, self.activity_id, self.step_order,
+                              self.duration_days, self.setup_time_days, self.teardown_time_days,
+                              self.units_per_station, self.min_units_to_start, list(self.depends_on),
+                              self.percent_complete)
+
+@dataclass(frozen=True, slots=True)
+class FrozenProductionStep:
+    """Immutable, hashable CompactProductionStep; depends_on is a tuple."""
+    step_id: str
+    purchase_order_id: str
+    activity_id: str
+    step_order: int
+    duration_days: float
+    setup_time_days: float
+    teardown_time_days: float
+    units_per_station: int = 1
+    min_units_to_start: int = 1
+    depends_on: Tuple[str, ...] = ()
+    percent_complete: float = 0.0
+
+    def __post_init__(self):
+        setter = object.__setattr__
+        setter(self, "step_id", _intern(self.step_id))
+        setter(self, "purchase_order_id", _intern(self.purchase_order_id))
+        setter(self, "activity_id", _intern(self.activity_id))
+        setter(self, "depends_on", tuple(_intern(dep) for dep in self.depends_on or ()))
+
+    @classmethod
+    def from_model(cls, step: ProductionStep) -> "FrozenProductionStep":
+        return cls(step.step_id, step.purchase_order_id, step.activity_id, step.step_order,
+                   step.duration_days, step.setup_time_days, step.teardown_time_days,
+                   step.units_per_station, step.min_units_to_start, tuple(step.depends_on),
+                   step.percent_complete)
+
+    def to_model(self) -> ProductionStep:
+        return ProductionStep(self.step_id, self.purchase_order_id, self.activity_id, self.step_order,
+                              self.duration_days, self.setup_time_days, self.teardown_time_days,
+                              self.units_per_station, self.min_units_to_start, list(self.depends_on),
+                              self.percent_complete)
+
+@dataclass(slots=True)
+class CompactEmployee:
+    """Employee without __dict__ and with interned IDs and skills."""
+    id: str
+    name: str
+    skills: List[str]
+    availability: Set[date]
+    am_shift_available: bool = True
+    pm_shift_available: bool = True
+    max_shifts_per_day: int = 2
+    shift_availability: Dict[date, Set[str]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.id = _intern(self.id)
+        self.skills = type(self.skills)(_intern(skill) for skill in self.skills)
+
+    __repr__ = Employee.__repr__
+    is_available = Employee.is_available
+
+    @classmethod
+    def from_model(cls, employee: Employee) -> "CompactEmployee":
+        return cls(employee.id, employee.name, employee.skills, set(employee.availability),
+                   employee.am_shift_available, employee.pm_shift_available,
+                   employee.max_shifts_per_day, dict(employee.shift_availability))
+
+    def to_model(self) -> Employee:
+        return Employee(self.id, self.name, self.skills, set(self.availability), self.am_shift_available,
+                        self.pm_shift_available, self.max_shifts_per_day, dict(self.shift_availability))
+
+@dataclass(frozen=True, slots=True)
+class FrozenEmployee:
+    """
+    Immutable, hashable CompactEmployee.  skills and availability are
+    frozensets; shift_availability is a plain dict of frozensets, left out of
+    the hash, and must not be changed after construction.
+    """
+    id: str
+    name: str
+    skills: FrozenSet[str]
+    availability: FrozenSet[date]
+    am_shift_available: bool = True
+    pm_shift_available: bool = True
+    max_shifts_per_day: int = 2
+    shift_availability: Dict[date, FrozenSet[str]] = field(default_factory=dict, hash=False)
+
+    def __post_init__(self):
+        setter = object.__setattr__
+        setter(self, "id", _intern(self.id))
+        setter(self, "skills", frozenset(_intern(skill) for skill in self.skills))
+        setter(self, "availability", frozenset(self.availability))
+        setter(self, "shift_availability",
+               {day: frozenset(slots) for day, slots in self.shift_availability.items()})
+
+    __repr__ = Employee.__repr__
+    is_available = Employee.is_available
+
+    @classmethod
+    def from_model(cls, employee: Employee) -> "FrozenEmployee":
+        return cls(employee.id, employee.name, employee.skills, employee.availability,
+                   employee.am_shift_available, employee.pm_shift_available,
+                   employee.max_shifts_per_day, employee.shift_availability)
+
+    def to_model(self) -> Employee:
+        return Employee(self.id, self.name, set(self.skills), set(self.availability), self.am_shift_available,
+                        self.pm_shift_available, self.max_shifts_per_day,
+                        {day: set(slots) for day, slots in self.shift_availability.items()})
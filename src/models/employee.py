@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List, Set
+from dataclasses import dataclass, field
+from typing import List, Set, Dict
 from datetime import date
 
 @dataclass
@@ -23,6 +23,9 @@ class Employee:
         Whether the employee is available for the PM shift
     max_shifts_per_day : int
         Maximum number of shifts this employee can work in a day
+    shift_availability : Dict[date, Set[str]]
+        Partial-day availability: time slots available on specific dates,
+        overriding the AM/PM flags for those dates
     """
     id: str
     name: str
@@ -31,6 +34,7 @@ class Employee:
     am_shift_available: bool = True
     pm_shift_available: bool = True
     max_shifts_per_day: int = 2
+    shift_availability: Dict[date, Set[str]] = field(default_factory=dict)
 
     def __repr__(self):
         return f"<Employee {self.name} (skills={self.skills})>"
@@ -39,6 +43,8 @@ class Employee:
         """Check if employee is available for a specific day and shift."""
         if day not in self.availability:
             return False
+        if day in self.shift_availability:
+            return time_slot in self.shift_availability[day]
         if time_slot == "AM" and not self.am_shift_available:
             return False
         if time_slot == "PM" and not self.pm_shift_available:
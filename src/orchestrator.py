@@ -10,7 +10,15 @@ from .agents.step_sequencer import StepSequencer
 from .agents.resource_assigner import ResourceAssigner
 from .agents.constraints_agent import ConstraintsAgent
 from .agents.refinement_agent import RefinementAgent
+from .utils.score_state import ScoreState
+from .utils.fingerprint import EvaluationMemo, schedule_key
+from .utils.dag import StepGraph
+from .utils.report import ScheduleReport
+from .utils.llm_gateway import kickoff
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 class SchedulingOrchestrator:
     """
@@ -31,6 +39,7 @@ class SchedulingOrchestrator:
         self.locked_assignments: Set[LockedAssignment] = set()
         self.constraint_history: List[Dict] = []  # Track violations
         self.production_steps = None  # Will be set during run_scheduling_loop
+        self.score_memo = EvaluationMemo()
         
         self.crew = Crew(
             agents=[
@@ -52,17 +61,17 @@ class SchedulingOrchestrator:
         """Run multiple iterations to improve schedule quality."""
         self.production_steps = production_steps  # Store for scoring
         best_schedule = []
-        best_score = 0.0
+        best_score = float("-inf")  # Scores are clamped at 0, so a feasible schedule may score exactly 0
         found_feasible = False
         
         sorted_steps = self._sort_steps_by_priority(production_steps, purchase_orders)
         steps_to_schedule = sorted_steps.copy()
         
         for iteration in range(max_iterations):
-            print(f"\n--- Iteration {iteration+1} ---")
+            logger.info("--- Iteration %d ---", iteration + 1)
             
             # Step 1: Priority Analysis
-            print("\n=== Priority Analysis ===")
+            logger.info("=== Priority Analysis ===")
             priority_crew = Crew(
                 agents=[self.priority_agent.agent],
                 tasks=[Task(
@@ -72,24 +81,26 @@ class SchedulingOrchestrator:
                 )],
                 verbose=True
             )
-            priority_result = str(priority_crew.kickoff())
-            print("\nPriority Agent Output:")
-            print(json.dumps(priority_result, indent=2))
+            priority_result = kickoff(priority_crew)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Priority Agent Output:\n%s", json.dumps(priority_result, indent=2))
             
             # Update priorities and pass reasoning to next agent
             self.priority_agent.update_priorities(
                 purchase_orders=purchase_orders,
                 steps=production_steps,
                 previous_reasoning=priority_result,
-                previous_violations=self.constraint_history
+                previous_violations=self.constraint_history,
+                reference_date=min(self.step_sequencer.date_list, default=None)
             )
             
-            print("\nUpdated Priorities:")
-            for po in purchase_orders:
-                print(f"PO {po.id}: {po.effective_priority}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Updated Priorities:\n%s", "\n".join(
+                    f"PO {po.id}: {po.effective_priority}" for po in purchase_orders
+                ))
             
             # Step 2: Sequence Planning
-            print("\n=== Initial Scheduling ===")
+            logger.info("=== Initial Scheduling ===")
             sequence_crew = Crew(
                 agents=[self.step_sequencer.agent],
                 tasks=[Task(
@@ -105,9 +116,9 @@ class SchedulingOrchestrator:
                 )],
                 verbose=True
             )
-            sequence_result = str(sequence_crew.kickoff())
-            print("\nSequence Agent Output:")
-            print(json.dumps(sequence_result, indent=2))
+            sequence_result = kickoff(sequence_crew)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sequence Agent Output:\n%s", json.dumps(sequence_result, indent=2))
             
             # Create schedule and pass reasoning forward
             candidate_schedule = self.step_sequencer.create_schedule(
@@ -118,11 +129,12 @@ class SchedulingOrchestrator:
                 previous_reasoning=sequence_result
             )
             
-            print("\nInitial Schedule:")
-            self._print_schedule(candidate_schedule)
+            logger.info("Initial schedule: %d tasks", len(candidate_schedule))
+            if logger.isEnabledFor(logging.DEBUG):
+                self._print_schedule(candidate_schedule)
             
             # Step 3: Resource Assignment
-            print("\n=== Resource Assignment ===")
+            logger.info("=== Resource Assignment ===")
             resource_crew = Crew(
                 agents=[self.resource_assigner.agent],
                 tasks=[Task(
@@ -135,9 +147,9 @@ class SchedulingOrchestrator:
                 )],
                 verbose=True
             )
-            resource_result = str(resource_crew.kickoff())
-            print("\nResource Agent Output:")
-            print(json.dumps(resource_result, indent=2))
+            resource_result = kickoff(resource_crew)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Resource Agent Output:\n%s", json.dumps(resource_result, indent=2))
             
             # Assign resources with previous context
             self.resource_assigner.assign_resources(
@@ -148,11 +160,12 @@ class SchedulingOrchestrator:
                 previous_reasoning=resource_result
             )
             
-            print("\nSchedule with Resources:")
-            self._print_schedule(candidate_schedule)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Schedule with Resources:")
+                self._print_schedule(candidate_schedule)
             
             # Step 4: Constraint Checking
-            print("\n=== Constraint Checking ===")
+            logger.info("=== Constraint Checking ===")
             is_feasible, violations = self.constraints_agent.check_feasibility(
                 candidate_schedule, 
                 steps_to_schedule, 
@@ -160,27 +173,28 @@ class SchedulingOrchestrator:
                 previous_reasoning=[priority_result, sequence_result, resource_result]
             )
             
-            print(f"\nFeasible: {is_feasible}")
+            logger.info("Feasible: %s", is_feasible)
             if violations:
-                print(f"Violations found: {len(violations)}")
-                print("\nDetailed Violations:")
+                logger.info("Violations found: %d", len(violations))
+            if violations and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Detailed Violations:")
                 for v in violations:
                     try:
                         if v['type'] == 'dependency_violation':
-                            print(f"- Dependency: Step {v.get('step_id', 'unknown')} started before {v.get('related_step_id', 'unknown')} had enough units")
+                            logger.debug(f"- Dependency: Step {v.get('step_id', 'unknown')} started before {v.get('related_step_id', 'unknown')} had enough units")
                         elif v['type'] == 'employee_unavailable':
-                            print(f"- Worker {v.get('employee_id', 'unknown')} unavailable on {v.get('day', 'unknown')} {v.get('time_slot', 'unknown')}")
+                            logger.debug(f"- Worker {v.get('employee_id', 'unknown')} unavailable on {v.get('day', 'unknown')} {v.get('time_slot', 'unknown')}")
                         elif v['type'] == 'station_conflict':
-                            print(f"- Station {v.get('station_id', 'unknown')} double-booked on {v.get('day', 'unknown')} {v.get('time_slot', 'unknown')}")
+                            logger.debug(f"- Station {v.get('station_id', 'unknown')} double-booked on {v.get('day', 'unknown')} {v.get('time_slot', 'unknown')}")
                         elif v['type'] == 'worker_overload':
-                            print(f"- Worker {v.get('employee_id', 'unknown')} overloaded on {v.get('day', 'unknown')} {v.get('time_slot', 'unknown')}")
+                            logger.debug(f"- Worker {v.get('employee_id', 'unknown')} overloaded on {v.get('day', 'unknown')} {v.get('time_slot', 'unknown')}")
                         elif v['type'] == 'setup_teardown_violation':
-                            print(f"- Setup/Teardown conflict on Station {v.get('station_id', 'unknown')} at {v.get('day', 'unknown')} {v.get('time_slot', 'unknown')}")
+                            logger.debug(f"- Setup/Teardown conflict on Station {v.get('station_id', 'unknown')} at {v.get('day', 'unknown')} {v.get('time_slot', 'unknown')}")
                         else:
-                            print(f"- Other violation: {v}")
+                            logger.debug(f"- Other violation: {v}")
                     except Exception as e:
-                        print(f"- Error printing violation: {v}")
-                        print(f"  Error details: {str(e)}")
+                        logger.debug(f"- Error printing violation: {v}")
+                        logger.debug(f"  Error details: {str(e)}")
             
             if is_feasible:
                 found_feasible = True
@@ -200,11 +214,12 @@ class SchedulingOrchestrator:
                     previous_violations=self.constraint_history
                 )
                 
-                print("\nRefined Schedule:")
-                self._print_schedule(refined_schedule)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Refined Schedule:")
+                    self._print_schedule(refined_schedule)
                 
                 score = self._score_schedule(refined_schedule)
-                print(f"Schedule score: {score}")
+                logger.info("Schedule score: %s", score)
                 
                 if score > best_score:
                     best_score = score
@@ -216,7 +231,7 @@ class SchedulingOrchestrator:
                 )
                 self.locked_assignments.update(new_locks)
             else:
-                print("Schedule not feasible. Learning from violations...")
+                logger.info("Schedule not feasible. Learning from violations...")
                 self.constraint_history.append({
                     'iteration': iteration,
                     'violations': violations
@@ -232,23 +247,15 @@ class SchedulingOrchestrator:
         po_priority_map = {po.id: po.effective_priority for po in purchase_orders}
         
         # Create dependency graph
-        dep_graph = {step.step_id: step.depends_on for step in steps}
+        dep_graph = StepGraph.for_steps(steps)
         
         def get_step_priority(step: ProductionStep) -> float:
             base_priority = po_priority_map[step.purchase_order_id]
-            dep_depth = len(self._get_all_dependencies(step.step_id, dep_graph))
+            dep_depth = dep_graph.ancestor_count(step.step_id)
             return base_priority + (dep_depth * 10)  # Prioritize steps with dependencies
         
         return sorted(steps, key=get_step_priority, reverse=True)
     
-    def _get_all_dependencies(self, step_id: str, dep_graph: Dict[str, List[str]]) -> Set[str]:
-        """Get all dependencies recursively."""
-        deps = set()
-        for dep in dep_graph.get(step_id, []):
-            deps.add(dep)
-            deps.update(self._get_all_dependencies(dep, dep_graph))
-        return deps
-    
     def _identify_successful_assignments(self,
                                       schedule: List[ScheduledTask],
                                       steps: List[ProductionStep]) -> Set[LockedAssignment]:
@@ -286,73 +293,27 @@ class SchedulingOrchestrator:
         return successful
     
     def _score_schedule(self, scheduled_tasks: List[ScheduledTask]) -> float:
-        """Score the schedule based on utilization, efficiency, and activity changes."""
+        """Score the schedule based on utilization, efficiency, and activity changes.
+
+        Utilization of both shifts, stations used in both shifts of a day and
+        every scheduled task earn points; unused day/station capacity, shift
+        imbalance and station activity changes cost points.  See ScoreState,
+        which also supports incremental updates.  Scores are memoised by
+        schedule fingerprint.
+        """
         if not scheduled_tasks:
             return 0.0
-            
-        # Calculate utilization metrics
-        shift_usage = {"AM": 0, "PM": 0}
-        station_shifts = {}  # (station_id, day) -> set(shifts)
-        day_usage = {}  # day -> count of tasks
-        station_usage = {}  # station_id -> count of tasks
-        
-        for task in scheduled_tasks:
-            # Track shift usage
-            shift_usage[task.time_slot] += 1
-            
-            # Track station shifts
-            key = (task.station_id, task.day)
-            if key not in station_shifts:
-                station_shifts[key] = set()
-            station_shifts[key].add(task.time_slot)
-            
-            # Track daily usage
-            if task.day not in day_usage:
-                day_usage[task.day] = 0
-            day_usage[task.day] += 1
-            
-            # Track station usage
-            if task.station_id not in station_usage:
-                station_usage[task.station_id] = 0
-            station_usage[task.station_id] += 1
-        
-        # Base scores
-        total_slots = 12 * 10  # stations * days per shift
-        am_utilization = shift_usage["AM"] / total_slots
-        pm_utilization = shift_usage["PM"] / total_slots
-        
-        # Penalties
-        daily_penalty = sum((24 - count) * 20 for count in day_usage.values())  # Increased penalty
-        shift_imbalance_penalty = abs(am_utilization - pm_utilization) * 100  # Increased penalty
-        station_underuse_penalty = sum((20 - count) * 15 for count in station_usage.values())  # New penalty
-        
-        # Bonuses
-        full_day_bonus = sum(1 for shifts in station_shifts.values() if len(shifts) == 2) * 10
-        high_utilization_bonus = len(scheduled_tasks) * 5  # Reward for each scheduled task
-        
-        # Track activity changes
-        activity_changes = {}  # station_id -> count of changes
-        current_activities = {}  # station_id -> (activity_id, day, time_slot)
-        
-        for task in sorted(scheduled_tasks, key=lambda t: (t.day, t.time_slot)):
-            if task.station_id not in current_activities:
-                current_activities[task.station_id] = (task.activity_id, task.day, task.time_slot)
-                activity_changes[task.station_id] = 0
-            else:
-                prev_activity, prev_day, prev_slot = current_activities[task.station_id]
-                if prev_activity != task.activity_id:
-                    activity_changes[task.station_id] += 1
-                current_activities[task.station_id] = (task.activity_id, task.day, task.time_slot)
-        
-        # Calculate activity change penalties
-        activity_change_penalty = sum(changes * 10 for changes in activity_changes.values())
-        
-        # Calculate final score
-        score = ((am_utilization + pm_utilization) / 2) * 2000  # Base utilization (doubled)
-        score += full_day_bonus + high_utilization_bonus
-        score -= (daily_penalty + shift_imbalance_penalty + station_underuse_penalty + activity_change_penalty)
-        
-        return max(0, score)  # Ensure non-negative
+        return self.score_memo.lookup(
+            schedule_key(scheduled_tasks),
+            lambda: ScoreState.from_tasks(scheduled_tasks).score()
+        )
+
+    def evaluation_stats(self) -> Dict[str, Dict]:
+        """Hit/miss statistics of the score and feasibility memos."""
+        return {
+            "score": self.score_memo.stats(),
+            "feasibility": self.constraints_agent.feasibility_memo.stats(),
+        }
 
     def _format_violation_history(self, violations: List[Dict]) -> str:
         """Format violation history for agent prompts."""
@@ -400,56 +361,9 @@ class SchedulingOrchestrator:
         return [step for step in steps if step.step_id not in problem_steps] 
 
     def _print_schedule(self, tasks: List[ScheduledTask]):
-        """Print schedule in a readable format."""
-        if not tasks:
-            print("No tasks scheduled")
-            return
-            
-        # Group by day and shift
-        schedule = {}  # (day, slot) -> List[tasks]
-        for task in sorted(tasks, key=lambda t: (t.day, t.time_slot)):
-            key = (task.day, task.time_slot)
-            if key not in schedule:
-                schedule[key] = []
-            schedule[key].append(task)
-        
-        # Track cumulative progress
-        completed_units = {}  # step_id -> set(completed units)
-        
-        # Get all POs and their steps
-        po_lookup = {}  # po_id -> PurchaseOrder
-        for po in self.step_sequencer.purchase_orders:
-            po_lookup[po.id] = po
-        
-        for (day, slot), shift_tasks in sorted(schedule.items()):
-            # Print date and shift separately to avoid parsing issues
-            print(f"\nDate: {day.isoformat()}")
-            print(f"Shift: {slot}")
-            for task in sorted(shift_tasks, key=lambda t: t.station_id):
-                step = next((s for s in self.production_steps if s.step_id == task.step_id), None)
-                print(
-                    f"  Station {task.station_id}: "
-                    f"Step {task.step_id} "
-                    f"(Activity {task.activity_id}, "
-                    f"Units {task.units_start}-{task.units_end}, "
-                    f"Worker {task.employee_id or 'unassigned'})"
-                )
-                
-                # Update completed units
-                if task.step_id not in completed_units:
-                    completed_units[task.step_id] = set()
-                completed_units[task.step_id].update(range(task.units_start, task.units_end + 1))
-            
-            # Print progress after each shift
-            print("\n  Progress:")
-            for po_id in sorted({t.purchase_order_id for t in tasks}):
-                po = po_lookup[po_id]  # Get actual PO object
-                po_steps = [s for s in self.production_steps if s.purchase_order_id == po_id]
-                progress, active_steps = self.step_sequencer._calculate_po_progress(
-                    po, po_steps, completed_units
-                )
-                print(f"    Order {po.id}: {progress:.1f}% complete "
-                      f"({active_steps}/{len(po_steps)} steps active)")
+        """Log schedule at debug level in a readable format."""
+        report = ScheduleReport(tasks, [], self.production_steps, self.step_sequencer.purchase_orders)
+        logger.debug("%s", report.render_text())
 
     def validate_schedule(self, schedule: List[ScheduledTask]) -> bool:
         """Validate schedule has all required assignments."""
@@ -0,0 +1,245 @@
+from typing import Dict, List, Optional, Set, Tuple
+import argparse
+import dataclasses
+import datetime
+import logging
+import os
+import time
+from .config import (
+    config, TIME_SLOTS, SCHEDULE_EXPORT_PATH, REPORT_HTML_PATH, OUTPUT_DIR,
+    ROLLING_HORIZON_DAYS, ROLLING_WINDOW_DAYS, ROLLING_FREEZE_DAYS, ROLLING_ORDER_LOOKAHEAD_DAYS
+)
+from .models.employee import Employee
+from .models.station import Station
+from .models.purchase_order import PurchaseOrder
+from .models.production_step import ProductionStep
+from .models.scheduled_task import ScheduledTask
+from .models.locked_assignment import LockedAssignment
+from .agents.priority_agent import PriorityAgent
+from .agents.constraints_agent import ConstraintsAgent
+from .agents.step_sequencer import StepSequencer
+from .agents.resource_assigner import ResourceAssigner
+from .agents.refinement_agent import RefinementAgent
+from .orchestrator import SchedulingOrchestrator
+from .utils.logging import setup_logging
+from .utils.report import ScheduleReport
+from .utils.schedule_writer import export_schedule
+from .utils.snapshot import ProblemInstance
+
+logger = logging.getLogger("src.rolling_horizon")  # __name__ is "__main__" under python -m src.rolling_horizon
+
+class RollingHorizonScheduler:
+    """
+    Schedules a long horizon one window at a time.
+
+    Each window of window_days is scheduled by the orchestrator; the tasks of
+    its first freeze_days are frozen (kept in tasks and recorded as
+    LockedAssignments) and the next window starts right after them.  Units
+    finished by frozen tasks are carried into the next window's sequencer,
+    stations keep the activity they were last set up for, and steps that
+    are complete drop out of the problem.  Only orders with open steps that
+    are due within lookahead_days after the window's end take part, so the
+    work per window depends on the window, not on the horizon.
+
+    The agents and orchestrator are built once and reused for every window.
+    """
+
+    def __init__(self,
+                 purchase_orders: List[PurchaseOrder],
+                 production_steps: List[ProductionStep],
+                 employees: List[Employee],
+                 stations: List[Station],
+                 window_days: int = ROLLING_WINDOW_DAYS,
+                 freeze_days: int = ROLLING_FREEZE_DAYS,
+                 lookahead_days: Optional[int] = ROLLING_ORDER_LOOKAHEAD_DAYS,
+                 max_iterations: int = 3):
+        if not 0 < freeze_days <= window_days:
+            raise ValueError(f"freeze_days must be between 1 and window_days ({window_days}), got {freeze_days}")
+        self.purchase_orders = purchase_orders
+        self.production_steps = production_steps
+        self.employees = employees
+        self.stations = [dataclasses.replace(station) for station in stations]  # Setups change per window
+        self.window_days = window_days
+        self.freeze_days = freeze_days
+        self.lookahead_days = lookahead_days
+        self.max_iterations = max_iterations
+        self._orders = {po.id: po for po in purchase_orders}
+
+        self.completed_units: Dict[str, Set[int]] = {}  # step_id -> units finished by frozen tasks
+        self.tasks: List[ScheduledTask] = []  # Frozen tasks of all windows, in time order
+        self.locked_assignments: List[LockedAssignment] = []
+        self.window_stats: List[Dict] = []
+
+        self.step_sequencer = StepSequencer(station_list=self.stations, date_list=[])
+        self.orchestrator = SchedulingOrchestrator(
+            priority_agent=PriorityAgent(),
+            step_sequencer=self.step_sequencer,
+            resource_assigner=ResourceAssigner(employees=employees),
+            constraints_agent=ConstraintsAgent(),
+            refinement_agent=RefinementAgent()
+        )
+
+    def run(self, start: datetime.date, horizon_days: int = ROLLING_HORIZON_DAYS) -> List[ScheduledTask]:
+        """Schedule horizon_days from start; returns the frozen tasks."""
+        end = start + datetime.timedelta(days=horizon_days)
+        day = start
+        while day < end:
+            days = min(self.window_days, (end - day).days)
+            window = [day + datetime.timedelta(days=i) for i in range(days)]
+            # The last window freezes everything it scheduled
+            freeze = days if window[-1] == end - datetime.timedelta(days=1) else min(self.freeze_days, days)
+            if not self.schedule_window(window, freeze):
+                logger.info("All steps complete after %s", day - datetime.timedelta(days=1))
+                break
+            day += datetime.timedelta(days=freeze)
+        return self.tasks
+
+    def schedule_window(self, window: List[datetime.date], freeze: int) -> bool:
+        """Schedule one window and freeze its first freeze days; False if no work was left."""
+        orders, steps = self._window_problem(window[-1])
+        if not steps:
+            return bool(self.open_steps())  # Open orders may only be due beyond the lookahead
+
+        started = time.perf_counter()
+        self.step_sequencer.date_list = window
+        self.step_sequencer.carried_units = self.completed_units
+        # Locks and violations from the previous window refer to days and steps that changed
+        self.orchestrator.locked_assignments = set()
+        self.orchestrator.constraint_history.clear()
+        schedule, feasible = self.orchestrator.run_scheduling_loop(
+            purchase_orders=orders,
+            production_steps=steps,
+            employees=self.employees,
+            max_iterations=self.max_iterations
+        )
+
+        frozen_until = window[0] + datetime.timedelta(days=freeze)
+        slot_order = {slot: idx for idx, slot in enumerate(TIME_SLOTS)}
+        frozen = sorted((task for task in schedule if task.day < frozen_until),
+                        key=lambda t: (t.day, slot_order.get(t.time_slot, len(slot_order)), t.station_id))
+        frozen = self._freeze(frozen)
+
+        self.window_stats.append({
+            "start": window[0],
+            "days": len(window),
+            "frozen_days": freeze,
+            "orders": len(orders),
+            "steps": len(steps),
+            "tasks": len(schedule),
+            "frozen_tasks": len(frozen),
+            "feasible": feasible,
+            "seconds": round(time.perf_counter() - started, 3),
+        })
+        logger.info("Window %s..%s: %d orders, %d open steps, %d tasks, froze %d through %s (%.2fs)",
+                    window[0], window[-1], len(orders), len(steps), len(schedule), len(frozen),
+                    frozen_until - datetime.timedelta(days=1), self.window_stats[-1]["seconds"])
+        return True
+
+    def open_steps(self) -> List[ProductionStep]:
+        """Steps of known orders that still have units to produce."""
+        return [step for step in self.production_steps
+                if step.purchase_order_id in self._orders and not self._is_complete(step)]
+
+    def _is_complete(self, step: ProductionStep) -> bool:
+        return len(self.completed_units.get(step.step_id, ())) >= self._orders[step.purchase_order_id].units
+
+    def _window_problem(self, last_day: datetime.date) -> Tuple[List[PurchaseOrder], List[ProductionStep]]:
+        """Orders and open steps for a window, without dependencies on finished steps."""
+        open_steps = self.open_steps()
+        order_ids = {step.purchase_order_id for step in open_steps}
+        if self.lookahead_days is not None:
+            due_by = last_day + datetime.timedelta(days=self.lookahead_days)
+            order_ids = {po_id for po_id in order_ids if self._orders[po_id].due_date <= due_by}
+        open_ids = {step.step_id for step in open_steps}
+
+        steps = []
+        for step in open_steps:
+            if step.purchase_order_id not in order_ids:
+                continue
+            units = self._orders[step.purchase_order_id].units
+            steps.append(dataclasses.replace(
+                step,
+                depends_on=[dep for dep in step.depends_on if dep in open_ids],
+                percent_complete=len(self.completed_units.get(step.step_id, ())) / units * 100 if units else 0.0
+            ))
+        orders = [po for po in self.purchase_orders if po.id in order_ids]
+        return orders, steps
+
+    def _freeze(self, frozen: List[ScheduledTask]) -> List[ScheduledTask]:
+        """
+        Keep frozen tasks, carry their units and leave stations set up for their last activity.
+
+        Refinement may have moved unit ranges between the tasks of a step, so
+        the frozen days need not hold a step's lowest units, while the next
+        window's sequencer numbers new units from the count already done.
+        Frozen tasks are therefore renumbered to continue each step's
+        finished units in time order; returns the renumbered tasks.
+        """
+        renumbered = []
+        for task in frozen:
+            done = self.completed_units.setdefault(task.step_id, set())
+            units_start = len(done)
+            task = dataclasses.replace(task, units_start=units_start,
+                                       units_end=units_start + task.units_end - task.units_start)
+            renumbered.append(task)
+            done.update(range(task.units_start, task.units_end + 1))
+            units = self._orders[task.purchase_order_id].units
+            self.locked_assignments.append(LockedAssignment(
+                step_id=task.step_id,
+                station_id=task.station_id,
+                day=task.day,
+                time_slot=task.time_slot,
+                activity_id=task.activity_id,
+                employee_id=task.employee_id,
+                percent_complete=len(done) / units * 100 if units else 100.0
+            ))
+        stations = {station.id: station for station in self.stations}
+        for task in renumbered:  # In time order, so the last task per station wins
+            if task.station_id in stations:
+                stations[task.station_id].current_activity_id = task.activity_id
+        self.tasks.extend(renumbered)
+        return renumbered
+
+def main():
+    parser = argparse.ArgumentParser(description="Schedule a long horizon in sliding windows.")
+    parser.add_argument("--snapshot", help="Problem snapshot to load instead of the example data")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, help="First planning day (default today)")
+    parser.add_argument("--days", type=int, default=ROLLING_HORIZON_DAYS, help="Horizon length in days")
+    parser.add_argument("--window", type=int, default=ROLLING_WINDOW_DAYS)
+    parser.add_argument("--freeze", type=int, default=ROLLING_FREEZE_DAYS)
+    args = parser.parse_args()
+
+    setup_logging()
+    if not config.validate():
+        logger.error("Error: Invalid configuration. Please check your .env file.")
+        return
+
+    start = args.start or datetime.date.today()
+    if args.snapshot:
+        with ProblemInstance(args.snapshot) as instance:
+            purchase_orders, production_steps, employees, stations, _ = instance.load()
+    else:
+        from .example_data import create_stations, create_employees, create_purchase_orders, create_production_steps
+        purchase_orders = create_purchase_orders(start)
+        production_steps = create_production_steps()
+        employees = create_employees([start + datetime.timedelta(days=i) for i in range(args.days)])
+        stations = create_stations()
+
+    scheduler = RollingHorizonScheduler(purchase_orders, production_steps, employees, stations,
+                                        window_days=args.window, freeze_days=args.freeze)
+    tasks = scheduler.run(start, args.days)
+    logger.info("Rolling horizon: %d windows, %d tasks, %d steps still open",
+                len(scheduler.window_stats), len(tasks), len(scheduler.open_steps()))
+
+    report = ScheduleReport(tasks, employees, production_steps, purchase_orders)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    if REPORT_HTML_PATH:
+        report_path = os.path.join(OUTPUT_DIR, REPORT_HTML_PATH)
+        report.write_html(report_path)
+        logger.info("Report written to %s", report_path)
+    export_path = os.path.join(OUTPUT_DIR, SCHEDULE_EXPORT_PATH)
+    rows = export_schedule(tasks, export_path)
+    logger.info("Exported %d tasks to %s", rows, export_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,454 @@
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import asyncio
+import dataclasses
+import datetime
+import json
+import logging
+from .config import config, SERVICE_HOST, SERVICE_PORT, SERVICE_MAX_BODY, SERVICE_PLANNING_DAYS, SERVICE_MAX_ITERATIONS
+from .models.employee import Employee
+from .models.station import Station
+from .models.purchase_order import PurchaseOrder
+from .models.production_step import ProductionStep
+from .models.scheduled_task import ScheduledTask
+from .agents.priority_agent import PriorityAgent
+from .agents.constraints_agent import ConstraintsAgent
+from .agents.step_sequencer import StepSequencer
+from .agents.resource_assigner import ResourceAssigner
+from .agents.refinement_agent import RefinementAgent
+from .orchestrator import SchedulingOrchestrator
+from .utils.dag import StepGraph
+from .utils.logging import setup_logging
+from .utils.report import ScheduleReport
+from .utils.snapshot import ProblemInstance
+
+logger = logging.getLogger("src.service")  # __name__ is "__main__" under python -m src.service
+
+_STATUS_TEXT = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+class ServiceError(Exception):
+    """A request that is answered with an HTTP error status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def _parse_date(value: Any) -> datetime.date:
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(value)
+
+def _check_field(fields: Dict[str, Any], name: str, kind: type, minimum: float = None,
+                 maximum: float = None, optional: bool = False) -> None:
+    """Raise ValueError unless fields[name] (if given) is a kind within [minimum, maximum]."""
+    if name not in fields or (optional and fields[name] is None):
+        return
+    value = fields[name]
+    # bool is an int subclass, and ints are accepted where floats are expected
+    accepted = (int, float) if kind is float else kind
+    if isinstance(value, bool) or not isinstance(value, accepted):
+        raise ValueError(f"{name} must be {kind.__name__}, got {type(value).__name__}")
+    if minimum is not None and value < minimum:
+        raise ValueError(f"{name} must be at least {minimum}, got {value}")
+    if maximum is not None and value > maximum:
+        raise ValueError(f"{name} must be at most {maximum}, got {value}")
+
+def purchase_order_from_json(data: Dict[str, Any]) -> PurchaseOrder:
+    """PurchaseOrder from a JSON object with an ISO due_date; ValueError if a field is invalid."""
+    if not isinstance(data, dict):
+        raise ValueError("Each order must be an object")
+    fields = dict(data)
+    fields["due_date"] = _parse_date(fields["due_date"])
+    _check_field(fields, "id", str)
+    _check_field(fields, "base_priority", int)
+    _check_field(fields, "value", float)
+    _check_field(fields, "effective_priority", int, optional=True)
+    _check_field(fields, "units", int, minimum=1)
+    return PurchaseOrder(**fields)
+
+def production_step_from_json(data: Dict[str, Any]) -> ProductionStep:
+    """ProductionStep from a JSON object; ValueError if a field is invalid."""
+    if not isinstance(data, dict):
+        raise ValueError("Each step must be an object")
+    for name in ("step_id", "purchase_order_id", "activity_id"):
+        _check_field(data, name, str)
+    _check_field(data, "step_order", int)
+    for name in ("duration_days", "setup_time_days", "teardown_time_days"):
+        _check_field(data, name, float, minimum=0)
+    _check_field(data, "units_per_station", int, minimum=1)
+    _check_field(data, "min_units_to_start", int, minimum=0)
+    _check_field(data, "percent_complete", float, minimum=0, maximum=100)
+    depends_on = data.get("depends_on") or []
+    if not isinstance(depends_on, list) or not all(isinstance(dep, str) for dep in depends_on):
+        raise ValueError("depends_on must be a list of step ids")
+    return ProductionStep(**data)
+
+def task_to_json(task: ScheduledTask) -> Dict[str, Any]:
+    fields = dataclasses.asdict(task)
+    fields["day"] = task.day.isoformat()
+    return fields
+
+class SchedulingService:
+    """
+    Scheduling state kept warm between requests.
+
+    Agents, the orchestrator (with its locked assignments, violation history
+    and score memo) and the problem are built once.  Updates change the
+    in-memory orders and steps and bump a version; a schedule request runs
+    the orchestrator in a worker thread only if the version moved since the
+    last run, and concurrent requests wait for that one run instead of
+    starting their own.  Reads never wait for a run: they get the last
+    finished schedule.
+
+    Steps reported 100% complete drop out of the next run, along with any
+    dependency on them.  The open-step list is rebuilt only when steps
+    change, so the resource assigner sees the same list object between
+    runs and reuses its load state.
+    """
+
+    def __init__(self,
+                 purchase_orders: List[PurchaseOrder],
+                 production_steps: List[ProductionStep],
+                 employees: List[Employee],
+                 stations: List[Station],
+                 dates: List[datetime.date],
+                 max_iterations: int = SERVICE_MAX_ITERATIONS):
+        self.employees = employees
+        self.stations = stations
+        self.dates = dates
+        self.max_iterations = max_iterations
+        self.orders: Dict[str, PurchaseOrder] = {po.id: po for po in purchase_orders}
+        self.steps: Dict[str, ProductionStep] = {step.step_id: step for step in production_steps}
+
+        self.version = 1  # Bumped by every update
+        self.scheduled_version = 0  # Version the current schedule was built from
+        self.schedule: List[ScheduledTask] = []
+        self.feasible = False
+        self.runs = 0
+        self.last_run_seconds = 0.0
+        self.last_error: Optional[str] = None
+        self._open_steps: Optional[List[ProductionStep]] = None  # Cached until steps change
+        self._run_lock = asyncio.Lock()
+        self._schedule_body: Optional[bytes] = None  # Cached JSON of the current schedule
+        self._report: Optional[ScheduleReport] = None
+
+        self.step_sequencer = StepSequencer(station_list=stations, date_list=dates)
+        self.resource_assigner = ResourceAssigner(employees=employees)
+        self.orchestrator = SchedulingOrchestrator(
+            priority_agent=PriorityAgent(),
+            step_sequencer=self.step_sequencer,
+            resource_assigner=self.resource_assigner,
+            constraints_agent=ConstraintsAgent(),
+            refinement_agent=RefinementAgent()
+        )
+
+    # State updates
+
+    def _changed(self, steps_changed: bool = True) -> None:
+        self.version += 1
+        if steps_changed:
+            self._open_steps = None
+
+    def upsert_orders(self, purchase_orders: List[PurchaseOrder], steps: List[ProductionStep]) -> None:
+        """
+        Add or replace orders and steps.
+
+        Steps must belong to a known order and depend only on known steps,
+        without cycles; nothing is changed unless the whole update is valid.
+        """
+        for step in steps:
+            if step.purchase_order_id not in self.orders and all(
+                    po.id != step.purchase_order_id for po in purchase_orders):
+                raise ServiceError(400, f"Step {step.step_id} references unknown order {step.purchase_order_id}")
+        merged = dict(self.steps)
+        merged.update((step.step_id, step) for step in steps)
+        try:
+            graph = StepGraph.for_steps(merged.values())
+        except ValueError as exc:
+            raise ServiceError(400, str(exc))
+        if graph.missing_dependencies:
+            step_id, missing = next(iter(graph.missing_dependencies.items()))
+            raise ServiceError(400, f"Step {step_id} depends on unknown steps {', '.join(missing)}")
+        for po in purchase_orders:
+            self.orders[po.id] = po
+        for step in steps:
+            self.steps[step.step_id] = step
+        self._changed(steps_changed=bool(steps))
+
+    def remove_order(self, po_id: str) -> int:
+        """Drop an order and its steps; returns the number of steps removed."""
+        if po_id not in self.orders:
+            raise ServiceError(404, f"Unknown order {po_id}")
+        removed = [step_id for step_id, step in self.steps.items() if step.purchase_order_id == po_id]
+        removed_ids = set(removed)
+        for step in self.steps.values():
+            dependencies = removed_ids.intersection(step.depends_on)
+            if step.step_id not in removed_ids and dependencies:
+                raise ServiceError(400, f"Step {step.step_id} of order {step.purchase_order_id} "
+                                        f"depends on {', '.join(sorted(dependencies))}")
+        del self.orders[po_id]
+        for step_id in removed:
+            del self.steps[step_id]
+        self._changed()
+        return len(removed)
+
+    def update_progress(self, updates: List[Dict[str, Any]]) -> None:
+        """
+        Set percent_complete of steps from {"step_id", "percent_complete"} items.
+
+        All items are checked before any is applied, and changed steps are
+        replaced rather than modified, since a running reschedule may still
+        be reading the old ones.
+        """
+        if not isinstance(updates, list):
+            raise ServiceError(400, "updates must be a list")
+        progress = {}
+        for update in updates:
+            if not isinstance(update, dict):
+                raise ServiceError(400, "Each progress update must be an object")
+            step_id = update.get("step_id")
+            if not isinstance(step_id, str) or step_id not in self.steps:
+                raise ServiceError(404, f"Unknown step {step_id}")
+            try:
+                progress[step_id] = float(update["percent_complete"])
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ServiceError(400, f"Invalid progress update for step {step_id}: {exc}")
+        for step_id, percent_complete in progress.items():
+            self.steps[step_id] = dataclasses.replace(self.steps[step_id], percent_complete=percent_complete)
+        self._changed()
+
+    def open_steps(self) -> List[ProductionStep]:
+        """Steps still to schedule, without dependencies on finished steps."""
+        if self._open_steps is None:
+            open_ids = {step_id for step_id, step in self.steps.items() if step.percent_complete < 100.0}
+            self._open_steps = [
+                dataclasses.replace(step, depends_on=[dep for dep in step.depends_on if dep in open_ids])
+                if any(dep not in open_ids for dep in step.depends_on) else step
+                for step_id, step in self.steps.items() if step_id in open_ids
+            ]
+        return self._open_steps
+
+    # Scheduling
+
+    async def reschedule(self) -> bool:
+        """Bring the schedule up to date; returns whether a run was needed."""
+        async with self._run_lock:
+            if self.scheduled_version == self.version:
+                return False
+            version = self.version
+            steps = self.open_steps()
+            step_ids = {step.step_id for step in steps}
+            orders = [po for po in self.orders.values()]
+            # Locks on steps that were finished or removed would pin stations for nothing
+            self.orchestrator.locked_assignments = {
+                lock for lock in self.orchestrator.locked_assignments if lock.step_id in step_ids
+            }
+
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            try:
+                schedule, feasible = await loop.run_in_executor(
+                    None, self.orchestrator.run_scheduling_loop, orders, steps, self.employees,
+                    self.max_iterations
+                )
+            except Exception as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                logger.exception("Scheduling run for version %d failed", version)
+                raise
+            self.last_run_seconds = loop.time() - started
+            self.last_error = None
+            self.runs += 1
+            self.schedule = schedule
+            self.feasible = feasible
+            self.scheduled_version = version
+            self._schedule_body = None
+            self._report = None
+            logger.info("Scheduled version %d: %d tasks, feasible=%s (%.2fs)",
+                        version, len(schedule), feasible, self.last_run_seconds)
+            return True
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "scheduled_version": self.scheduled_version,
+            "up_to_date": self.scheduled_version == self.version,
+            "scheduling": self._run_lock.locked(),
+            "runs": self.runs,
+            "last_run_seconds": round(self.last_run_seconds, 3),
+            "last_error": self.last_error,
+            "orders": len(self.orders),
+            "steps": len(self.steps),
+            "open_steps": len(self.open_steps()),
+            "tasks": len(self.schedule),
+            "feasible": self.feasible,
+        }
+
+    def schedule_body(self) -> bytes:
+        if self._schedule_body is None:
+            self._schedule_body = json.dumps({
+                "scheduled_version": self.scheduled_version,
+                "feasible": self.feasible,
+                "tasks": [task_to_json(task) for task in self.schedule],
+            }).encode()
+        return self._schedule_body
+
+    def report(self) -> ScheduleReport:
+        if self._report is None:
+            self._report = ScheduleReport(self.schedule, self.employees, self.steps.values(),
+                                          self.orders.values())
+        return self._report
+
+    # HTTP
+
+    async def handle(self, method: str, path: str, query: Dict[str, List[str]],
+                     body: bytes) -> Tuple[int, str, bytes]:
+        """Route one request; returns (status, content type, body)."""
+        parts = [part for part in path.split("/") if part]
+        route = "/" + "/".join(parts[:1])
+
+        if route == "/health" and method == "GET":
+            return 200, "application/json", json.dumps(self.status()).encode()
+        if route == "/schedule" and method == "GET":
+            return 200, "application/json", self.schedule_body()
+        if route == "/schedule" and method == "POST":
+            if query.get("wait", ["1"])[0] == "0":
+                if self.scheduled_version != self.version:
+                    asyncio.ensure_future(self.reschedule()).add_done_callback(_log_background_failure)
+                return 202, "application/json", json.dumps(self.status()).encode()
+            ran = await self.reschedule()
+            return 200, "application/json", json.dumps(dict(self.status(), ran=ran)).encode()
+        if route == "/report" and method == "GET":
+            fmt = query.get("format", ["text"])[0]
+            if fmt == "text":
+                return 200, "text/plain; charset=utf-8", self.report().render_text().encode()
+            if fmt == "csv":
+                return 200, "text/csv; charset=utf-8", self.report().render_csv().encode()
+            if fmt == "html":
+                return 200, "text/html; charset=utf-8", self.report().render_html().encode()
+            raise ServiceError(400, f"Unknown report format {fmt}")
+        if route == "/orders" and method == "POST" and len(parts) == 1:
+            payload = _json_body(body)
+            try:
+                orders = [purchase_order_from_json(item) for item in payload.get("purchase_orders", [])]
+                steps = [production_step_from_json(item) for item in payload.get("steps", [])]
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ServiceError(400, f"Invalid order data: {exc}")
+            self.upsert_orders(orders, steps)
+            return 200, "application/json", json.dumps(self.status()).encode()
+        if route == "/orders" and method == "DELETE" and len(parts) == 2:
+            removed = self.remove_order(parts[1])
+            return 200, "application/json", json.dumps(dict(self.status(), removed_steps=removed)).encode()
+        if route == "/progress" and method == "POST":
+            self.update_progress(_json_body(body).get("updates", []))
+            return 200, "application/json", json.dumps(self.status()).encode()
+
+        if route in ("/health", "/schedule", "/report", "/orders", "/progress"):
+            raise ServiceError(405, f"{method} not allowed on {path}")
+        raise ServiceError(404, f"No route for {path}")
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer one HTTP/1.1 request and close the connection."""
+        try:
+            try:
+                method, target, body = await _read_request(reader)
+                url = urlsplit(target)
+                status, content_type, payload = await self.handle(method, url.path, parse_qs(url.query), body)
+            except ServiceError as exc:
+                status, content_type = exc.status, "application/json"
+                payload = json.dumps({"error": str(exc)}).encode()
+            except Exception as exc:
+                logger.exception("Request failed")
+                status, content_type = 500, "application/json"
+                payload = json.dumps({"error": f"{type(exc).__name__}: {exc}"}).encode()
+            writer.write(
+                f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT) -> None:
+        server = await asyncio.start_server(self.serve_connection, host, port)
+        logger.info("Scheduling service listening on %s",
+                    ", ".join(str(sock.getsockname()) for sock in server.sockets))
+        async with server:
+            await server.serve_forever()
+
+async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+    request_line = (await reader.readline()).decode("latin-1").split()
+    if len(request_line) != 3:
+        raise ServiceError(400, "Malformed request line")
+    method, target, _ = request_line
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            try:
+                length = int(value)
+            except ValueError:
+                raise ServiceError(400, "Invalid Content-Length")
+    if length > SERVICE_MAX_BODY:
+        raise ServiceError(413, f"Request body over {SERVICE_MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, body
+
+def _json_body(body: bytes) -> Dict[str, Any]:
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError as exc:
+        raise ServiceError(400, f"Invalid JSON: {exc}")
+    if not isinstance(payload, dict):
+        raise ServiceError(400, "Expected a JSON object")
+    return payload
+
+def _log_background_failure(future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Background scheduling run failed: %s", future.exception())
+
+def load_problem(snapshot: Optional[str], days: int) -> Tuple[List[PurchaseOrder], List[ProductionStep],
+                                                            List[Employee], List[Station], List[datetime.date]]:
+    """The problem from a snapshot file, or the example data."""
+    today = datetime.date.today()
+    dates = [today + datetime.timedelta(days=i) for i in range(days)]
+    if snapshot:
+        with ProblemInstance(snapshot) as instance:
+            purchase_orders, production_steps, employees, stations, _ = instance.load()
+    else:
+        from .example_data import create_stations, create_employees, create_purchase_orders, create_production_steps
+        purchase_orders = create_purchase_orders(today)
+        production_steps = create_production_steps()
+        employees = create_employees(dates)
+        stations = create_stations()
+    return purchase_orders, production_steps, employees, stations, dates
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the scheduler as a long-running HTTP service.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--snapshot", help="Problem snapshot to load instead of the example data")
+    parser.add_argument("--days", type=int, default=SERVICE_PLANNING_DAYS, help="Planning days from today")
+    args = parser.parse_args()
+
+    setup_logging()
+    if not config.validate():
+        logger.error("Error: Invalid configuration. Please check your .env file.")
+        return
+
+    service = SchedulingService(*load_problem(args.snapshot, args.days))
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        logger.info("Scheduling service stopped")
+
+if __name__ == "__main__":
+    main()
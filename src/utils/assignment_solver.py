@@ -0,0 +1,76 @@
+from typing import List, Optional, Tuple
+
+INFEASIBLE_COST = 1e9  # Cost for pairs that must not be matched
+
+def solve_assignment(cost: List[List[float]],
+                     column_potentials: Optional[List[float]] = None) -> Tuple[List[int], List[float]]:
+    """
+    Solve a rectangular min-cost assignment problem (Hungarian method).
+
+    cost is an n x m matrix with n <= m; every row is matched to a distinct
+    column.  Returns (assignment, column_potentials) where assignment[i] is the
+    column matched to row i.  The problem is padded to a square one with
+    zero-cost dummy rows, so every column is matched and any column
+    potentials are valid duals: passing the potentials returned by a previous
+    solve warm-starts the next one (row duals are reduced against them).
+    """
+    n = len(cost)
+    if n == 0:
+        return [], list(column_potentials or [])
+    m = len(cost[0])
+    if n > m:
+        raise ValueError(f"Assignment needs at least as many columns as rows ({n} > {m})")
+
+    rows = list(cost) + [[0.0] * m for _ in range(m - n)]
+
+    # 1-indexed duals, column 0 is the virtual root of the alternating tree
+    v = [0.0] * (m + 1)
+    if column_potentials is not None:
+        for j in range(min(m, len(column_potentials))):
+            v[j + 1] = column_potentials[j]
+    u = [0.0] + [min(row[j] - v[j + 1] for j in range(m)) for row in rows]
+    match = [0] * (m + 1)  # column -> row
+    way = [0] * (m + 1)
+    inf = float("inf")
+
+    for i in range(1, m + 1):
+        match[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            row = rows[i0 - 1]
+            u_i0 = u[i0]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - u_i0 - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        # Augment along the alternating path
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    assignment = [0] * n
+    for j in range(1, m + 1):
+        if match[j] <= n:
+            assignment[match[j] - 1] = j - 1
+    return assignment, v[1:]
@@ -0,0 +1,131 @@
+from typing import List, Dict, Iterable, Optional
+import datetime
+from ..models.employee import Employee
+from ..config import TIME_SLOTS
+
+class AvailabilityCalendar:
+    """
+    Bitset availability calendar over a scheduling horizon.
+
+    Horizon slots are numbered day-major (slot = day_index * len(time_slots) +
+    time_slot_index).  Each employee gets an integer mask with one bit per
+    horizon slot, and each horizon slot gets a team mask with one bit per
+    employee (bit i = employees[i]), so questions about one worker or the whole
+    team over a slot or a range of slots are answered with bitwise operations.
+    """
+
+    def __init__(self,
+                 employees: List[Employee],
+                 dates: Iterable[datetime.date],
+                 time_slots: List[str] = TIME_SLOTS):
+        self.employees = employees
+        self.dates = sorted(set(dates))
+        self.time_slots = list(time_slots)
+        self._day_index = {day: idx for idx, day in enumerate(self.dates)}
+        self._slot_offset = {slot: idx for idx, slot in enumerate(self.time_slots)}
+        self._employee_index = {emp.id: idx for idx, emp in enumerate(employees)}
+
+        slots_per_day = len(self.time_slots)
+        self.slot_count = len(self.dates) * slots_per_day
+        self.employee_masks: List[int] = []  # employee index -> horizon slot bits
+        self.team_masks: List[int] = [0] * self.slot_count  # horizon slot -> employee bits
+        self.skill_masks: Dict[str, int] = {}  # activity_id -> employee bits
+
+        for emp_idx, emp in enumerate(employees):
+            mask = 0
+            for day_idx, day in enumerate(self.dates):
+                for slot_idx, slot in enumerate(self.time_slots):
+                    if emp.is_available(day, slot):
+                        index = day_idx * slots_per_day + slot_idx
+                        mask |= 1 << index
+                        self.team_masks[index] |= 1 << emp_idx
+            self.employee_masks.append(mask)
+            for activity_id in emp.skills:
+                self.skill_masks[activity_id] = self.skill_masks.get(activity_id, 0) | (1 << emp_idx)
+
+    def slot_index(self, day: datetime.date, time_slot: str) -> Optional[int]:
+        """Horizon slot number, or None if the shift is outside the horizon."""
+        day_idx = self._day_index.get(day)
+        if day_idx is None or time_slot not in self._slot_offset:
+            return None
+        return day_idx * len(self.time_slots) + self._slot_offset[time_slot]
+
+    def range_mask(self, start_day: datetime.date, start_slot: str,
+                   end_day: datetime.date, end_slot: str) -> int:
+        """Horizon slot bits for an inclusive range of shifts."""
+        start = self.slot_index(start_day, start_slot)
+        end = self.slot_index(end_day, end_slot)
+        if start is None or end is None or end < start:
+            return 0
+        return ((1 << (end - start + 1)) - 1) << start
+
+    def is_available(self, employee_id: str, day: datetime.date, time_slot: str) -> bool:
+        """Whether an employee can work a shift."""
+        emp_idx = self._employee_index[employee_id]
+        index = self.slot_index(day, time_slot)
+        if index is None:
+            return self.employees[emp_idx].is_available(day, time_slot)
+        return bool(self.employee_masks[emp_idx] >> index & 1)
+
+    def is_available_on_day(self, employee_id: str, day: datetime.date) -> bool:
+        """Whether a day is in an employee's availability (shift flags are checked per shift)."""
+        return day in self.employees[self._employee_index[employee_id]].availability
+
+    def is_available_throughout(self, employee_id: str, start_day: datetime.date, start_slot: str,
+                                end_day: datetime.date, end_slot: str) -> bool:
+        """Whether an employee can work every shift in an inclusive range."""
+        mask = self.range_mask(start_day, start_slot, end_day, end_slot)
+        return bool(mask) and self.employee_masks[self._employee_index[employee_id]] & mask == mask
+
+    def team_mask(self, day: datetime.date, time_slot: str) -> int:
+        """Employee bits for everyone available in a shift."""
+        index = self.slot_index(day, time_slot)
+        if index is None:
+            return self._mask_of(emp for emp in self.employees if emp.is_available(day, time_slot))
+        return self.team_masks[index]
+
+    def team_mask_throughout(self, start_day: datetime.date, start_slot: str,
+                             end_day: datetime.date, end_slot: str) -> int:
+        """Employee bits for everyone available in every shift of a range."""
+        start = self.slot_index(start_day, start_slot)
+        end = self.slot_index(end_day, end_slot)
+        if start is None or end is None or end < start:
+            return 0
+        mask = (1 << len(self.employees)) - 1
+        for index in range(start, end + 1):
+            mask &= self.team_masks[index]
+        return mask
+
+    def team_mask_any(self, start_day: datetime.date, start_slot: str,
+                      end_day: datetime.date, end_slot: str) -> int:
+        """Employee bits for everyone available in at least one shift of a range."""
+        start = self.slot_index(start_day, start_slot)
+        end = self.slot_index(end_day, end_slot)
+        if start is None or end is None or end < start:
+            return 0
+        mask = 0
+        for index in range(start, end + 1):
+            mask |= self.team_masks[index]
+        return mask
+
+    def qualified_mask(self, activity_ids: Iterable[str]) -> int:
+        """Employee bits for everyone with at least one of the activities."""
+        mask = 0
+        for activity_id in activity_ids:
+            mask |= self.skill_masks.get(activity_id, 0)
+        return mask
+
+    def employees_in(self, mask: int) -> List[Employee]:
+        """Employees whose bits are set, in employee order."""
+        employees = []
+        while mask:
+            low_bit = mask & -mask
+            employees.append(self.employees[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return employees
+
+    def _mask_of(self, employees: Iterable[Employee]) -> int:
+        mask = 0
+        for emp in employees:
+            mask |= 1 << self._employee_index[emp.id]
+        return mask
@@ -0,0 +1,111 @@
+from typing import List, Dict, Tuple, Iterable, Optional
+from ..models.production_step import ProductionStep
+from .dag import StepGraph
+
+CRITICAL_SLACK = 1e-9  # Slack at or below this counts as critical
+
+class CriticalPathAnalysis:
+    """
+    Critical path method over every step of every purchase order at once.
+
+    A forward pass in topological order gives earliest start/finish, a
+    backward pass gives latest start/finish against the finish time of the
+    step's connected component (normally one purchase order), and slack is
+    latest start minus earliest start.  Durations are per step, in days.
+    update_duration() recomputes only the component containing the step, so
+    changing one order's estimate stays cheap when there are thousands.
+    """
+
+    def __init__(self, steps: Iterable[ProductionStep], durations: Dict[str, float]):
+        steps = list(steps)
+        self.graph = StepGraph.for_steps(steps)
+        self.durations = {step.step_id: durations.get(step.step_id, 0.0) for step in steps}
+        self.purchase_order_of = {step.step_id: step.purchase_order_id for step in steps}
+        self.earliest_start: Dict[str, float] = {}
+        self.earliest_finish: Dict[str, float] = {}
+        self.latest_start: Dict[str, float] = {}
+        self.latest_finish: Dict[str, float] = {}
+        self._critical_predecessor: Dict[str, Optional[str]] = {}  # step -> dependency finishing last
+        self._component_finish: List[float] = []
+
+        # Connected components, each kept in topological order
+        self._component: Dict[str, int] = {}
+        self._members: List[List[str]] = []
+        order = self.graph.topological_order()
+        position = {step_id: idx for idx, step_id in enumerate(order)}
+        for step_id in order:
+            if step_id in self._component:
+                continue
+            component = len(self._members)
+            pending = [step_id]
+            self._component[step_id] = component
+            members = []
+            while pending:
+                current = pending.pop()
+                members.append(current)
+                for other in self.graph.predecessors(current) + self.graph.successors(current):
+                    if other not in self._component:
+                        self._component[other] = component
+                        pending.append(other)
+            members.sort(key=position.get)
+            self._members.append(members)
+            self._component_finish.append(0.0)
+
+        for component in range(len(self._members)):
+            self._compute(component)
+
+    def update_duration(self, step_id: str, duration: float) -> None:
+        """Change one step's duration and recompute its component."""
+        self.durations[step_id] = duration
+        self._compute(self._component[step_id])
+
+    def slack(self, step_id: str) -> float:
+        return self.latest_start[step_id] - self.earliest_start[step_id]
+
+    def is_critical(self, step_id: str) -> bool:
+        return self.slack(step_id) <= CRITICAL_SLACK
+
+    def finish_time(self, step_id: str) -> float:
+        """Finish time of the component a step belongs to."""
+        return self._component_finish[self._component[step_id]]
+
+    def critical_path_to(self, step_id: str) -> List[str]:
+        """Chain of last-finishing dependencies ending at a step."""
+        path = []
+        current = step_id
+        while current is not None:
+            path.append(current)
+            current = self._critical_predecessor[current]
+        return path[::-1]
+
+    def critical_paths(self) -> Dict[str, Tuple[float, List[str]]]:
+        """Per purchase order: (earliest completion time, critical path)."""
+        last_step: Dict[str, str] = {}  # po_id -> step finishing last
+        for step_id in self.graph.topological_order():
+            po_id = self.purchase_order_of[step_id]
+            current = last_step.get(po_id)
+            if current is None or self.earliest_finish[step_id] > self.earliest_finish[current]:
+                last_step[po_id] = step_id
+        return {
+            po_id: (self.earliest_finish[step_id], self.critical_path_to(step_id))
+            for po_id, step_id in last_step.items()
+        }
+
+    def _compute(self, component: int) -> None:
+        members = self._members[component]
+        for step_id in members:
+            start, previous = 0.0, None
+            for dep_id in self.graph.predecessors(step_id):
+                if previous is None or self.earliest_finish[dep_id] > start:
+                    start, previous = self.earliest_finish[dep_id], dep_id
+            self.earliest_start[step_id] = start
+            self.earliest_finish[step_id] = start + self.durations[step_id]
+            self._critical_predecessor[step_id] = previous
+
+        finish = max(self.earliest_finish[step_id] for step_id in members)
+        self._component_finish[component] = finish
+        for step_id in reversed(members):
+            successors = self.graph.successors(step_id)
+            latest = min((self.latest_start[next_id] for next_id in successors), default=finish)
+            self.latest_finish[step_id] = latest
+            self.latest_start[step_id] = latest - self.durations[step_id]
@@ -0,0 +1,191 @@
+from typing import List, Dict, Set, Tuple, Iterable, Optional
+import heapq
+from ..models.production_step import ProductionStep
+
+class StepGraph:
+    """
+    Dependency DAG over production steps.
+
+    Built once per problem in O(V + E) and cached by the (step_id, depends_on)
+    signature of the steps (use StepGraph.for_steps).  Provides a topological
+    order (ties keep step order), dependency levels, ancestor and descendant
+    bitsets (bit i = step_ids[i]) and longest weighted paths.  Dependencies on
+    steps outside the list are ignored for the graph and listed in
+    missing_dependencies.  A dependency cycle raises ValueError.
+    """
+
+    _cache: Dict[tuple, "StepGraph"] = {}
+    _CACHE_SIZE = 32
+
+    def __init__(self, steps: Iterable[ProductionStep]):
+        steps = list(steps)
+        self.step_ids = [step.step_id for step in steps]
+        self.index = {step_id: idx for idx, step_id in enumerate(self.step_ids)}
+        self.missing_dependencies: Dict[str, List[str]] = {}  # step_id -> unknown dependency ids
+        self._predecessors: List[List[int]] = [[] for _ in steps]
+        self._successors: List[List[int]] = [[] for _ in steps]
+        for idx, step in enumerate(steps):
+            for dep_id in step.depends_on:
+                dep_idx = self.index.get(dep_id)
+                if dep_idx is None:
+                    self.missing_dependencies.setdefault(step.step_id, []).append(dep_id)
+                elif dep_idx not in self._predecessors[idx]:
+                    self._predecessors[idx].append(dep_idx)
+                    self._successors[dep_idx].append(idx)
+
+        self._order = self._topological_sort()
+        self._position = {idx: pos for pos, idx in enumerate(self._order)}
+
+        self._levels = [0] * len(steps)
+        self._ancestors = [0] * len(steps)
+        for idx in self._order:
+            for dep_idx in self._predecessors[idx]:
+                self._levels[idx] = max(self._levels[idx], self._levels[dep_idx] + 1)
+                self._ancestors[idx] |= self._ancestors[dep_idx] | (1 << dep_idx)
+        self._descendants = [0] * len(steps)
+        for idx in reversed(self._order):
+            for next_idx in self._successors[idx]:
+                self._descendants[idx] |= self._descendants[next_idx] | (1 << next_idx)
+
+    @classmethod
+    def for_steps(cls, steps: Iterable[ProductionStep]) -> "StepGraph":
+        """Graph for a list of steps, reused while their dependencies are unchanged."""
+        steps = list(steps)
+        signature = tuple((step.step_id, tuple(step.depends_on)) for step in steps)
+        graph = cls._cache.get(signature)
+        if graph is None:
+            graph = cls(steps)
+            if len(cls._cache) >= cls._CACHE_SIZE:
+                cls._cache.clear()
+            cls._cache[signature] = graph
+        return graph
+
+    def __len__(self) -> int:
+        return len(self.step_ids)
+
+    def __contains__(self, step_id: str) -> bool:
+        return step_id in self.index
+
+    # Structure
+
+    def topological_order(self) -> List[str]:
+        """Step ids with every step after its dependencies."""
+        return [self.step_ids[idx] for idx in self._order]
+
+    def predecessors(self, step_id: str) -> List[str]:
+        """Direct dependencies of a step."""
+        return [self.step_ids[idx] for idx in self._predecessors[self.index[step_id]]]
+
+    def successors(self, step_id: str) -> List[str]:
+        """Steps that depend directly on a step, in step order."""
+        return [self.step_ids[idx] for idx in self._successors[self.index[step_id]]]
+
+    def roots(self) -> List[str]:
+        """Steps without (known) dependencies."""
+        return [step_id for idx, step_id in enumerate(self.step_ids) if not self._predecessors[idx]]
+
+    def level(self, step_id: str) -> int:
+        """Length of the longest dependency chain ending at a step (roots are 0)."""
+        return self._levels[self.index[step_id]]
+
+    def levels(self) -> List[List[str]]:
+        """Steps grouped by level; steps in one level are independent."""
+        grouped: List[List[str]] = [[] for _ in range(max(self._levels, default=-1) + 1)]
+        for idx in self._order:
+            grouped[self._levels[idx]].append(self.step_ids[idx])
+        return grouped
+
+    # Transitive closure
+
+    def ancestor_mask(self, step_id: str) -> int:
+        return self._ancestors[self.index[step_id]]
+
+    def descendant_mask(self, step_id: str) -> int:
+        return self._descendants[self.index[step_id]]
+
+    def ancestors(self, step_id: str) -> Set[str]:
+        """All steps a step depends on, directly or transitively."""
+        return set(self.ids_in(self.ancestor_mask(step_id)))
+
+    def descendants(self, step_id: str) -> Set[str]:
+        """All steps that depend on a step, directly or transitively."""
+        return set(self.ids_in(self.descendant_mask(step_id)))
+
+    def ancestor_count(self, step_id: str) -> int:
+        return bin(self.ancestor_mask(step_id)).count("1")
+
+    def depends_on(self, step_id: str, other_id: str) -> bool:
+        """Whether step_id depends on other_id, directly or transitively."""
+        return bool(self.ancestor_mask(step_id) >> self.index[other_id] & 1)
+
+    def ids_in(self, mask: int) -> List[str]:
+        """Step ids whose bits are set, in topological order."""
+        indices = []
+        while mask:
+            low_bit = mask & -mask
+            indices.append(low_bit.bit_length() - 1)
+            mask ^= low_bit
+        indices.sort(key=self._position.get)
+        return [self.step_ids[idx] for idx in indices]
+
+    # Paths
+
+    def longest_paths(self, weights: Dict[str, float]) -> Dict[str, Tuple[float, List[str]]]:
+        """Heaviest dependency chain ending at each step.
+
+        Returns step_id -> (total weight, chain of step ids from a root), where
+        a chain's weight is the sum of its steps' weights (missing weights
+        count as 0).  Ties keep the dependency listed first.
+        """
+        best: Dict[int, Tuple[float, Optional[int]]] = {}  # idx -> (length, previous idx)
+        for idx in self._order:
+            length, previous = 0.0, None
+            for dep_idx in self._predecessors[idx]:
+                if previous is None or best[dep_idx][0] > length:
+                    length, previous = best[dep_idx][0], dep_idx
+            best[idx] = (length + weights.get(self.step_ids[idx], 0.0), previous)
+
+        paths = {}
+        for idx in self._order:
+            chain = []
+            current = idx
+            while current is not None:
+                chain.append(self.step_ids[current])
+                current = best[current][1]
+            paths[self.step_ids[idx]] = (best[idx][0], chain[::-1])
+        return paths
+
+    def longest_path(self, weights: Dict[str, float]) -> Tuple[float, List[str]]:
+        """Heaviest dependency chain in the whole graph."""
+        paths = self.longest_paths(weights)
+        if not paths:
+            return 0.0, []
+        return max(paths.values(), key=lambda path: path[0])
+
+    def _topological_sort(self) -> List[int]:
+        """Kahn's algorithm, taking ready steps in step order."""
+        remaining = [len(preds) for preds in self._predecessors]
+        ready = [idx for idx, count in enumerate(remaining) if count == 0]  # Already a heap
+        order = []
+        while ready:
+            idx = heapq.heappop(ready)
+            order.append(idx)
+            for next_idx in self._successors[idx]:
+                remaining[next_idx] -= 1
+                if remaining[next_idx] == 0:
+                    heapq.heappush(ready, next_idx)
+        if len(order) < len(self.step_ids):
+            raise ValueError(f"Dependency cycle among steps: {' -> '.join(self._find_cycle(remaining))}")
+        return order
+
+    def _find_cycle(self, remaining: List[int]) -> List[str]:
+        """One cycle among the steps Kahn's algorithm could not order."""
+        idx = next(i for i, count in enumerate(remaining) if count > 0)
+        seen = {}
+        path = []
+        while idx not in seen:
+            seen[idx] = len(path)
+            path.append(idx)
+            idx = next(dep for dep in self._predecessors[idx] if remaining[dep] > 0)
+        cycle = path[seen[idx]:] + [idx]
+        return [self.step_ids[i] for i in reversed(cycle)]
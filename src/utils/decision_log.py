@@ -0,0 +1,101 @@
+from typing import Any, Dict, IO, Optional
+import json
+import random
+import threading
+import time
+from ..config import (
+    DECISION_LOG_PATH,
+    DECISION_LOG_SAMPLE_RATE,
+    DECISION_LOG_MAX_PER_SECOND,
+    DECISION_LOG_MAX_CANDIDATES
+)
+
+class DecisionLog:
+    """
+    Opt-in JSON Lines log with one record per scheduling decision.
+
+    Call sites ask sample() first and only build the record when it returns
+    True, so a disabled log costs one attribute check per decision.  sample()
+    keeps a fraction sample_rate of the decisions and then applies a token
+    bucket of max_per_second records (bursts up to one second's worth).
+    Dropped decisions are counted and reported in a summary record on close.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 sample_rate: float = DECISION_LOG_SAMPLE_RATE,
+                 max_per_second: float = DECISION_LOG_MAX_PER_SECOND,
+                 max_candidates: int = DECISION_LOG_MAX_CANDIDATES,
+                 seed: Optional[int] = None):
+        self.path = path
+        self.enabled = path is not None
+        self.sample_rate = sample_rate
+        self.max_per_second = max_per_second
+        self.max_candidates = max_candidates
+        self.written = 0
+        self.sampled_out = 0
+        self.rate_limited = 0
+        self._random = random.Random(seed)
+        self._tokens = float(max_per_second)
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+        self._file: Optional[IO[str]] = open(path, "w", encoding="utf-8") if self.enabled else None
+
+    def sample(self) -> bool:
+        """Whether the next decision should be recorded."""
+        if not self.enabled:
+            return False
+        if self.sample_rate < 1.0 and self._random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return False
+        if self.max_per_second > 0:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.max_per_second,
+                                   self._tokens + (now - self._refilled) * self.max_per_second)
+                self._refilled = now
+                if self._tokens < 1.0:
+                    self.rate_limited += 1
+                    return False
+                self._tokens -= 1.0
+        return True
+
+    def record(self, event: str, **fields: Any) -> None:
+        """Write one decision; dates and other values are stored via str()."""
+        if not self.enabled:
+            return
+        entry = {"ts": round(time.time(), 6), "event": event}
+        entry.update(fields)
+        line = json.dumps(entry, separators=(",", ":"), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self.written += 1
+
+    def top_candidates(self, scored, reverse: bool = False) -> list:
+        """The best max_candidates (id, score) pairs, lowest score first unless reverse."""
+        ranked = sorted(scored, key=lambda pair: pair[1], reverse=reverse)[:self.max_candidates]
+        return [[candidate, round(score, 4)] for candidate, score in ranked]
+
+    def stats(self) -> Dict[str, int]:
+        return {"written": self.written, "sampled_out": self.sampled_out, "rate_limited": self.rate_limited}
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self.record("summary", **self.stats())
+        self._file.close()
+        self._file = None
+        self.enabled = False
+
+_decision_log = DecisionLog()  # Disabled until enable_decision_log()
+
+def get_decision_log() -> DecisionLog:
+    """The active decision log (disabled unless enabled)."""
+    return _decision_log
+
+def enable_decision_log(path: Optional[str] = DECISION_LOG_PATH, **options: Any) -> DecisionLog:
+    """Start logging decisions to path (closing any previous log); None disables."""
+    global _decision_log
+    _decision_log.close()
+    _decision_log = DecisionLog(path, **options)
+    return _decision_log
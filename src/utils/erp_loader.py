@@ -0,0 +1,267 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import datetime
+import json
+import logging
+from ..models.activity import Activity
+from ..models.purchase_order import PurchaseOrder
+from ..models.production_step import ProductionStep
+from ..models.employee import Employee
+from ..models.station import Station
+from .xlsx_reader import iter_xlsx_rows
+from ..config import (
+    ERP_HOURS_PER_DAY,
+    ERP_PROCESS_TIME_PER_UNIT,
+    ERP_DEFAULT_PRIORITY,
+    ERP_DEFAULT_VALUE,
+    ERP_READ_CHUNK_SIZE,
+    ERP_MAX_ROW_CHARS,
+    ERP_RESOURCE_GROUP_ACTIVITIES,
+    ERP_STATIONS_PER_ACTIVITY,
+    ERP_EMPLOYEES_PER_ACTIVITY
+)
+
+logger = logging.getLogger(__name__)
+
+# Columns of an ERP operation row
+JOB = "Job"
+OPERATION = "Opr"
+RESOURCE_GROUP = "ResourceGrpID"
+QUANTITY = "Prod. Qty"
+PROCESS_HOURS = "StandardProcessTime (hr)"
+COMPLETE_QUANTITY = "Job Complete Qty"
+DUE_DATE = "Planned Due Date"
+ERP_COLUMNS = (JOB, OPERATION, RESOURCE_GROUP, QUANTITY, PROCESS_HOURS, COMPLETE_QUANTITY, DUE_DATE)
+
+_SKIP = " \t\r\n,"  # Whitespace, and separators between array items
+
+def iter_json_rows(path: str, chunk_size: int = ERP_READ_CHUNK_SIZE,
+                   max_row_chars: int = ERP_MAX_ROW_CHARS) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the rows of a JSON export one at a time.
+
+    Accepts a top-level array of row objects or one object per line.  The
+    file is read in chunks of chunk_size characters, so memory stays at
+    about one chunk plus one row however large the export is.  A row that
+    does not parse within max_row_chars, or is cut off by the end of the
+    file, raises ValueError instead of reading on.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as handle:
+        buffer, pos, eof = "", 0, False
+        in_array = None  # Unknown until the first character
+        while True:
+            while True:
+                while pos < len(buffer) and buffer[pos] in _SKIP:
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    break
+                buffer, pos = handle.read(chunk_size), 0
+                eof = not buffer
+
+            if pos >= len(buffer):
+                if in_array:
+                    raise ValueError(f"{path}: unterminated JSON array")
+                return
+            if in_array is None:
+                in_array = buffer[pos] == "["
+                if in_array:
+                    pos += 1
+                    continue
+            if in_array and buffer[pos] == "]":
+                return
+
+            try:
+                row, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise ValueError(f"{path}: malformed or truncated row ({e.msg})") from e
+                if len(buffer) - pos > max_row_chars:
+                    raise ValueError(f"{path}: malformed row or row longer than {max_row_chars} characters "
+                                     f"({e.msg})") from e
+                # Row continues in the next chunk
+                chunk = handle.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            if not isinstance(row, dict):
+                raise ValueError(f"{path}: expected a row object, got {type(row).__name__}")
+            pos = end
+            yield row
+
+def iter_rows(path: str, sheet: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Rows of a JSON or .xlsx export; workbooks are read directly, projected to ERP_COLUMNS."""
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        return iter_xlsx_rows(path, sheet, ERP_COLUMNS)
+    return iter_json_rows(path)
+
+def iter_jobs(rows: Iterable[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Group consecutive rows by job.
+
+    Exports list the operations of a job together, so only the current job
+    is held in memory.  A job that reappears after other jobs raises
+    ValueError rather than being split into two orders.
+    """
+    finished = set()
+    current: List[Dict[str, Any]] = []
+    for row in rows:
+        job = row[JOB]
+        if current and job != current[0][JOB]:
+            finished.add(current[0][JOB])
+            yield current
+            current = []
+        if not current and job in finished:
+            raise ValueError(f"Rows of job {job} are not contiguous; sort the export by Job")
+        current.append(row)
+    if current:
+        yield current
+
+def to_date(value: Any) -> Optional[datetime.date]:
+    """ERP date cell (epoch milliseconds, datetime, date or ISO string) as a date."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    if isinstance(value, (int, float)):
+        return datetime.datetime.fromtimestamp(value / 1000, tz=datetime.timezone.utc).date()
+    return datetime.date.fromisoformat(str(value)[:10])
+
+class ErpLoader:
+    """
+    Turns ERP operation rows into purchase orders and production steps.
+
+    Each job becomes a PurchaseOrder "PO-<Job>" and each of its operations a
+    ProductionStep "ST-<Job>-<Opr>" depending on the steps of the job's
+    previous operation number; rows repeating an operation number get a
+    "-2", "-3", ... suffix and run in parallel.  Resource groups map to
+    activity ids through resource_groups, and unmapped groups become
+    activities of the same name.  Activities seen so far are collected in
+    self.activities.
+    """
+
+    def __init__(self,
+                 resource_groups: Optional[Dict[str, str]] = None,
+                 hours_per_day: float = ERP_HOURS_PER_DAY,
+                 process_time_per_unit: bool = ERP_PROCESS_TIME_PER_UNIT):
+        self.resource_groups = ERP_RESOURCE_GROUP_ACTIVITIES if resource_groups is None else resource_groups
+        self.hours_per_day = hours_per_day
+        self.process_time_per_unit = process_time_per_unit
+        self.activities: Dict[str, Activity] = {}  # activity_id -> Activity
+        self.rows_read = 0
+
+    def activity_for(self, resource_group: str) -> str:
+        """Activity id of a resource group, registering the activity."""
+        activity_id = self.resource_groups.get(resource_group, resource_group)
+        if activity_id not in self.activities:
+            self.activities[activity_id] = Activity(activity_id, resource_group)
+        return activity_id
+
+    def orders(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Tuple[PurchaseOrder, List[ProductionStep]]]:
+        """Yield (purchase order, steps) per job as soon as the job's rows are read."""
+        for job_rows in iter_jobs(rows):
+            self.rows_read += len(job_rows)
+            yield self.convert_job(job_rows)
+
+    def convert_job(self, rows: List[Dict[str, Any]]) -> Tuple[PurchaseOrder, List[ProductionStep]]:
+        """Purchase order and chained steps for the rows of one job."""
+        rows = sorted(rows, key=lambda row: row[OPERATION])
+        job = rows[0][JOB]
+        po_id = f"PO-{job}"
+        units = max(int(row[QUANTITY] or 0) for row in rows)
+        completed = max(int(row.get(COMPLETE_QUANTITY) or 0) for row in rows)
+        due_dates = [to_date(row.get(DUE_DATE)) for row in rows]
+        due_dates = [due for due in due_dates if due is not None]
+        if not due_dates:
+            raise ValueError(f"Job {job} has no {DUE_DATE}")
+
+        order = PurchaseOrder(
+            id=po_id,
+            due_date=max(due_dates),
+            base_priority=ERP_DEFAULT_PRIORITY,
+            value=ERP_DEFAULT_VALUE,
+            units=max(units, 1)
+        )
+
+        percent_complete = min(completed / units * 100, 100.0) if units > 0 else 0.0
+        steps = []
+        occurrences: Dict[Any, int] = {}  # Opr -> rows seen, for repeated operation numbers
+        previous: List[str] = []  # Steps of the previous operation number
+        current: List[str] = []
+        for position, row in enumerate(rows, start=1):
+            operation = row[OPERATION]
+            if current and operation != rows[position - 2][OPERATION]:
+                previous, current = current, []
+            occurrences[operation] = occurrences.get(operation, 0) + 1
+            step_id = f"ST-{job}-{operation}"
+            if occurrences[operation] > 1:
+                step_id += f"-{occurrences[operation]}"
+            hours = float(row[PROCESS_HOURS] or 0.0)
+            if not self.process_time_per_unit:
+                hours /= order.units
+            steps.append(ProductionStep(
+                step_id=step_id,
+                purchase_order_id=po_id,
+                activity_id=self.activity_for(row[RESOURCE_GROUP]),
+                step_order=position,
+                duration_days=hours / self.hours_per_day,  # Per unit
+                setup_time_days=0.0,
+                teardown_time_days=0.0,
+                units_per_station=1,
+                min_units_to_start=1,
+                depends_on=list(previous),
+                percent_complete=percent_complete
+            ))
+            current.append(step_id)
+        return order, steps
+
+    def load(self, rows: Iterable[Dict[str, Any]]) -> Tuple[List[PurchaseOrder], List[ProductionStep]]:
+        """All purchase orders and steps of an export."""
+        purchase_orders, steps = [], []
+        for order, order_steps in self.orders(rows):
+            purchase_orders.append(order)
+            steps.extend(order_steps)
+        return purchase_orders, steps
+
+def stream_erp_file(path: str, loader: Optional[ErpLoader] = None,
+                    sheet: Optional[str] = None) -> Iterator[Tuple[PurchaseOrder, List[ProductionStep]]]:
+    """Yield (purchase order, steps) per job of a JSON or .xlsx export, row by row."""
+    loader = loader or ErpLoader()
+    return loader.orders(iter_rows(path, sheet))
+
+def load_erp_file(path: str, loader: Optional[ErpLoader] = None,
+                  sheet: Optional[str] = None) -> Tuple[List[PurchaseOrder], List[ProductionStep], List[Activity]]:
+    """Purchase orders, steps and activities of a JSON or .xlsx export."""
+    loader = loader or ErpLoader()
+    purchase_orders, steps = loader.load(iter_rows(path, sheet))
+    logger.info("Loaded %d orders, %d steps from %d rows of %s",
+                len(purchase_orders), len(steps), loader.rows_read, path)
+    return purchase_orders, steps, list(loader.activities.values())
+
+def plant_for(activities: Iterable[Activity], dates: Iterable[datetime.date],
+              stations_per_activity: int = ERP_STATIONS_PER_ACTIVITY,
+              employees_per_activity: int = ERP_EMPLOYEES_PER_ACTIVITY) -> Tuple[List[Employee], List[Station]]:
+    """
+    Employees and stations for imported activities.
+
+    Exports hold orders only, so each activity gets stations_per_activity
+    stations set up for it and employees_per_activity workers skilled in it,
+    available on every date.
+    """
+    dates = set(dates)
+    employees, stations = [], []
+    for activity in activities:
+        for n in range(1, stations_per_activity + 1):
+            stations.append(Station(f"{activity.id}-S{n}", activity.id))
+        for n in range(1, employees_per_activity + 1):
+            employees.append(Employee(f"{activity.id}-E{n}", f"{activity.description} worker {n}",
+                                      {activity.id}, set(dates)))
+    return employees, stations
+
+def load_erp_problem(path: str, dates: List[datetime.date], sheet: Optional[str] = None) -> Tuple[
+        List[PurchaseOrder], List[ProductionStep], List[Employee], List[Station], List[Activity]]:
+    """Orders and steps of an export with a plant for its activities (see plant_for)."""
+    purchase_orders, steps, activities = load_erp_file(path, sheet=sheet)
+    employees, stations = plant_for(activities, dates)
+    return purchase_orders, steps, employees, stations, activities
@@ -0,0 +1,128 @@
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+from collections import OrderedDict
+import hashlib
+from ..models.scheduled_task import ScheduledTask
+from ..config import EVALUATION_MEMO_SIZE
+
+_MASK = (1 << 64) - 1
+
+# Field tuple -> stable hash; tasks recur across evaluations, so most lookups hit
+_task_hashes: Dict[tuple, int] = {}
+_TASK_HASH_CACHE_SIZE = 65536
+
+def task_hash(task: ScheduledTask) -> int:
+    """Stable hash of every field of a scheduled task."""
+    fields = (
+        task.station_id, task.day, task.time_slot, task.purchase_order_id,
+        task.step_id, task.activity_id, task.employee_id, task.percent_complete,
+        task.units_start, task.units_end
+    )
+    value = _task_hashes.get(fields)
+    if value is None:
+        digest = hashlib.blake2b(repr(fields).encode(), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        if len(_task_hashes) >= _TASK_HASH_CACHE_SIZE:
+            _task_hashes.clear()
+        _task_hashes[fields] = value
+    return value
+
+class ScheduleFingerprint:
+    """
+    Incrementally maintained hash of a multiset of scheduled tasks.
+
+    The fingerprint is the sum of the task hashes modulo 2**64 together with
+    the task count, so it ignores task order, and adding or removing a task is
+    one hash and one addition.
+    """
+
+    def __init__(self, value: int = 0, count: int = 0):
+        self.value = value
+        self.count = count
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[ScheduledTask]) -> "ScheduleFingerprint":
+        fingerprint = cls()
+        for task in tasks:
+            fingerprint.add(task)
+        return fingerprint
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        return (self.value, self.count)
+
+    def add(self, task: ScheduledTask) -> None:
+        self.add_hash(task_hash(task))
+
+    def remove(self, task: ScheduledTask) -> None:
+        self.remove_hash(task_hash(task))
+
+    def add_hash(self, value: int) -> None:
+        self.value = (self.value + value) & _MASK
+        self.count += 1
+
+    def remove_hash(self, value: int) -> None:
+        self.value = (self.value - value) & _MASK
+        self.count -= 1
+
+def schedule_key(tasks: Iterable[ScheduledTask]) -> Tuple[int, int]:
+    """Fingerprint key of a schedule, reusing one the schedule maintains itself."""
+    fingerprint = getattr(tasks, "fingerprint", None)
+    if isinstance(fingerprint, ScheduleFingerprint):
+        return fingerprint.key
+    return ScheduleFingerprint.from_tasks(tasks).key
+
+_MISSING = object()
+
+class EvaluationMemo:
+    """
+    Least-recently-used cache of evaluation results with hit/miss counts.
+    """
+
+    def __init__(self, maxsize: int = EVALUATION_MEMO_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def lookup(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Cached value for key, computing and storing it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counts, hit rate and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
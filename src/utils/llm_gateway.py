@@ -0,0 +1,104 @@
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import threading
+import time
+from ..config import LLM_CALLS_PER_MINUTE, LLM_CACHE_SIZE
+
+class RateLimiter:
+    """
+    Token bucket of LLM calls per minute, allowing bursts of one second's
+    worth (at least one call).
+
+    Built with a multiprocessing Manager, the bucket and its lock live in the
+    manager process and every worker that receives the limiter draws from
+    the same budget; otherwise it is local to the process.
+    """
+
+    def __init__(self, calls_per_minute: float, manager=None):
+        self.rate = calls_per_minute / 60.0
+        self.capacity = max(1.0, self.rate)
+        if manager is not None:
+            self._lock = manager.Lock()
+            self._state = manager.list([self.capacity, time.time()])  # [tokens, last refill]
+        else:
+            self._lock = threading.Lock()
+            self._state = [self.capacity, time.time()]
+
+    def acquire(self) -> float:
+        """Wait for a call slot; returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                tokens, refilled = self._state[0], self._state[1]
+                now = time.time()
+                tokens = min(self.capacity, tokens + (now - refilled) * self.rate)
+                if tokens >= 1.0:
+                    self._state[0], self._state[1] = tokens - 1.0, now
+                    return waited
+                self._state[0], self._state[1] = tokens, now
+                delay = (1.0 - tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+class ResponseCache:
+    """
+    LLM answers by prompt key, optionally in a Manager dict shared by
+    processes.  Holds at most max_entries answers; when full, new answers
+    are not stored.
+    """
+
+    def __init__(self, max_entries: int = LLM_CACHE_SIZE, manager=None):
+        self.max_entries = max_entries
+        self._entries = manager.dict() if manager is not None else {}
+
+    def get(self, key: str) -> Optional[str]:
+        return self._entries.get(key)
+
+    def put(self, key: str, answer: str) -> None:
+        if len(self._entries) < self.max_entries:
+            self._entries[key] = answer
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+def crew_key(crew: Any) -> str:
+    """Hash of the agents' roles and the task prompts of a crew."""
+    parts = [
+        [getattr(agent, "role", "") for agent in getattr(crew, "agents", [])],
+        [[getattr(task, "description", ""), getattr(task, "expected_output", "")]
+         for task in getattr(crew, "tasks", [])],
+    ]
+    return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+_limiter: Optional[RateLimiter] = (
+    RateLimiter(LLM_CALLS_PER_MINUTE) if LLM_CALLS_PER_MINUTE > 0 else None
+)
+_cache: Optional[ResponseCache] = ResponseCache(LLM_CACHE_SIZE) if LLM_CACHE_SIZE > 0 else None
+_stats = {"calls": 0, "cache_hits": 0, "wait_seconds": 0.0}
+
+def configure_llm(limiter: Optional[RateLimiter] = None, cache: Optional[ResponseCache] = None) -> None:
+    """Route this process's LLM calls through limiter and cache (None turns either off)."""
+    global _limiter, _cache
+    _limiter = limiter
+    _cache = cache
+
+def kickoff(crew: Any) -> str:
+    """Run a crew through the rate limiter and cache; returns its answer as text."""
+    key = crew_key(crew) if _cache is not None else None
+    if key is not None:
+        answer = _cache.get(key)
+        if answer is not None:
+            _stats["cache_hits"] += 1
+            return answer
+    if _limiter is not None:
+        _stats["wait_seconds"] += _limiter.acquire()
+    answer = str(crew.kickoff())
+    _stats["calls"] += 1
+    if key is not None:
+        _cache.put(key, answer)
+    return answer
+
+def llm_stats() -> Dict[str, float]:
+    """LLM calls made, cache hits and seconds waited for the rate limit in this process."""
+    return dict(_stats)
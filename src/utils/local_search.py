@@ -0,0 +1,409 @@
+from typing import List, Dict, Optional, Tuple, Set, Any
+from dataclasses import dataclass
+import bisect
+import copy
+import datetime
+import random
+import time
+from ..models.scheduled_task import ScheduledTask
+from ..models.production_step import ProductionStep
+from ..models.employee import Employee
+from ..models.locked_assignment import LockedAssignment
+from .availability import AvailabilityCalendar
+from .score_state import ScoreState
+from ..config import (
+    TIME_SLOTS, LOCAL_SEARCH_TIME_BUDGET, LOCAL_SEARCH_HISTORY, LOCAL_SEARCH_SEED,
+    LOCAL_SEARCH_DOUBLE_BOOKING_PENALTY
+)
+
+# A move is (kind, ((task_index, {field: new_value}), ...))
+Move = Tuple[str, Tuple[Tuple[int, Dict[str, Any]], ...]]
+
+MOVE_FIELDS = ("station_id", "day", "time_slot", "units_start", "units_end", "employee_id")
+
+class SearchState:
+    """
+    A schedule under local search with incrementally maintained score and
+    feasibility.
+
+    Owns copies of the tasks.  Besides the scoring aggregates it tracks the
+    violations ConstraintsAgent.check_feasibility reports (station conflicts,
+    skill mismatches, unavailable workers and dependency unit shortfalls) plus
+    a precedence guard: a step may not start before any of its dependencies.
+    Locked tasks are never moved.
+    """
+
+    def __init__(self,
+                 tasks: List[ScheduledTask],
+                 steps: List[ProductionStep],
+                 employees: List[Employee],
+                 locked_assignments: Set[LockedAssignment] = None,
+                 station_ids: List[str] = None,
+                 dates: List[datetime.date] = None):
+        self.tasks = [copy.copy(t) for t in tasks]
+        self.step_map = {s.step_id: s for s in steps}
+        self.employee_map = {e.id: e for e in employees}
+        self.station_ids = sorted(station_ids or {t.station_id for t in tasks})
+        self.dates = sorted(dates or {t.day for t in tasks})
+        self.calendar = AvailabilityCalendar(employees, set(self.dates) | {t.day for t in tasks})
+        self._qualified: Dict[str, List[str]] = {}  # activity_id -> worker ids
+        for emp in employees:
+            for activity_id in emp.skills:
+                self._qualified.setdefault(activity_id, []).append(emp.id)
+
+        locked_keys = {
+            (lock.step_id, lock.station_id, lock.day, lock.time_slot)
+            for lock in locked_assignments or ()
+        }
+        self.movable = [
+            idx for idx, t in enumerate(self.tasks)
+            if (t.step_id, t.station_id, t.day, t.time_slot) not in locked_keys
+        ]
+        self._movable_set = set(self.movable)
+        self._step_tasks: Dict[str, List[int]] = {}  # step_id -> task indices
+        for idx, t in enumerate(self.tasks):
+            self._step_tasks.setdefault(t.step_id, []).append(idx)
+        self._dependents: Dict[str, List[str]] = {}  # step_id -> steps depending on it
+        for step in steps:
+            for dep_id in step.depends_on:
+                self._dependents.setdefault(dep_id, []).append(step.step_id)
+
+        self.score = ScoreState()
+        self.cells: Dict[Tuple[str, datetime.date, str], Set[int]] = {}  # (station, day, slot) -> task indices
+        self.worker_load: Dict[Tuple[str, datetime.date, str], int] = {}
+        self.step_slots: Dict[str, list] = {}  # step_id -> sorted slot numbers
+        self.station_conflicts = 0
+        self.worker_violations = 0  # Skill mismatches and unavailable workers
+        self.double_bookings = 0
+        self.precedence_violations = 0
+        self.unit_violations = self._count_unit_violations()
+        for idx, t in enumerate(self.tasks):
+            self._add(idx, t)
+        self.precedence_violations = sum(
+            self._step_precedence_violations(step_id) for step_id in self._step_tasks
+        )
+
+    # Evaluation
+
+    def raw_score(self) -> float:
+        """Schedule score without the clamp at zero."""
+        return self.score.raw_score()
+
+    def objective(self) -> float:
+        """Value maximised by the search: raw score minus worker double-booking."""
+        return self.score.raw_score() - self.double_bookings * LOCAL_SEARCH_DOUBLE_BOOKING_PENALTY
+
+    def violations(self) -> int:
+        """Number of hard violations; the search never lets it grow."""
+        return (self.station_conflicts + self.worker_violations +
+                self.unit_violations + self.precedence_violations)
+
+    def is_feasible(self) -> bool:
+        return self.violations() == 0
+
+    def is_movable(self, idx: int) -> bool:
+        """Whether the task at idx is not locked."""
+        return idx in self._movable_set
+
+    # Moves
+
+    def apply(self, move: Move) -> Move:
+        """Apply a move and return the move that undoes it."""
+        kind, changes = move
+        undo = []
+        edges = self._edges_around({self.tasks[idx].step_id for idx, _ in changes})
+        before = sum(self._edge_violation(step_id, dep_id) for step_id, dep_id in edges)
+        for idx, fields in changes:
+            task = self.tasks[idx]
+            undo.append((idx, {name: getattr(task, name) for name in fields}))
+            self._remove(idx, task)
+            for name, value in fields.items():
+                setattr(task, name, value)
+            self._add(idx, task)
+        after = sum(self._edge_violation(step_id, dep_id) for step_id, dep_id in edges)
+        self.precedence_violations += after - before
+        return kind, tuple(reversed(undo))
+
+    def propose(self, rng: random.Random) -> Optional[Move]:
+        """Draw a random move, or None if the draw produced no valid move."""
+        if not self.movable:
+            return None
+        roll = rng.random()
+        if roll < 0.35:
+            return self._propose_relocate(rng)
+        if roll < 0.65:
+            return self._propose_swap(rng)
+        if roll < 0.8:
+            return self._propose_shift_units(rng)
+        return self._propose_reassign(rng)
+
+    def schedule(self) -> List[ScheduledTask]:
+        """Copies of the current tasks."""
+        return [copy.copy(t) for t in self.tasks]
+
+    def snapshot(self) -> List[tuple]:
+        """Movable fields of every task, for restore()."""
+        return [tuple(getattr(t, name) for name in MOVE_FIELDS) for t in self.tasks]
+
+    def restore(self, snapshot: List[tuple]) -> None:
+        """Return to a snapshot() taken from this state."""
+        changes = []
+        for idx, values in enumerate(snapshot):
+            task = self.tasks[idx]
+            fields = {
+                name: value for name, value in zip(MOVE_FIELDS, values)
+                if getattr(task, name) != value
+            }
+            if fields:
+                changes.append((idx, fields))
+        if changes:
+            self.apply(("restore", tuple(changes)))
+
+    def _propose_relocate(self, rng: random.Random) -> Optional[Move]:
+        idx = rng.choice(self.movable)
+        task = self.tasks[idx]
+        target = (rng.choice(self.station_ids), rng.choice(self.dates), rng.choice(TIME_SLOTS))
+        if target == (task.station_id, task.day, task.time_slot):
+            return None
+        occupant = self._occupant(target)
+        if occupant is None:
+            return ("relocate", ((idx, {"station_id": target[0], "day": target[1], "time_slot": target[2]}),))
+        return self._swap_move(idx, occupant)
+
+    def _propose_swap(self, rng: random.Random) -> Optional[Move]:
+        if len(self.movable) < 2:
+            return None
+        first, second = rng.sample(self.movable, 2)
+        return self._swap_move(first, second)
+
+    def _swap_move(self, first: int, second: int) -> Optional[Move]:
+        a, b = self.tasks[first], self.tasks[second]
+        if first == second or second not in self._movable_set:
+            return None
+        if (a.station_id, a.day, a.time_slot) == (b.station_id, b.day, b.time_slot):
+            return None
+        return ("swap", (
+            (first, {"station_id": b.station_id, "day": b.day, "time_slot": b.time_slot}),
+            (second, {"station_id": a.station_id, "day": a.day, "time_slot": a.time_slot}),
+        ))
+
+    def _propose_shift_units(self, rng: random.Random) -> Optional[Move]:
+        """Move the boundary between two adjacent unit ranges of the same step."""
+        idx = rng.choice(self.movable)
+        task = self.tasks[idx]
+        partner = next(
+            (other for other in self._step_tasks[task.step_id]
+             if self.tasks[other].units_start == task.units_end + 1),
+            None
+        )
+        if partner is None or partner not in self._movable_set:
+            return None
+        other = self.tasks[partner]
+        capacity = self.step_map[task.step_id].units_per_station
+        shift = rng.choice((-2, -1, 1, 2))
+        boundary = task.units_end + shift
+        if not (task.units_start <= boundary < other.units_end):
+            return None
+        if boundary - task.units_start + 1 > capacity or other.units_end - boundary > capacity:
+            return None
+        return ("shift_units", (
+            (idx, {"units_end": boundary}),
+            (partner, {"units_start": boundary + 1}),
+        ))
+
+    def _propose_reassign(self, rng: random.Random) -> Optional[Move]:
+        idx = rng.choice(self.movable)
+        task = self.tasks[idx]
+        workers = self._qualified.get(self.step_map[task.step_id].activity_id)
+        if not workers:
+            return None
+        worker_id = rng.choice(workers)
+        if worker_id == task.employee_id:
+            return None
+        return ("reassign", ((idx, {"employee_id": worker_id}),))
+
+    def _occupant(self, cell: Tuple[str, datetime.date, str]) -> Optional[int]:
+        occupants = self.cells.get(cell)
+        return min(occupants) if occupants else None
+
+    # Incremental bookkeeping
+
+    def _add(self, idx: int, task: ScheduledTask) -> None:
+        self.score.insert(idx, task)
+        occupants = self.cells.setdefault((task.station_id, task.day, task.time_slot), set())
+        occupants.add(idx)
+        if len(occupants) == 2:
+            self.station_conflicts += 1
+        if task.employee_id:
+            self.worker_violations += self._worker_violation(task)
+            key = (task.employee_id, task.day, task.time_slot)
+            count = self.worker_load.get(key, 0) + 1
+            self.worker_load[key] = count
+            if count > 1:
+                self.double_bookings += 1
+        bisect.insort(self.step_slots.setdefault(task.step_id, []), self._slot_number(task))
+
+    def _remove(self, idx: int, task: ScheduledTask) -> None:
+        self.score.remove(idx)
+        cell = (task.station_id, task.day, task.time_slot)
+        occupants = self.cells[cell]
+        occupants.discard(idx)
+        if len(occupants) == 1:
+            self.station_conflicts -= 1
+        if not occupants:
+            del self.cells[cell]
+        if task.employee_id:
+            self.worker_violations -= self._worker_violation(task)
+            key = (task.employee_id, task.day, task.time_slot)
+            count = self.worker_load[key] - 1
+            self.worker_load[key] = count
+            if count > 0:
+                self.double_bookings -= 1
+        slots = self.step_slots[task.step_id]
+        del slots[bisect.bisect_left(slots, self._slot_number(task))]
+
+    def _worker_violation(self, task: ScheduledTask) -> int:
+        worker = self.employee_map.get(task.employee_id)
+        if worker is None:
+            return 1
+        violations = 0
+        if self.step_map[task.step_id].activity_id not in worker.skills:
+            violations += 1
+        if not self.calendar.is_available_on_day(task.employee_id, task.day):
+            violations += 1
+        return violations
+
+    def _slot_number(self, task: ScheduledTask) -> int:
+        return task.day.toordinal() * len(TIME_SLOTS) + TIME_SLOTS.index(task.time_slot)
+
+    def _edges_around(self, step_ids: Set[str]) -> Set[Tuple[str, str]]:
+        """Dependency edges (step, dependency) into and out of the given steps."""
+        edges = set()
+        for step_id in step_ids:
+            step = self.step_map.get(step_id)
+            if step is not None:
+                edges.update((step_id, dep_id) for dep_id in step.depends_on)
+            edges.update((dependent_id, step_id) for dependent_id in self._dependents.get(step_id, ()))
+        return edges
+
+    def _step_precedence_violations(self, step_id: str) -> int:
+        step = self.step_map.get(step_id)
+        if step is None:
+            return 0
+        return sum(self._edge_violation(step_id, dep_id) for dep_id in step.depends_on)
+
+    def _edge_violation(self, step_id: str, dep_id: str) -> int:
+        slots = self.step_slots.get(step_id)
+        dep_slots = self.step_slots.get(dep_id)
+        if not slots or not dep_slots:
+            return 0
+        return int(slots[0] < dep_slots[0])
+
+    def _count_unit_violations(self) -> int:
+        """Missing dependencies and unit shortfalls; unit moves keep coverage unchanged."""
+        units: Dict[str, Set[int]] = {}
+        for t in self.tasks:
+            units.setdefault(t.step_id, set()).update(range(t.units_start, t.units_end + 1))
+        violations = 0
+        for step_id in units:
+            step = self.step_map.get(step_id)
+            if step is None:
+                continue
+            for dep_id in step.depends_on:
+                if dep_id not in units or len(units[dep_id]) < step.min_units_to_start:
+                    violations += 1
+        return violations
+
+@dataclass
+class LocalSearchResult:
+    """Outcome of a local search run."""
+    schedule: List[ScheduledTask]
+    score: float
+    initial_score: float
+    iterations: int
+    accepted: int
+    improvements: int
+    elapsed: float
+
+    @property
+    def moves_per_second(self) -> float:
+        return self.iterations / self.elapsed if self.elapsed else 0.0
+
+@dataclass
+class RefinementUpdate:
+    """An improved schedule reported during anytime refinement."""
+    schedule: List[ScheduledTask]
+    score: float
+    raw_score: float
+    source: str  # "local_search" or "llm"
+    elapsed: float
+
+class LocalSearch:
+    """
+    Late-acceptance hill climbing over a SearchState.
+
+    A candidate move is kept if it does not add violations and its objective
+    is at least the current one or the one recorded history_length
+    iterations ago.  Runs are reproducible for a given seed and
+    max_iterations; the time budget only cuts them short.
+    """
+
+    def __init__(self,
+                 state: SearchState,
+                 history_length: int = LOCAL_SEARCH_HISTORY,
+                 seed: int = LOCAL_SEARCH_SEED):
+        self.state = state
+        self.history_length = history_length
+        self.rng = random.Random(seed)
+
+    def run(self,
+            time_budget: float = LOCAL_SEARCH_TIME_BUDGET,
+            max_iterations: Optional[int] = None) -> LocalSearchResult:
+        state = self.state
+        start = time.perf_counter()
+        deadline = start + time_budget
+
+        current = state.objective()
+        current_violations = state.violations()
+        initial_score = state.raw_score()
+        history = [current] * self.history_length
+        best = current
+        best_violations = current_violations
+        best_snapshot = state.snapshot()
+        iterations = accepted = improvements = 0
+
+        while max_iterations is None or iterations < max_iterations:
+            if iterations % 64 == 0 and time.perf_counter() >= deadline:
+                break
+            slot = iterations % self.history_length
+            iterations += 1
+
+            move = state.propose(self.rng)
+            if move is None:
+                continue
+            undo = state.apply(move)
+            candidate = state.objective()
+            candidate_violations = state.violations()
+
+            if candidate_violations <= current_violations and (
+                    candidate >= current or candidate >= history[slot]):
+                accepted += 1
+                current, current_violations = candidate, candidate_violations
+                if (current_violations, -current) < (best_violations, -best):
+                    best, best_violations = current, current_violations
+                    best_snapshot = state.snapshot()
+                    improvements += 1
+            else:
+                state.apply(undo)
+            history[slot] = current
+
+        state.restore(best_snapshot)
+        return LocalSearchResult(
+            schedule=state.schedule(),
+            score=state.raw_score(),
+            initial_score=initial_score,
+            iterations=iterations,
+            accepted=accepted,
+            improvements=improvements,
+            elapsed=time.perf_counter() - start
+        )
@@ -1,23 +1,82 @@
-import sys
+from typing import Optional
+import atexit
 import datetime
+import logging
+import logging.handlers
+import queue
+import sys
+from ..config import LOG_LEVEL, LOG_FILE, LOG_QUIET, LOG_FILE_FLUSH_RECORDS
+
+PACKAGE_LOGGER = __name__.split(".")[0]  # Parent of every module logger in the package
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+class BufferedFileHandler(logging.FileHandler):
+    """File handler that flushes every flush_records records or on warnings, not per record."""
+
+    def __init__(self, filename: str, flush_records: int = LOG_FILE_FLUSH_RECORDS):
+        super().__init__(filename, mode="w", encoding="utf-8")
+        self.flush_records = flush_records
+        self._pending = 0
+        self.stream.write(f"=== Scheduling Run: {datetime.datetime.now()} ===\n\n")
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        self._pending += 1
+        if self._pending >= self.flush_records or record.levelno >= logging.WARNING:
+            self.flush()
+            self._pending = 0
+
+def setup_logging(level: str = LOG_LEVEL,
+                  filename: Optional[str] = LOG_FILE,
+                  quiet: bool = LOG_QUIET,
+                  console: bool = True) -> logging.Logger:
+    """
+    Send the package's log records to the console and the log file.
+
+    Records are queued by the calling thread and formatted and written by a
+    background QueueListener, and the file is flushed in batches.  Quiet mode
+    raises the level to WARNING, so guarded debug output is never built.
+    console=False logs to the file only.
+    Returns the package logger; modules log through logging.getLogger(__name__).
+    """
+    global _listener
+    stop_logging()
+
+    handlers = []
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter("%(message)s"))
+        handlers.append(console_handler)
+    if filename:
+        file_handler = BufferedFileHandler(filename)
+        file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s"))
+        handlers.append(file_handler)
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    logger = logging.getLogger(PACKAGE_LOGGER)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.WARNING if quiet else level)
+    logger.propagate = False
+    return logger
+
+def stop_logging() -> None:
+    """Drain the queue, flush and close the log handlers."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
 
-class Logger:
-    def __init__(self, filename="log.txt"):
-        self.terminal = sys.stdout
-        # Reset the log file
-        with open(filename, 'w') as f:
-            f.write(f"=== Scheduling Run: {datetime.datetime.now()} ===\n\n")
-        self.log = open(filename, 'a')
-
-    def write(self, message):
-        self.terminal.write(message)
-        self.log.write(message)
-        self.log.flush()
-
-    def flush(self):
-        self.terminal.flush()
-        self.log.flush()
-
-def setup_logging():
-    """Setup logging to both console and file."""
-    sys.stdout = Logger() 
\ No newline at end of file
+atexit.register(stop_logging)
@@ -0,0 +1,107 @@
+from typing import List, Optional, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import time
+import datetime
+from ..models.scheduled_task import ScheduledTask
+from ..models.production_step import ProductionStep
+from ..models.employee import Employee
+from ..models.locked_assignment import LockedAssignment
+from .local_search import SearchState, LocalSearch, LocalSearchResult
+from ..config import (
+    LOCAL_SEARCH_TIME_BUDGET, LOCAL_SEARCH_HISTORY, LOCAL_SEARCH_SEED, LOCAL_SEARCH_WORKERS
+)
+
+# Per-process search state, built once by _init_worker
+_worker_state: Optional[SearchState] = None
+_worker_base: List[tuple] = []
+
+def _init_worker(tasks, steps, employees, locked_assignments, station_ids, dates) -> None:
+    """Pool initializer: build the worker's own copy of the problem."""
+    global _worker_state, _worker_base
+    _worker_state = SearchState(tasks, steps, employees, locked_assignments, station_ids, dates)
+    _worker_base = _worker_state.snapshot()
+
+def _run_search(seed: int, history_length: int, time_budget: float,
+                max_iterations: Optional[int]) -> Tuple[int, float, List[tuple], int, int, int]:
+    """One complete late-acceptance search from the base schedule.
+
+    Returns (violations, objective, snapshot, iterations, accepted,
+    improvements) of the best schedule it found.
+    """
+    state = _worker_state
+    state.restore(_worker_base)
+    result = LocalSearch(state, history_length, seed).run(time_budget=time_budget, max_iterations=max_iterations)
+    return (state.violations(), state.objective(), state.snapshot(),
+            result.iterations, result.accepted, result.improvements)
+
+class ParallelLocalSearch:
+    """
+    Multi-start late-acceptance local search on a process pool.
+
+    Every worker process builds its own SearchState from the problem once, in
+    the pool initializer (inherited through fork where available), and runs
+    a complete LocalSearch from the input schedule with its own seed (seed,
+    seed + 1, ...).  The workers share nothing while searching, so moves per
+    second grow with the number of workers; the master only keeps the run
+    with the fewest violations and then the best objective, earliest seed on
+    ties.  Start 0 is exactly the serial search, so the result is never
+    worse than it, and results depend only on the seed, the worker count
+    and max_iterations (per start).
+    """
+
+    def __init__(self,
+                 tasks: List[ScheduledTask],
+                 steps: List[ProductionStep],
+                 employees: List[Employee],
+                 locked_assignments: Set[LockedAssignment] = None,
+                 station_ids: List[str] = None,
+                 dates: List[datetime.date] = None,
+                 workers: int = LOCAL_SEARCH_WORKERS,
+                 history_length: int = LOCAL_SEARCH_HISTORY,
+                 seed: int = LOCAL_SEARCH_SEED):
+        self.problem = (tasks, steps, employees, locked_assignments, station_ids, dates)
+        self.state = SearchState(*self.problem)
+        self.workers = max(1, workers)
+        self.history_length = history_length
+        self.seed = seed
+
+    def run(self,
+            time_budget: float = LOCAL_SEARCH_TIME_BUDGET,
+            max_iterations: Optional[int] = None) -> LocalSearchResult:
+        state = self.state
+        start = time.perf_counter()
+        initial_score = state.raw_score()
+
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 mp_context=self._context(),
+                                 initializer=_init_worker,
+                                 initargs=self.problem) as pool:
+            # Budget left once the pool is up, so worker start-up does not overrun it
+            futures = [
+                pool.submit(_run_search, self.seed + index, self.history_length,
+                            max(0.0, time_budget - (time.perf_counter() - start)), max_iterations)
+                for index in range(self.workers)
+            ]
+            runs = [future.result() for future in futures]
+
+        violations, objective, snapshot, _, _, improvements = min(
+            runs, key=lambda run: (run[0], -run[1])  # min() keeps the earliest start on ties
+        )
+        state.restore(snapshot)
+        return LocalSearchResult(
+            schedule=state.schedule(),
+            score=state.raw_score(),
+            initial_score=initial_score,
+            iterations=sum(run[3] for run in runs),
+            accepted=sum(run[4] for run in runs),
+            improvements=improvements,
+            elapsed=time.perf_counter() - start
+        )
+
+    @staticmethod
+    def _context():
+        """Fork workers where possible so the problem is inherited, not pickled."""
+        if "fork" in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context("fork")
+        return multiprocessing.get_context()
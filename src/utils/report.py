@@ -0,0 +1,199 @@
+from typing import Dict, IO, Iterable, List, Optional, Tuple
+import csv
+import datetime
+import html
+import io
+from ..models.employee import Employee
+from ..models.production_step import ProductionStep
+from ..models.purchase_order import PurchaseOrder
+from ..models.scheduled_task import ScheduledTask
+from ..config import TIME_SLOTS
+
+CSV_COLUMNS = [
+    "day", "time_slot", "station_id", "step_id", "purchase_order_id", "activity_id",
+    "units_start", "units_end", "employee_id", "employee_name", "order_progress",
+]
+
+class ShiftSummary:
+    """Tasks of one shift (rows[start:end]) and the cumulative progress of the orders it touched."""
+
+    def __init__(self, day: datetime.date, time_slot: str, start: int):
+        self.day = day
+        self.time_slot = time_slot
+        self.start = start
+        self.end = start
+        self.progress: List[Tuple[str, float, int, int]] = []  # (po_id, percent, active steps, steps)
+
+class ScheduleReport:
+    """
+    Schedule report aggregated in one sorted pass.
+
+    Tasks are sorted once by (day, slot, station).  Walking them in that
+    order fills the task rows (with worker names and activities looked up in
+    dicts), cumulative per-order progress after each shift for the orders
+    worked in it, and each station's activity changes.  Renderers only read
+    these aggregates, so text, CSV and HTML cost O(n) after the O(n log n)
+    sort.
+    """
+
+    def __init__(self,
+                 schedule: Iterable[ScheduledTask],
+                 employees: Iterable[Employee],
+                 steps: Iterable[ProductionStep],
+                 purchase_orders: Iterable[PurchaseOrder]):
+        steps = list(steps)
+        employee_names = {emp.id: emp.name for emp in employees}
+        step_activity = {step.step_id: step.activity_id for step in steps}
+        order_units = {po.id: po.units for po in purchase_orders}
+        steps_per_order: Dict[str, int] = {}
+        for step in steps:
+            steps_per_order[step.purchase_order_id] = steps_per_order.get(step.purchase_order_id, 0) + 1
+
+        slot_order = {slot: idx for idx, slot in enumerate(TIME_SLOTS)}
+        tasks = sorted(schedule, key=lambda t: (t.day, slot_order.get(t.time_slot, len(slot_order)), t.station_id))
+
+        self.rows: List[tuple] = []  # One per task, in CSV_COLUMNS order without order_progress
+        self.shifts: List[ShiftSummary] = []
+        self.station_changes: Dict[str, List[Tuple[datetime.date, str, str]]] = {}  # station -> (day, slot, activity)
+
+        completed: Dict[str, set] = {}  # step_id -> completed unit numbers
+        order_completed: Dict[str, int] = {}  # po_id -> units completed over all steps
+        order_active: Dict[str, int] = {}  # po_id -> steps with any completed unit
+        station_activity: Dict[str, str] = {}
+        shift: Optional[ShiftSummary] = None
+        touched: Dict[str, None] = {}  # Orders worked in the current shift, in order
+
+        for task in tasks:
+            if shift is None or (task.day, task.time_slot) != (shift.day, shift.time_slot):
+                if shift is not None:
+                    self._close_shift(shift, touched, order_completed, order_active, order_units, steps_per_order)
+                shift = ShiftSummary(task.day, task.time_slot, len(self.rows))
+                self.shifts.append(shift)
+                touched = {}
+
+            activity = step_activity.get(task.step_id, task.activity_id)
+            self.rows.append((
+                task.day, task.time_slot, task.station_id, task.step_id, task.purchase_order_id,
+                activity, task.units_start, task.units_end, task.employee_id,
+                employee_names.get(task.employee_id, task.employee_id) if task.employee_id else "Unassigned",
+            ))
+            shift.end = len(self.rows)
+
+            done = completed.setdefault(task.step_id, set())
+            before = len(done)
+            done.update(range(task.units_start, task.units_end + 1))
+            po_id = task.purchase_order_id
+            order_completed[po_id] = order_completed.get(po_id, 0) + len(done) - before
+            if before == 0 and done:
+                order_active[po_id] = order_active.get(po_id, 0) + 1
+            touched[po_id] = None
+
+            if station_activity.get(task.station_id) != activity:
+                station_activity[task.station_id] = activity
+                self.station_changes.setdefault(task.station_id, []).append((task.day, task.time_slot, activity))
+
+        if shift is not None:
+            self._close_shift(shift, touched, order_completed, order_active, order_units, steps_per_order)
+
+    @staticmethod
+    def _close_shift(shift: ShiftSummary, touched: Dict[str, None], order_completed: Dict[str, int],
+                     order_active: Dict[str, int], order_units: Dict[str, int],
+                     steps_per_order: Dict[str, int]) -> None:
+        for po_id in sorted(touched):
+            step_count = steps_per_order.get(po_id, 0)
+            needed = order_units.get(po_id, 0) * step_count
+            percent = order_completed.get(po_id, 0) / needed * 100 if needed else 0.0
+            shift.progress.append((po_id, percent, order_active.get(po_id, 0), step_count))
+
+    # Rendering
+
+    def render_text(self) -> str:
+        lines = ["=== Schedule Report ==="]
+        if not self.rows:
+            lines.append("No tasks scheduled")
+        for shift in self.shifts:
+            lines.append(f"\n{shift.day} - {shift.time_slot} Shift:")
+            for row in self.rows[shift.start:shift.end]:
+                lines.append(f"  Station {row[2]} (Activity {row[5]}): {row[3]} "
+                             f"(Units {row[6]}-{row[7]}, {row[9]})")
+            lines.append("  Progress:")
+            for po_id, percent, active, step_count in shift.progress:
+                lines.append(f"    Order {po_id}: {percent:.1f}% complete ({active}/{step_count} steps active)")
+
+        lines.append("\n=== Station Activity Changes ===")
+        for station_id in sorted(self.station_changes):
+            lines.append(f"\nStation {station_id} activities:")
+            for day, slot, activity in self.station_changes[station_id]:
+                lines.append(f"  {day} {slot}: Activity {activity}")
+        return "\n".join(lines)
+
+    def write_text(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(self.render_text() + "\n")
+
+    def write_csv(self, path: str) -> None:
+        """One row per task, with its order's progress at the end of the shift."""
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            self._render_csv(handle)
+
+    def render_csv(self) -> str:
+        out = io.StringIO(newline="")
+        self._render_csv(out)
+        return out.getvalue()
+
+    def write_html(self, path: str, title: str = "Production Schedule") -> None:
+        with open(path, "w", encoding="utf-8") as handle:
+            self._render_html(handle, title)
+
+    def render_html(self, title: str = "Production Schedule") -> str:
+        out = io.StringIO()
+        self._render_html(out, title)
+        return out.getvalue()
+
+    def _render_csv(self, out: IO[str]) -> None:
+        writer = csv.writer(out)
+        writer.writerow(CSV_COLUMNS)
+        for shift in self.shifts:
+            progress = {po_id: percent for po_id, percent, _, _ in shift.progress}
+            writer.writerows(
+                (row[0].isoformat(),) + row[1:8] + (row[8] or "", row[9], f"{progress[row[4]]:.1f}")
+                for row in self.rows[shift.start:shift.end]
+            )
+
+    def _render_html(self, out: IO[str], title: str) -> None:
+        esc = html.escape
+        out.write(f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{esc(title)}</title>\n"
+                  "<style>body{font-family:sans-serif;font-size:13px}table{border-collapse:collapse;"
+                  "margin-bottom:1.5em}td,th{border:1px solid #ccc;padding:2px 6px;text-align:left}"
+                  "th{background:#eee}tr.shift th{background:#dde6f0}</style></head><body>\n")
+        out.write(f"<h1>{esc(title)}</h1>\n<p>{len(self.rows)} tasks in {len(self.shifts)} shifts</p>\n")
+
+        out.write("<h2>Tasks</h2>\n<table><tr><th>Station</th><th>Activity</th><th>Step</th>"
+                  "<th>Order</th><th>Units</th><th>Worker</th></tr>\n")
+        for shift in self.shifts:
+            out.write(f"<tr class=\"shift\"><th colspan=\"6\">{shift.day} {esc(shift.time_slot)}</th></tr>\n")
+            out.writelines(
+                f"<tr><td>{esc(row[2])}</td><td>{esc(str(row[5]))}</td><td>{esc(row[3])}</td>"
+                f"<td>{esc(row[4])}</td><td>{row[6]}-{row[7]}</td><td>{esc(row[9])}</td></tr>\n"
+                for row in self.rows[shift.start:shift.end]
+            )
+        out.write("</table>\n")
+
+        out.write("<h2>Order Progress</h2>\n<table><tr><th>Shift</th><th>Order</th><th>Complete</th>"
+                  "<th>Active steps</th></tr>\n")
+        for shift in self.shifts:
+            out.writelines(
+                f"<tr><td>{shift.day} {esc(shift.time_slot)}</td><td>{esc(po_id)}</td>"
+                f"<td>{percent:.1f}%</td><td>{active}/{step_count}</td></tr>\n"
+                for po_id, percent, active, step_count in shift.progress
+            )
+        out.write("</table>\n")
+
+        out.write("<h2>Station Activity Changes</h2>\n<table><tr><th>Station</th><th>From</th>"
+                  "<th>Activity</th></tr>\n")
+        for station_id in sorted(self.station_changes):
+            out.writelines(
+                f"<tr><td>{esc(station_id)}</td><td>{day} {esc(slot)}</td><td>{esc(str(activity))}</td></tr>\n"
+                for day, slot, activity in self.station_changes[station_id]
+            )
+        out.write("</table>\n</body></html>\n")
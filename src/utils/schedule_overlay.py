@@ -0,0 +1,126 @@
+from typing import List, Dict, Iterable, Iterator
+from collections.abc import Sequence
+import copy
+from ..models.scheduled_task import ScheduledTask
+from .fingerprint import ScheduleFingerprint, task_hash
+from ..config import TIME_SLOTS
+
+class ScheduleOverlay(Sequence):
+    """
+    Copy-on-write view of a schedule.
+
+    Wraps an immutable base (a tuple of the original tasks) and records only
+    the tasks that were changed, keyed by position.  Unchanged positions return
+    the base task itself, so trying a handful of changes costs a handful of
+    shallow copies instead of a new ScheduledTask per task.  Copies are made
+    with copy.copy, which does not re-run __post_init__; update() validates
+    time_slot the same way.
+
+    The overlay is a read-only Sequence of ScheduledTask, so it can be passed
+    anywhere a schedule is only iterated, e.g. check_feasibility and
+    _score_schedule.  Base tasks must not be mutated through the overlay; use
+    update() or writable() instead.  The overlay keeps a ScheduleFingerprint
+    that only rehashes modified positions, so memoised evaluations of an
+    overlay cost O(changes).
+    """
+
+    def __init__(self, tasks: Iterable[ScheduledTask]):
+        self._base = tuple(tasks)
+        self._changes: Dict[int, ScheduledTask] = {}  # position -> modified copy
+        self._positions_by_step = None  # step_id -> positions, built on first use
+        self._base_hashes = None  # position -> task_hash of the base task, built on first use
+        self._base_fingerprint = None
+
+    def __len__(self) -> int:
+        return len(self._base)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._base)))]
+        if index < 0:
+            index += len(self._base)
+        task = self._changes.get(index)
+        return task if task is not None else self._base[index]
+
+    def __iter__(self) -> Iterator[ScheduledTask]:
+        changes = self._changes
+        if not changes:
+            return iter(self._base)
+        return (changes.get(idx, task) for idx, task in enumerate(self._base))
+
+    @property
+    def base(self) -> tuple:
+        return self._base
+
+    @property
+    def is_modified(self) -> bool:
+        return bool(self._changes)
+
+    @property
+    def fingerprint(self) -> ScheduleFingerprint:
+        """Fingerprint of the current schedule."""
+        if self._base_hashes is None:
+            self._base_hashes = [task_hash(task) for task in self._base]
+            self._base_fingerprint = ScheduleFingerprint()
+            for value in self._base_hashes:
+                self._base_fingerprint.add_hash(value)
+        fingerprint = ScheduleFingerprint(self._base_fingerprint.value, self._base_fingerprint.count)
+        for idx, task in self._changes.items():
+            fingerprint.remove_hash(self._base_hashes[idx])
+            fingerprint.add(task)
+        return fingerprint
+
+    def modified_positions(self) -> List[int]:
+        """Positions that differ from the base, in order."""
+        return sorted(self._changes)
+
+    def positions_for_step(self, step_id: str) -> List[int]:
+        """Positions of the tasks of a step."""
+        if self._positions_by_step is None:
+            self._positions_by_step = {}
+            for idx, task in enumerate(self):
+                self._positions_by_step.setdefault(task.step_id, []).append(idx)
+        return self._positions_by_step.get(step_id, [])
+
+    def writable(self, index: int) -> ScheduledTask:
+        """The overlay's own copy of a task, created on first write."""
+        task = self._changes.get(index)
+        if task is None:
+            task = copy.copy(self._base[index])
+            self._changes[index] = task
+        return task
+
+    def update(self, index: int, **changes) -> ScheduledTask:
+        """Change fields of the task at a position."""
+        time_slot = changes.get("time_slot")
+        if time_slot is not None and time_slot not in TIME_SLOTS:
+            raise ValueError(f"Invalid time_slot: {time_slot}. Must be one of {TIME_SLOTS}")
+        if "step_id" in changes:
+            self._positions_by_step = None
+        task = self.writable(index)
+        for field, value in changes.items():
+            setattr(task, field, value)
+        return task
+
+    def revert(self, index: int) -> None:
+        """Drop the changes made at one position."""
+        self._changes.pop(index, None)
+
+    def discard(self) -> None:
+        """Drop every change, returning to the base schedule."""
+        self._changes.clear()
+
+    def commit(self) -> List[ScheduledTask]:
+        """Make the changes part of the base and return the schedule as a list."""
+        tasks = list(self)
+        if self._base_hashes is not None:
+            self._base_fingerprint = self.fingerprint
+            for idx, task in self._changes.items():
+                self._base_hashes[idx] = task_hash(task)
+        self._base = tuple(tasks)
+        self._changes = {}
+        return tasks
+
+    def to_list(self) -> List[ScheduledTask]:
+        """The current schedule as a list, leaving the overlay untouched."""
+        return list(self)
@@ -0,0 +1,156 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+import csv
+import datetime
+import json
+import os
+from ..models.scheduled_task import ScheduledTask
+from ..config import SCHEDULE_EXPORT_CHUNK_SIZE
+
+SCHEMA_VERSION = 1
+
+# (column, type, dictionary encoded) in file order; column names are ScheduledTask fields
+COLUMNS: List[Tuple[str, str, bool]] = [
+    ("station_id", "string", True),
+    ("day", "date", False),
+    ("time_slot", "string", True),
+    ("purchase_order_id", "string", True),
+    ("step_id", "string", True),
+    ("activity_id", "string", True),
+    ("employee_id", "string", True),  # Empty cell when unassigned
+    ("percent_complete", "float64", False),
+    ("units_start", "int32", False),
+    ("units_end", "int32", False),
+]
+
+_PARSERS: Dict[str, Callable[[str], Any]] = {
+    "date": datetime.date.fromisoformat,
+    "float64": float,
+    "int32": int,
+    "string": str,
+}
+
+def schema_path(path: str) -> str:
+    """Sidecar schema file of a schedule export ("plan.csv" -> "plan.schema.json")."""
+    return os.path.splitext(path)[0] + ".schema.json"
+
+class ScheduleWriter:
+    """
+    Writes scheduled tasks as a typed, columnar CSV with a JSON schema sidecar.
+
+    String columns (stations, orders, steps, activities, workers, slots) are
+    dictionary encoded: the CSV holds integer codes and the sidecar holds the
+    dictionaries, column types and row count.  Rows are buffered and written
+    chunk_size at a time, so a schedule can be streamed out as it is built.
+    """
+
+    def __init__(self, path: str, chunk_size: int = SCHEDULE_EXPORT_CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self.chunks = 0
+        self._dictionaries: Dict[str, Dict[str, int]] = {
+            name: {} for name, _, encoded in COLUMNS if encoded
+        }
+        self._buffer: List[list] = []
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._csv = csv.writer(self._file)
+        self._csv.writerow([name for name, _, _ in COLUMNS])
+
+    def __enter__(self) -> "ScheduleWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, task: ScheduledTask) -> None:
+        row = []
+        for name, column_type, encoded in COLUMNS:
+            value = getattr(task, name)
+            if value is None:
+                row.append("")
+            elif encoded:
+                codes = self._dictionaries[name]
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(codes)
+                row.append(code)
+            elif column_type == "date":
+                row.append(value.isoformat())
+            else:
+                row.append(value)
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def write_all(self, tasks: Iterable[ScheduledTask]) -> None:
+        for task in tasks:
+            self.write(task)
+
+    def flush(self) -> None:
+        """Write buffered rows as one chunk."""
+        if self._buffer:
+            self._csv.writerows(self._buffer)
+            self.rows += len(self._buffer)
+            self.chunks += 1
+            self._buffer = []
+        self._file.flush()
+
+    def close(self) -> None:
+        """Write the last chunk and the schema sidecar."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        with open(schema_path(self.path), "w", encoding="utf-8") as handle:
+            json.dump(self.schema(), handle, indent=2)
+
+    def schema(self) -> Dict[str, Any]:
+        columns = []
+        for name, column_type, encoded in COLUMNS:
+            column = {"name": name, "type": column_type, "nullable": name == "employee_id"}
+            if encoded:
+                column["encoding"] = "dictionary"
+                column["index_type"] = "int32"
+                column["dictionary"] = list(self._dictionaries[name])  # Code = position
+            columns.append(column)
+        return {
+            "format": "ai_scheduler.schedule",
+            "version": SCHEMA_VERSION,
+            "data": os.path.basename(self.path),
+            "rows": self.rows,
+            "chunk_size": self.chunk_size,
+            "columns": columns,
+        }
+
+def export_schedule(tasks: Iterable[ScheduledTask], path: str,
+                    chunk_size: int = SCHEDULE_EXPORT_CHUNK_SIZE) -> int:
+    """Write a schedule export and its schema; returns the number of rows."""
+    with ScheduleWriter(path, chunk_size) as writer:
+        writer.write_all(tasks)
+    return writer.rows
+
+def read_schedule(path: str) -> Iterator[ScheduledTask]:
+    """Scheduled tasks of an export, decoded row by row."""
+    with open(schema_path(path), encoding="utf-8") as handle:
+        schema = json.load(handle)
+    if schema.get("version") != SCHEMA_VERSION:
+        raise ValueError(f"{path}: unsupported schedule export version {schema.get('version')}")
+
+    decoders: List[Tuple[str, Callable[[str], Any]]] = []
+    for column in schema["columns"]:
+        if column.get("encoding") == "dictionary":
+            dictionary = column["dictionary"]
+            decoders.append((column["name"], lambda code, values=dictionary: values[int(code)]))
+        else:
+            decoders.append((column["name"], _PARSERS[column["type"]]))
+
+    with open(path, newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = next(reader)
+        if header != [name for name, _ in decoders]:
+            raise ValueError(f"{path}: columns {header} do not match the schema")
+        for row in reader:
+            yield ScheduledTask(**{
+                name: decode(value) if value != "" else None
+                for (name, decode), value in zip(decoders, row)
+            })
@@ -0,0 +1,180 @@
+from typing import Dict, Iterable, Tuple, Any
+import bisect
+import datetime
+from ..models.scheduled_task import ScheduledTask
+
+# Operations accepted by ScoreState.apply():
+#   ("insert", position, task)      add a task
+#   ("remove", position)            drop the task at a position
+#   ("move", position, {field: v})  change station_id/day/time_slot/activity_id
+Operation = Tuple[Any, ...]
+
+class ScoreState:
+    """
+    Incrementally maintained schedule score.
+
+    Holds the aggregates SchedulingOrchestrator._score_schedule derives
+    (shift, day and station usage, stations used in both shifts of a day) and
+    each station's activity sequence, so inserting, removing or moving a task
+    costs dictionary updates plus a binary search and a list insert or delete
+    in one station's sequence: O(k) in that station's task count k (a memmove
+    of k pointers), not in the schedule size.
+    Every task sits at a unique, orderable position (its list index when built
+    with from_tasks); positions order tasks that share a station and shift
+    exactly as the list order does in _score_schedule's stable sort, so scores
+    are identical.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Any, Tuple[str, datetime.date, str, str]] = {}  # position -> (station, day, slot, activity)
+        self.shift_usage = {"AM": 0, "PM": 0}
+        self.day_usage: Dict[datetime.date, int] = {}
+        self.station_usage: Dict[str, int] = {}
+        self.station_shifts: Dict[Tuple[str, datetime.date], Dict[str, int]] = {}  # slot -> task count
+        self.full_days = 0  # (station, day) pairs used in both shifts
+        self.sequences: Dict[str, list] = {}  # station -> sorted [(day, slot, position, activity)]
+        self.activity_changes = 0
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[ScheduledTask]) -> "ScoreState":
+        """Score state for a schedule, positioned by list order."""
+        state = cls()
+        for position, task in enumerate(tasks):
+            state.insert(position, task)
+        return state
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Scoring
+
+    def score(self) -> float:
+        """Same value as SchedulingOrchestrator._score_schedule."""
+        return max(0, self.raw_score())
+
+    def raw_score(self) -> float:
+        """Score before the clamp at zero, useful for search."""
+        count = len(self._entries)
+        if not count:
+            return 0.0
+        total_slots = 12 * 10  # stations * days per shift
+        am_utilization = self.shift_usage["AM"] / total_slots
+        pm_utilization = self.shift_usage["PM"] / total_slots
+
+        # Penalties
+        daily_penalty = (24 * len(self.day_usage) - count) * 20
+        shift_imbalance_penalty = abs(am_utilization - pm_utilization) * 100
+        station_underuse_penalty = (20 * len(self.station_usage) - count) * 15
+        activity_change_penalty = self.activity_changes * 10
+
+        # Bonuses
+        full_day_bonus = self.full_days * 10
+        high_utilization_bonus = count * 5
+
+        score = ((am_utilization + pm_utilization) / 2) * 2000
+        score += full_day_bonus + high_utilization_bonus
+        score -= (daily_penalty + shift_imbalance_penalty + station_underuse_penalty + activity_change_penalty)
+        return score
+
+    # Updates
+
+    def insert(self, position: Any, task: ScheduledTask) -> None:
+        self._add(position, (task.station_id, task.day, task.time_slot, task.activity_id))
+
+    def remove(self, position: Any) -> None:
+        self._discard(position)
+
+    def move(self, position: Any, **changes) -> None:
+        """Change station_id, day, time_slot and/or activity_id of a task."""
+        station_id, day, time_slot, activity_id = self._discard(position)
+        self._add(position, (
+            changes.get("station_id", station_id),
+            changes.get("day", day),
+            changes.get("time_slot", time_slot),
+            changes.get("activity_id", activity_id),
+        ))
+
+    def apply(self, operation: Operation) -> Operation:
+        """Apply an operation and return the operation that undoes it."""
+        kind, position = operation[0], operation[1]
+        if kind == "insert":
+            self.insert(position, operation[2])
+            return ("remove", position)
+        if kind == "remove":
+            station_id, day, time_slot, activity_id = self._entries[position]
+            self.remove(position)
+            return ("restore", position, (station_id, day, time_slot, activity_id))
+        if kind == "move":
+            previous = self._entries[position]
+            self.move(position, **operation[2])
+            return ("move", position, dict(zip(("station_id", "day", "time_slot", "activity_id"), previous)))
+        if kind == "restore":
+            self._add(position, operation[2])
+            return ("remove", position)
+        raise ValueError(f"Unknown score operation: {kind}")
+
+    def undo(self, operation: Operation) -> None:
+        """Undo with the operation returned by apply()."""
+        self.apply(operation)
+
+    def _add(self, position: Any, entry: Tuple[str, datetime.date, str, str]) -> None:
+        if position in self._entries:
+            raise ValueError(f"Position {position} is already occupied")
+        station_id, day, time_slot, activity_id = entry
+        self._entries[position] = entry
+        self.shift_usage[time_slot] += 1
+        self.day_usage[day] = self.day_usage.get(day, 0) + 1
+        self.station_usage[station_id] = self.station_usage.get(station_id, 0) + 1
+
+        shifts = self.station_shifts.setdefault((station_id, day), {})
+        was_full = len(shifts) == 2
+        shifts[time_slot] = shifts.get(time_slot, 0) + 1
+        self.full_days += (len(shifts) == 2) - was_full
+
+        sequence = self.sequences.setdefault(station_id, [])
+        idx = bisect.bisect_left(sequence, (day, time_slot, position))
+        self.activity_changes += self._change_delta(sequence, idx, activity_id)
+        sequence.insert(idx, (day, time_slot, position, activity_id))
+
+    def _discard(self, position: Any) -> Tuple[str, datetime.date, str, str]:
+        entry = self._entries.pop(position)
+        station_id, day, time_slot, activity_id = entry
+        self.shift_usage[time_slot] -= 1
+        self._decrement(self.day_usage, day)
+        self._decrement(self.station_usage, station_id)
+
+        key = (station_id, day)
+        shifts = self.station_shifts[key]
+        was_full = len(shifts) == 2
+        self._decrement(shifts, time_slot)
+        self.full_days += (len(shifts) == 2) - was_full
+        if not shifts:
+            del self.station_shifts[key]
+
+        sequence = self.sequences[station_id]
+        idx = bisect.bisect_left(sequence, (day, time_slot, position))
+        del sequence[idx]
+        self.activity_changes -= self._change_delta(sequence, idx, activity_id)
+        if not sequence:
+            del self.sequences[station_id]
+        return entry
+
+    @staticmethod
+    def _change_delta(sequence: list, idx: int, activity_id: str) -> int:
+        """Activity changes added by placing activity_id at sequence[idx]."""
+        prev_activity = sequence[idx - 1][3] if idx > 0 else None
+        next_activity = sequence[idx][3] if idx < len(sequence) else None
+        delta = 0
+        if prev_activity is not None and next_activity is not None:
+            delta -= prev_activity != next_activity
+        if prev_activity is not None:
+            delta += prev_activity != activity_id
+        if next_activity is not None:
+            delta += activity_id != next_activity
+        return delta
+
+    @staticmethod
+    def _decrement(counts: dict, key) -> None:
+        counts[key] -= 1
+        if not counts[key]:
+            del counts[key]
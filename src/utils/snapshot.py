@@ -0,0 +1,327 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import argparse
+import datetime
+import logging
+import mmap
+import struct
+from ..models.activity import Activity
+from ..models.station import Station
+from ..models.employee import Employee
+from ..models.purchase_order import PurchaseOrder
+from ..models.production_step import ProductionStep
+from .logging import setup_logging
+
+logger = logging.getLogger("src.utils.snapshot")  # __name__ is "__main__" under python -m
+
+MAGIC = b"AISNAP\x00\x01"
+VERSION = 2
+NONE = 0xFFFFFFFF  # String index of a missing optional string
+
+# Sections, in file order; the header stores (offset, count) for each
+SECTIONS = ("strings", "activities", "stations", "orders", "steps", "employees", "pool")
+_HEADER = struct.Struct("<8sII" + "QQ" * len(SECTIONS))
+
+# Fixed-size records; strings are string table indices, lists are (offset, count) into the int pool
+_ACTIVITY = struct.Struct("<II")  # id, description
+_STATION = struct.Struct("<II")  # id, current_activity_id
+_ORDER = struct.Struct("<IiidiI")  # id, due_date ordinal, base_priority, value, effective_priority, units
+_STEP = struct.Struct("<IIIidddiidII")  # ids, order, durations, units, percent_complete, depends_on
+_EMPLOYEE = struct.Struct("<IIIIIIBBiII")  # id, name, skills, availability, am, pm, max shifts, shift_availability
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+class _StringTable:
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE
+        idx = self.index.get(value)
+        if idx is None:
+            idx = self.index[value] = len(self.index)
+        return idx
+
+    def encode(self) -> bytes:
+        blobs = [value.encode("utf-8") for value in self.index]
+        offsets, total = [], 0
+        for blob in blobs:
+            offsets.append(total)
+            total += len(blob)
+        offsets.append(total)
+        return struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(blobs)
+
+class _Pool:
+    def __init__(self):
+        self.values: List[int] = []
+
+    def add(self, values: Sequence[int]) -> Tuple[int, int]:
+        offset = len(self.values)
+        self.values.extend(values)
+        return offset, len(values)
+
+def write_snapshot(path: str,
+                   purchase_orders: Iterable[PurchaseOrder],
+                   steps: Iterable[ProductionStep],
+                   employees: Iterable[Employee],
+                   stations: Iterable[Station],
+                   activities: Iterable[Activity] = ()) -> int:
+    """Write a problem instance to a binary snapshot; returns the file size."""
+    purchase_orders, steps, employees = list(purchase_orders), list(steps), list(employees)
+    stations, activities = list(stations), list(activities)
+    strings, pool = _StringTable(), _Pool()
+    sections: Dict[str, bytes] = {}
+    counts: Dict[str, int] = {}
+
+    def add_strings(values: Iterable[str]) -> Tuple[int, int]:
+        return pool.add([strings.add(value) for value in values])
+
+    sections["activities"] = b"".join(
+        _ACTIVITY.pack(strings.add(activity.id), strings.add(activity.description))
+        for activity in activities
+    )
+    sections["stations"] = b"".join(
+        _STATION.pack(strings.add(station.id), strings.add(station.current_activity_id))
+        for station in stations
+    )
+    sections["orders"] = b"".join(
+        _ORDER.pack(strings.add(po.id), po.due_date.toordinal(), po.base_priority, po.value,
+                    po.effective_priority, po.units)
+        for po in purchase_orders
+    )
+    sections["steps"] = b"".join(
+        _STEP.pack(strings.add(step.step_id), strings.add(step.purchase_order_id),
+                   strings.add(step.activity_id), step.step_order, step.duration_days,
+                   step.setup_time_days, step.teardown_time_days, step.units_per_station,
+                   step.min_units_to_start, step.percent_complete, *add_strings(step.depends_on))
+        for step in steps
+    )
+
+    records = []
+    for emp in employees:
+        shift_values: List[int] = []  # Per date: ordinal, slot count, slot string indices
+        for day, slots in sorted(emp.shift_availability.items()):
+            slots = sorted(slots)
+            shift_values.extend([day.toordinal(), len(slots)] + [strings.add(slot) for slot in slots])
+        shift_offset, _ = pool.add(shift_values)
+        records.append(_EMPLOYEE.pack(
+            strings.add(emp.id), strings.add(emp.name),
+            *add_strings(sorted(emp.skills)),
+            *pool.add(sorted(day.toordinal() for day in emp.availability)),
+            emp.am_shift_available, emp.pm_shift_available, emp.max_shifts_per_day,
+            shift_offset, len(emp.shift_availability)
+        ))
+    sections["employees"] = b"".join(records)
+
+    sections["pool"] = struct.pack(f"<{len(pool.values)}i", *pool.values)
+    sections["strings"] = strings.encode()
+    counts.update(
+        strings=len(strings.index), activities=len(activities), stations=len(stations),
+        orders=len(purchase_orders), steps=len(steps), employees=len(employees),
+        pool=len(pool.values)
+    )
+
+    table = []
+    offset = _align(_HEADER.size)
+    for name in SECTIONS:
+        table.extend([offset, counts[name]])
+        offset = _align(offset + len(sections[name]))
+    with open(path, "wb") as handle:
+        handle.write(_HEADER.pack(MAGIC, VERSION, len(SECTIONS), *table))
+        for name, section_offset in zip(SECTIONS, table[::2]):
+            handle.seek(section_offset)
+            handle.write(sections[name])
+        handle.truncate(offset)
+    return offset
+
+class LazyRecords(Sequence):
+    """Read-only sequence that unpacks and builds each record on first access."""
+
+    def __init__(self, count: int, build: Callable[[int], Any]):
+        self._count = count
+        self._build = build
+        self._cache: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("record index out of range")
+        record = self._cache.get(index)
+        if record is None:
+            record = self._cache[index] = self._build(index)
+        return record
+
+class ProblemInstance:
+    """
+    A memory-mapped problem snapshot.
+
+    Opening maps the file and reads the header only; records are decoded
+    into model objects on first access through the sequences below, and
+    load() decodes all of them, which is what the schedulers need.
+    Pickling sends the path, so worker processes reopen the mapping
+    instead of copying objects.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, section_count, *table = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a problem snapshot")
+        if version != VERSION or section_count != len(SECTIONS):
+            raise ValueError(f"{path}: unsupported snapshot version {version}")
+        self._offset = dict(zip(SECTIONS, table[::2]))
+        self._count = dict(zip(SECTIONS, table[1::2]))
+        self._strings: Dict[int, str] = {}
+        self._step_index: Optional[Dict[str, int]] = None
+
+        self.activities = LazyRecords(self._count["activities"], self._build_activity)
+        self.stations = LazyRecords(self._count["stations"], self._build_station)
+        self.purchase_orders = LazyRecords(self._count["orders"], self._build_order)
+        self.production_steps = LazyRecords(self._count["steps"], self._build_step)
+        self.employees = LazyRecords(self._count["employees"], self._build_employee)
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "ProblemInstance":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"path": self.path}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["path"])
+
+    def step(self, step_id: str) -> ProductionStep:
+        if self._step_index is None:
+            self._step_index = {self._step_id(idx): idx for idx in range(len(self.production_steps))}
+        return self.production_steps[self._step_index[step_id]]
+
+    def load(self) -> Tuple[List[PurchaseOrder], List[ProductionStep], List[Employee], List[Station], List[Activity]]:
+        """Every record as model objects."""
+        return (list(self.purchase_orders), list(self.production_steps), list(self.employees),
+                list(self.stations), list(self.activities))
+
+    # Decoding
+
+    def _string(self, idx: int) -> Optional[str]:
+        if idx == NONE:
+            return None
+        value = self._strings.get(idx)
+        if value is None:
+            start, end = struct.unpack_from("<II", self._map, self._offset["strings"] + 4 * idx)
+            blob = self._offset["strings"] + 4 * (self._count["strings"] + 1)
+            value = self._strings[idx] = self._map[blob + start:blob + end].decode("utf-8")
+        return value
+
+    def _step_id(self, idx: int) -> str:
+        return self._string(_STEP.unpack_from(self._map, self._offset["steps"] + idx * _STEP.size)[0])
+
+    def _record(self, layout: struct.Struct, section: str, idx: int) -> tuple:
+        return layout.unpack_from(self._map, self._offset[section] + idx * layout.size)
+
+    def _pool(self, offset: int, count: int) -> Tuple[int, ...]:
+        return struct.unpack_from(f"<{count}i", self._map, self._offset["pool"] + 4 * offset)
+
+    def _build_activity(self, idx: int) -> Activity:
+        activity_id, description = self._record(_ACTIVITY, "activities", idx)
+        return Activity(self._string(activity_id), self._string(description))
+
+    def _build_station(self, idx: int) -> Station:
+        station_id, activity_id = self._record(_STATION, "stations", idx)
+        return Station(self._string(station_id), self._string(activity_id))
+
+    def _build_order(self, idx: int) -> PurchaseOrder:
+        po_id, due, base_priority, value, effective_priority, units = self._record(_ORDER, "orders", idx)
+        return PurchaseOrder(
+            id=self._string(po_id),
+            due_date=datetime.date.fromordinal(due),
+            base_priority=base_priority,
+            value=value,
+            effective_priority=effective_priority,
+            units=units
+        )
+
+    def _build_step(self, idx: int) -> ProductionStep:
+        (step_id, po_id, activity_id, step_order, duration, setup, teardown, units_per_station,
+         min_units, percent_complete, deps_offset, deps_count) = self._record(_STEP, "steps", idx)
+        return ProductionStep(
+            step_id=self._string(step_id),
+            purchase_order_id=self._string(po_id),
+            activity_id=self._string(activity_id),
+            step_order=step_order,
+            duration_days=duration,
+            setup_time_days=setup,
+            teardown_time_days=teardown,
+            units_per_station=units_per_station,
+            min_units_to_start=min_units,
+            depends_on=[self._string(dep) for dep in self._pool(deps_offset, deps_count)],
+            percent_complete=percent_complete
+        )
+
+    def _build_employee(self, idx: int) -> Employee:
+        (emp_id, name, skills_offset, skills_count, days_offset, days_count, am, pm,
+         max_shifts, shift_offset, shift_days) = self._record(_EMPLOYEE, "employees", idx)
+        shift_availability = {}
+        position = shift_offset
+        for _ in range(shift_days):
+            ordinal, slot_count = self._pool(position, 2)
+            slots = self._pool(position + 2, slot_count)
+            shift_availability[datetime.date.fromordinal(ordinal)] = {self._string(slot) for slot in slots}
+            position += 2 + slot_count
+        return Employee(
+            id=self._string(emp_id),
+            name=self._string(name),
+            skills={self._string(skill) for skill in self._pool(skills_offset, skills_count)},
+            availability={datetime.date.fromordinal(day) for day in self._pool(days_offset, days_count)},
+            am_shift_available=bool(am),
+            pm_shift_available=bool(pm),
+            max_shifts_per_day=max_shifts,
+            shift_availability=shift_availability
+        )
+
+def load_snapshot(path: str) -> ProblemInstance:
+    """Open a snapshot written by write_snapshot."""
+    return ProblemInstance(path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a problem snapshot for batch, service and rolling_horizon.")
+    parser.add_argument("output", help="Snapshot file to write (batch picks up *.snap)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from-example", action="store_true", help="Snapshot the example data")
+    source.add_argument("--from-erp", metavar="PATH", help="Snapshot an ERP export (.json or .xlsx)")
+    parser.add_argument("--sheet", help="Worksheet of an .xlsx export (default: the first)")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, help="First planning day (default today)")
+    parser.add_argument("--days", type=int, default=10, help="Planning days employees are available")
+    args = parser.parse_args()
+
+    setup_logging()
+    start = args.start or datetime.date.today()
+    dates = [start + datetime.timedelta(days=i) for i in range(args.days)]
+    if args.from_erp:
+        from .erp_loader import load_erp_problem
+        purchase_orders, steps, employees, stations, activities = load_erp_problem(args.from_erp, dates, args.sheet)
+    else:
+        from ..example_data import (create_activities, create_stations, create_employees,
+                                    create_purchase_orders, create_production_steps)
+        purchase_orders, steps = create_purchase_orders(start), create_production_steps()
+        employees, stations, activities = create_employees(dates), create_stations(), create_activities()
+    size = write_snapshot(args.output, purchase_orders, steps, employees, stations, activities)
+    logger.info("Wrote %d orders, %d steps, %d employees, %d stations to %s (%d bytes)",
+                len(purchase_orders), len(steps), len(employees), len(stations), args.output, size)
+
+if __name__ == "__main__":
+    main()
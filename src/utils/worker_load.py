@@ -0,0 +1,114 @@
+from typing import List, Dict, Tuple, Optional, Iterable, Set
+import heapq
+import datetime
+from ..models.employee import Employee
+from ..models.scheduled_task import ScheduledTask
+from ..models.production_step import ProductionStep
+
+class WorkerLoadIndex:
+    """
+    Incrementally maintained worker load per shift.
+
+    Keeps a (worker_id, day, time_slot) -> load accumulator, where load is the
+    processing time (units * duration_days) of the tasks assigned to the worker
+    in that shift, plus one lazily built min-heap of qualified workers per
+    (activity_id, day, time_slot).  Heap entries are (load, employee_order,
+    worker_id); entries whose load no longer matches the accumulator are stale
+    and are dropped when they reach the top of the heap.
+    """
+
+    def __init__(self, employees: List[Employee], step_map: Dict[str, ProductionStep]):
+        self.employees = employees
+        self.step_map = step_map
+        self.loads: Dict[Tuple[str, datetime.date, str], float] = {}
+        self.task_counts: Dict[Tuple[str, datetime.date, str], int] = {}
+        self._day_slots: Dict[Tuple[str, datetime.date], Set[str]] = {}  # (worker, day) -> slots worked
+        self._order = {emp.id: idx for idx, emp in enumerate(employees)}
+        self._qualified: Dict[str, List[str]] = {}  # activity_id -> worker ids (employee order)
+        for emp in employees:
+            for activity_id in emp.skills:
+                self._qualified.setdefault(activity_id, []).append(emp.id)
+        for workers in self._qualified.values():
+            workers.sort(key=self._order.get)
+        self._heaps: Dict[Tuple[str, datetime.date, str], List[Tuple[float, int, str]]] = {}
+
+    @classmethod
+    def from_tasks(cls,
+                   employees: List[Employee],
+                   step_map: Dict[str, ProductionStep],
+                   scheduled_tasks: Iterable[ScheduledTask]) -> "WorkerLoadIndex":
+        """Build an index seeded with every task that already has a worker."""
+        index = cls(employees, step_map)
+        for task in scheduled_tasks:
+            if task.employee_id:
+                index.add(task)
+        return index
+
+    def task_load(self, task: ScheduledTask) -> float:
+        """Processing time a task puts on its worker."""
+        step = self.step_map[task.step_id]
+        return (task.units_end - task.units_start + 1) * step.duration_days
+
+    def qualified_workers(self, activity_id: str) -> List[str]:
+        """Worker ids able to perform an activity, in employee order."""
+        return self._qualified.get(activity_id, [])
+
+    def get_load(self, worker_id: str, day: datetime.date, time_slot: str) -> float:
+        return self.loads.get((worker_id, day, time_slot), 0.0)
+
+    def shifts_worked(self, worker_id: str, day: datetime.date) -> Set[str]:
+        """Time slots in which the worker already has tasks on a day."""
+        return self._day_slots.get((worker_id, day), set())
+
+    def add(self, task: ScheduledTask, worker_id: Optional[str] = None) -> None:
+        """Account for a task assigned to worker_id (defaults to task.employee_id)."""
+        self._change(worker_id or task.employee_id, task.day, task.time_slot, self.task_load(task), 1)
+
+    def remove(self, task: ScheduledTask, worker_id: Optional[str] = None) -> None:
+        """Undo a previous add()."""
+        self._change(worker_id or task.employee_id, task.day, task.time_slot, -self.task_load(task), -1)
+
+    def least_loaded(self, activity_id: str, day: datetime.date, time_slot: str) -> Optional[str]:
+        """Qualified worker with the lowest load this shift (ties go to employee order)."""
+        heap = self._heap(activity_id, day, time_slot)
+        while heap:
+            load, _, worker_id = heap[0]
+            if load == self.get_load(worker_id, day, time_slot):
+                return worker_id
+            heapq.heappop(heap)  # Stale entry
+        return None
+
+    def _heap(self, activity_id: str, day: datetime.date, time_slot: str) -> List[Tuple[float, int, str]]:
+        key = (activity_id, day, time_slot)
+        heap = self._heaps.get(key)
+        if heap is None:
+            heap = [
+                (self.get_load(worker_id, day, time_slot), self._order[worker_id], worker_id)
+                for worker_id in self.qualified_workers(activity_id)
+            ]
+            heapq.heapify(heap)
+            self._heaps[key] = heap
+        return heap
+
+    def _change(self, worker_id: str, day: datetime.date, time_slot: str,
+                delta: float, count_delta: int) -> None:
+        key = (worker_id, day, time_slot)
+        load = self.loads.get(key, 0.0) + delta
+        self.loads[key] = load
+
+        count = self.task_counts.get(key, 0) + count_delta
+        self.task_counts[key] = count
+        day_slots = self._day_slots.setdefault((worker_id, day), set())
+        if count > 0:
+            day_slots.add(time_slot)
+        else:
+            day_slots.discard(time_slot)
+
+        # Refresh every heap for this shift that contains the worker
+        emp_order = self._order.get(worker_id)
+        if emp_order is None:
+            return
+        for activity_id in self.employees[emp_order].skills:
+            heap = self._heaps.get((activity_id, day, time_slot))
+            if heap is not None:
+                heapq.heappush(heap, (load, emp_order, worker_id))
@@ -0,0 +1,229 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+import datetime
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_EXCEL_EPOCH = datetime.datetime(1899, 12, 30)  # Serial day 0 (1900 date system)
+_EXCEL_EPOCH_1904 = datetime.datetime(1904, 1, 1)
+
+# Built-in number formats that display dates or times
+_DATE_FORMAT_IDS = set(range(14, 23)) | set(range(27, 37)) | {45, 46, 47} | set(range(50, 59))
+_DATE_CODE = re.compile(r"[dmyhs]", re.IGNORECASE)
+_QUOTED = re.compile(r'"[^"]*"|\[[^\]]*\]|\\.')  # Literals, colours and escapes in format codes
+
+def _local(tag: str) -> str:
+    """Tag name without its namespace (covers transitional and strict OOXML)."""
+    return tag.rsplit("}", 1)[-1]
+
+def _column_index(reference: str) -> int:
+    """Zero-based column of a cell reference like "AB12"."""
+    index = 0
+    for char in reference:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - ord("A") + 1
+    return index - 1
+
+_INTEGER = re.compile(r"-?\d+")
+
+def _number(text: str) -> Any:
+    if _INTEGER.fullmatch(text):
+        return int(text)
+    # Excel keeps 15 significant digits; drop binary noise like 0.6799999999999999
+    return float(f"{float(text):.15g}")
+
+class XlsxReader:
+    """
+    Read-only, streaming reader for .xlsx worksheets using only the stdlib.
+
+    Worksheet XML is parsed with iterparse and each row is discarded once it
+    has been yielded, so memory holds the shared string table plus one row.
+    Only the requested columns are decoded; cells with a date number format
+    come back as datetime, other numbers as int or float.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        self._epoch = _EXCEL_EPOCH
+        self._sheets = self._read_sheets()  # name -> member path, in workbook order
+        self._shared_strings: Optional[List[str]] = None
+        self._date_styles: Optional[Set[int]] = None
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def __enter__(self) -> "XlsxReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self._sheets)
+
+    def iter_rows(self, sheet: Optional[str] = None,
+                  columns: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the rows below the header row as {header: value} dicts.
+
+        sheet defaults to the first worksheet.  columns restricts the dicts to
+        those headers and raises ValueError if any is missing.  Empty cells are
+        None and rows with no values are skipped.
+        """
+        name = sheet if sheet is not None else self.sheet_names[0]
+        if name not in self._sheets:
+            raise ValueError(f"{self.path}: no worksheet named {name!r} (have {self.sheet_names})")
+
+        wanted: Dict[int, str] = {}  # column index -> header
+        header_seen = False
+        with self._zip.open(self._sheets[name]) as handle:
+            events = ET.iterparse(handle, events=("start", "end"))
+            _, root = next(events)
+            namespace = root.tag[:-len(_local(root.tag))]
+            row_tag, sheet_data_tag = namespace + "row", namespace + "sheetData"
+            sheet_data = None
+            for event, elem in events:
+                if elem.tag != row_tag or event != "end":
+                    if elem.tag == sheet_data_tag and event == "start":
+                        sheet_data = elem
+                    continue
+
+                if not header_seen:
+                    header = {idx: value for idx, value in self._row_values(elem, None).items()
+                              if value is not None}
+                    wanted = self._project(header, columns)
+                    header_seen = True
+                else:
+                    values = self._row_values(elem, wanted)
+                    if any(value is not None for value in values.values()):
+                        yield {wanted[idx]: values.get(idx) for idx in wanted}
+                if sheet_data is not None:
+                    sheet_data.clear()
+
+    def _project(self, header: Dict[int, Any], columns: Optional[Sequence[str]]) -> Dict[int, str]:
+        names = {idx: str(value).strip() for idx, value in header.items()}
+        if columns is None:
+            return names
+        by_name = {name: idx for idx, name in names.items()}
+        missing = [column for column in columns if column not in by_name]
+        if missing:
+            raise ValueError(f"{self.path}: missing columns {missing}")
+        return {by_name[column]: column for column in columns}
+
+    def _row_values(self, row: ET.Element, wanted: Optional[Dict[int, str]]) -> Dict[int, Any]:
+        values = {}
+        position = 0
+        for cell in row:
+            reference = cell.get("r")
+            idx = _column_index(reference) if reference else position
+            position = idx + 1
+            if wanted is None or idx in wanted:
+                values[idx] = self._cell_value(cell)
+        return values
+
+    def _cell_value(self, cell: ET.Element) -> Any:
+        cell_type = cell.get("t", "n")
+        if cell_type == "inlineStr":
+            return "".join(node.text or "" for node in cell.iter() if _local(node.tag) == "t")
+        text = None
+        for child in cell:
+            if child.tag.endswith("v"):  # Skips the <f> formula, if any
+                text = child.text
+                break
+        if text is None:
+            return None
+        if cell_type == "s":
+            return self.shared_strings[int(text)]
+        if cell_type in ("str", "e"):
+            return text
+        if cell_type == "b":
+            return text == "1"
+        if cell_type == "d":
+            return datetime.datetime.fromisoformat(text)
+        value = _number(text)
+        if cell.get("s") is not None and int(cell.get("s")) in self.date_styles:
+            return self._epoch + datetime.timedelta(days=value)
+        return value
+
+    @property
+    def shared_strings(self) -> List[str]:
+        if self._shared_strings is None:
+            self._shared_strings = self._read_shared_strings()
+        return self._shared_strings
+
+    @property
+    def date_styles(self) -> Set[int]:
+        """Indexes of cell formats that display numbers as dates."""
+        if self._date_styles is None:
+            self._date_styles = self._read_date_styles()
+        return self._date_styles
+
+    def _read_sheets(self) -> Dict[str, str]:
+        targets = {}
+        with self._zip.open("xl/_rels/workbook.xml.rels") as handle:
+            for _, elem in ET.iterparse(handle):
+                if _local(elem.tag) == "Relationship":
+                    target = elem.get("Target")
+                    if target.startswith("/"):
+                        target = target[1:]
+                    else:
+                        target = posixpath.normpath(posixpath.join("xl", target))
+                    targets[elem.get("Id")] = target
+        sheets = {}
+        with self._zip.open("xl/workbook.xml") as handle:
+            for _, elem in ET.iterparse(handle):
+                name = _local(elem.tag)
+                if name == "workbookPr" and elem.get("date1904") in ("1", "true"):
+                    self._epoch = _EXCEL_EPOCH_1904
+                elif name == "sheet":
+                    sheets[elem.get("name")] = targets[elem.get(f"{_REL_NS}id")]
+        return sheets
+
+    def _read_shared_strings(self) -> List[str]:
+        if "xl/sharedStrings.xml" not in self._zip.namelist():
+            return []
+        strings = []
+        with self._zip.open("xl/sharedStrings.xml") as handle:
+            for _, elem in ET.iterparse(handle):
+                if _local(elem.tag) == "si":
+                    # Plain and rich text runs, without phonetic hints
+                    parts = []
+                    for child in elem:
+                        name = _local(child.tag)
+                        if name == "t":
+                            parts.append(child.text or "")
+                        elif name == "r":
+                            parts.extend(node.text or "" for node in child if _local(node.tag) == "t")
+                    strings.append("".join(parts))
+                    elem.clear()
+        return strings
+
+    def _read_date_styles(self) -> Set[int]:
+        if "xl/styles.xml" not in self._zip.namelist():
+            return set()
+        root = ET.fromstring(self._zip.read("xl/styles.xml"))
+        date_formats = set(_DATE_FORMAT_IDS)
+        styles = set()
+        for section in root:
+            name = _local(section.tag)
+            if name == "numFmts":
+                for fmt in section:
+                    code = _QUOTED.sub("", fmt.get("formatCode", ""))
+                    if _DATE_CODE.search(code):
+                        date_formats.add(int(fmt.get("numFmtId")))
+            elif name == "cellXfs":
+                for idx, xf in enumerate(section):
+                    if int(xf.get("numFmtId", 0)) in date_formats:
+                        styles.add(idx)
+        return styles
+
+def iter_xlsx_rows(path: str, sheet: Optional[str] = None,
+                   columns: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Rows of one worksheet as dicts, read lazily (see XlsxReader.iter_rows)."""
+    with XlsxReader(path) as reader:
+        yield from reader.iter_rows(sheet, columns)
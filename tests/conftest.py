@@ -0,0 +1,52 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import textwrap
+import types
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+# Agents are exercised without LLM calls: every crew answers with an empty JSON object
+CREWAI_STUB = textwrap.dedent("""
+    class Agent:
+        def __init__(self, **kwargs):
+            self.role = kwargs.get("role")
+
+    class Task:
+        def __init__(self, **kwargs):
+            self.description = kwargs.get("description")
+            self.expected_output = kwargs.get("expected_output")
+
+    class Crew:
+        def __init__(self, **kwargs):
+            self.agents = kwargs.get("agents", [])
+            self.tasks = kwargs.get("tasks", [])
+
+        def kickoff(self):
+            return "{}"
+""")
+
+if importlib.util.find_spec("crewai") is None:
+    crewai = types.ModuleType("crewai")
+    exec(CREWAI_STUB, crewai.__dict__)
+    sys.modules["crewai"] = crewai
+
+@pytest.fixture
+def run_module(tmp_path):
+    """Run python -m <module> in tmp_path with the crewai stub; returns the finished process."""
+    def run(module: str, *args: str) -> subprocess.CompletedProcess:
+        stubs = tmp_path / "stubs" / "crewai"
+        stubs.mkdir(parents=True, exist_ok=True)
+        (stubs / "__init__.py").write_text(CREWAI_STUB)
+        env = dict(os.environ, LOG_LEVEL="INFO",
+                   PYTHONPATH=os.pathsep.join(filter(None, [ROOT, str(tmp_path / "stubs"),
+                                                            os.environ.get("PYTHONPATH")])))
+        env.pop("LOG_QUIET", None)
+        return subprocess.run([sys.executable, "-m", module, *args], cwd=tmp_path, env=env,
+                              capture_output=True, text=True, timeout=300)
+    return run
@@ -0,0 +1,17 @@
+import datetime
+import pytest
+
+pytest.importorskip("dotenv")
+
+from src.models.employee import Employee
+from src.utils.availability import AvailabilityCalendar
+
+DAY = datetime.date(2025, 2, 18)
+
+def test_day_availability_follows_the_availability_set():
+    # Both shift flags off: no shift can be worked, but the day is still in availability
+    employee = Employee("E1", "E1", {"A1"}, {DAY}, am_shift_available=False, pm_shift_available=False)
+    calendar = AvailabilityCalendar([employee], [DAY, DAY + datetime.timedelta(days=1)])
+    assert calendar.is_available_on_day("E1", DAY)
+    assert not calendar.is_available_on_day("E1", DAY + datetime.timedelta(days=1))
+    assert not calendar.is_available("E1", DAY, "AM")
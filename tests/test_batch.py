@@ -0,0 +1,35 @@
+import json
+import os
+import shutil
+import pytest
+
+pytest.importorskip("dotenv")
+
+from conftest import ROOT
+
+def test_batch_logs_progress_and_failures(run_module, tmp_path):
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "broken.snap").write_bytes(b"not a snapshot")
+    result = run_module("src.batch", "in", "out", "--workers", "1")
+    assert result.returncode == 0, result.stderr
+    assert "[1/1] broken: failed" in result.stdout
+    assert "Traceback" not in result.stderr  # The worker's traceback goes to the instance log
+    assert "Traceback" in (tmp_path / "out" / "broken" / "log.txt").read_text()
+    assert json.loads((tmp_path / "out" / "summary.json").read_text())["failed"] == 1
+
+def test_batch_schedules_snapshots_and_erp_exports(run_module, tmp_path):
+    # Instances the repo itself produces: a snapshot from the writer CLI and the ERP exports
+    (tmp_path / "in").mkdir()
+    written = run_module("src.utils.snapshot", os.path.join("in", "example.snap"), "--from-example")
+    assert written.returncode == 0, written.stderr
+    shutil.copy(os.path.join(ROOT, "src", "utils", "file.json"), tmp_path / "in" / "plant.json")
+    result = run_module("src.batch", "in", "out", "--workers", "2",
+                        "--erp", os.path.join(ROOT, "src", "utils", "file.xlsx"))
+    assert result.returncode == 0, result.stderr
+
+    rows = {row["instance"]: row for row in json.loads((tmp_path / "out" / "summary.json").read_text())["results"]}
+    assert sorted(rows) == ["example", "file", "plant"]
+    assert all(row["status"] == "ok" and row["tasks"] > 0 for row in rows.values()), rows
+    assert rows["plant"]["orders"] == rows["file"]["orders"] == 224
+    for name in rows:
+        assert (tmp_path / "out" / name / "schedule.csv").exists()
@@ -0,0 +1,28 @@
+import copy
+import dataclasses
+import datetime
+import pickle
+import pytest
+
+pytest.importorskip("dotenv")
+
+from src.models.employee import Employee
+from src.models.scheduled_task import ScheduledTask
+from src.models.compact import CompactScheduledTask, FrozenEmployee
+
+DAY = datetime.date(2025, 2, 18)
+
+def test_frozen_employee_copies_and_pickles():
+    employee = FrozenEmployee.from_model(Employee("E1", "Ann", ["A1"], {DAY}, shift_availability={DAY: {"AM"}}))
+    assert dataclasses.asdict(employee)["shift_availability"] == {DAY: frozenset({"AM"})}
+    assert copy.deepcopy(employee) == employee
+    assert pickle.loads(pickle.dumps(employee)) == employee
+    assert hash(employee) == hash(dataclasses.replace(employee, shift_availability={}))
+    assert employee.is_available(DAY, "AM") and not employee.is_available(DAY, "PM")
+
+def test_create_matches_the_constructor():
+    args = ("S1", DAY, "AM", "PO-1", "ST-1", "A1", "E1", 0.0, 1, 3)
+    assert CompactScheduledTask.create(*args) == CompactScheduledTask(*args)
+    assert CompactScheduledTask.create(*args).to_model() == ScheduledTask(*args)
+    with pytest.raises(ValueError):
+        CompactScheduledTask.create("S1", DAY, "NIGHT", "PO-1", "ST-1", "A1")
@@ -0,0 +1,78 @@
+import datetime
+import pytest
+
+pytest.importorskip("dotenv")
+
+from src.example_data import create_purchase_orders, create_production_steps
+from src.models.production_step import ProductionStep
+from src.agents.priority_agent import PriorityAgent
+from src.utils.critical_path import CriticalPathAnalysis
+
+DAY = datetime.date(2025, 2, 18)
+
+def baseline_critical_paths(purchase_orders, steps):
+    """The original PriorityAgent._calculate_critical_paths: {po_id: (total_time, path)}."""
+    def processing_time(step, units, with_start_batch):
+        batches = (units + step.units_per_station - 1) // step.units_per_station
+        time = batches * step.duration_days + step.setup_time_days + step.teardown_time_days
+        if with_start_batch and step.min_units_to_start > 1:
+            time += (step.min_units_to_start / step.units_per_station) * step.duration_days
+        return time
+
+    critical_paths = {}
+    for po in purchase_orders:
+        pending = [step for step in steps if step.purchase_order_id == po.id]
+        if not pending:
+            continue
+        earliest_completion = {}  # step_id -> (time, path)
+        for step in [s for s in pending if not s.depends_on]:
+            earliest_completion[step.step_id] = (processing_time(step, po.units, False), [step.step_id])
+            pending.remove(step)
+        while pending:
+            ready = [step for step in pending if all(dep in earliest_completion for dep in step.depends_on)]
+            for step in ready:
+                latest_dep_time, critical_dep = max(
+                    ((earliest_completion[dep][0], dep) for dep in step.depends_on), key=lambda x: x[0]
+                )
+                earliest_completion[step.step_id] = (
+                    latest_dep_time + processing_time(step, po.units, True),
+                    earliest_completion[critical_dep][1] + [step.step_id]
+                )
+                pending.remove(step)
+        critical_paths[po.id] = max(earliest_completion.values(), key=lambda x: x[0])
+    return critical_paths
+
+def step(step_id, depends_on=(), po_id="PO-1"):
+    return ProductionStep(step_id=step_id, purchase_order_id=po_id, activity_id="A1",
+                          duration_days=1.0, setup_time_days=0.0, teardown_time_days=0.0,
+                          units_per_station=1, min_units_to_start=1, depends_on=list(depends_on),
+                          step_order=1)
+
+def test_example_critical_paths_match_baseline():
+    orders = create_purchase_orders(DAY)
+    steps = create_production_steps()
+    critical_paths = PriorityAgent()._calculate_critical_paths(orders, steps)
+    expected = baseline_critical_paths(orders, steps)
+
+    assert set(critical_paths) == set(expected) == {po.id for po in orders}
+    for po_id, (total_time, path) in expected.items():
+        assert critical_paths[po_id]['total_time'] == pytest.approx(total_time)
+        assert critical_paths[po_id]['path'] == path
+
+def test_slack_and_update_duration():
+    # a -> b -> d and a -> c -> d: b is the longer branch
+    steps = [step("a"), step("b", ["a"]), step("c", ["a"]), step("d", ["b", "c"]), step("x", po_id="PO-2")]
+    analysis = CriticalPathAnalysis(steps, {"a": 1.0, "b": 3.0, "c": 1.0, "d": 1.0, "x": 2.0})
+
+    assert analysis.critical_paths() == {"PO-1": (5.0, ["a", "b", "d"]), "PO-2": (2.0, ["x"])}
+    assert analysis.slack("c") == pytest.approx(2.0)
+    assert [s for s in "abcd" if analysis.is_critical(s)] == ["a", "b", "d"]
+
+    analysis.update_duration("c", 4.0)
+    assert analysis.critical_paths()["PO-1"] == (6.0, ["a", "c", "d"])
+    assert analysis.slack("b") == pytest.approx(1.0)
+    assert analysis.finish_time("x") == 2.0  # Other components are untouched
+
+def test_cycle_is_rejected():
+    with pytest.raises(ValueError):
+        CriticalPathAnalysis([step("a", ["b"]), step("b", ["a"])], {"a": 1.0, "b": 1.0})
@@ -0,0 +1,33 @@
+import json
+import os
+import pytest
+
+pytest.importorskip("dotenv")
+
+from conftest import ROOT
+from src.utils.erp_loader import iter_json_rows, load_erp_file
+
+ROWS = [{"Job": f"J{i}", "Opr": 10, "Note": "x" * 20} for i in range(50)]
+
+@pytest.mark.parametrize("text", [json.dumps(ROWS), "\n".join(json.dumps(row) for row in ROWS)])
+def test_rows_span_chunks(tmp_path, text):
+    path = tmp_path / "export.json"
+    path.write_text(text)
+    assert list(iter_json_rows(str(path), chunk_size=7)) == ROWS
+
+def test_malformed_row_raises_at_the_row_limit(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text('[{"Job": J1}, ' + ", ".join(json.dumps(row) for row in ROWS) + "]")
+    with pytest.raises(ValueError, match="longer than 100"):
+        list(iter_json_rows(str(path), chunk_size=16, max_row_chars=100))
+
+def test_truncated_row_raises_at_eof(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps(ROWS)[:-30])
+    with pytest.raises(ValueError, match="truncated"):
+        list(iter_json_rows(str(path), chunk_size=16))
+
+def test_workbook_and_json_exports_load_alike():
+    workbook = load_erp_file(os.path.join(ROOT, "src", "utils", "file.xlsx"))
+    exported = load_erp_file(os.path.join(ROOT, "src", "utils", "file.json"))
+    assert workbook == exported and len(workbook[0]) == 224
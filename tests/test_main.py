@@ -0,0 +1,24 @@
+import os
+import pytest
+
+pytest.importorskip("dotenv")
+
+from conftest import ROOT
+
+def test_main_prints_statistics_and_report(run_module, tmp_path):
+    result = run_module("src.main")
+    assert result.returncode == 0, result.stderr
+    assert "=== Schedule Statistics ===" in result.stdout
+    assert "=== Schedule Report ===" in result.stdout
+    assert "Exported" in result.stdout
+    # Outputs go to the output directory, not the working directory
+    assert sorted(path.name for path in (tmp_path / "output").iterdir()) == [
+        "schedule.csv", "schedule.schema.json", "schedule_report.html"]
+    assert not (tmp_path / "schedule.csv").exists()
+
+@pytest.mark.parametrize("export", ["file.json", "file.xlsx"])
+def test_main_schedules_an_erp_export(run_module, tmp_path, export):
+    result = run_module("src.main", "--erp", os.path.join(ROOT, "src", "utils", export))
+    assert result.returncode == 0, result.stderr
+    assert "Loaded 224 orders, 479 steps" in result.stdout
+    assert "Exported" in result.stdout and (tmp_path / "output" / "schedule.csv").exists()
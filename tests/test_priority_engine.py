@@ -0,0 +1,72 @@
+import datetime
+import pytest
+
+pytest.importorskip("dotenv")
+
+from src.example_data import create_purchase_orders, create_production_steps
+from src.agents.priority_agent import PriorityAgent
+from src.utils import priority_engine
+from src.utils.priority_engine import PriorityEngine
+from src.config import PRIORITY_CRITICAL_PATH_WEIGHT, PRIORITY_CRITICAL_PATH_CAP
+
+DAY = datetime.date(2025, 2, 18)
+
+def baseline_priorities(purchase_orders, today, critical_path_days=None):
+    """The original PriorityAgent.update_priorities formula with today fixed, plus the critical path factor."""
+    critical_path_days = critical_path_days or {}
+    max_value = max(po.value for po in purchase_orders)
+    priorities = []
+    for po in purchase_orders:
+        days_until_due = (po.due_date - today).days
+        score = po.base_priority + (20 - days_until_due * 2) + (po.value / max_value) * 15
+        ratio = min(critical_path_days.get(po.id, 0.0) / max(days_until_due, 1), PRIORITY_CRITICAL_PATH_CAP)
+        score += PRIORITY_CRITICAL_PATH_WEIGHT * max(ratio, 0.0)
+        priorities.append(min(100, max(1, score)))
+    return priorities
+
+@pytest.fixture(params=["numpy", "python"])
+def engine_module(request, monkeypatch):
+    """Run each test on the NumPy path and on the pure-Python fallback."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(priority_engine, "np", None)
+    return priority_engine
+
+def test_example_priorities_match_baseline(engine_module):
+    orders = create_purchase_orders(DAY)
+    priorities = engine_module.PriorityEngine(DAY).compute(orders)
+    assert priorities == pytest.approx(baseline_priorities(orders, DAY))
+    assert priorities == pytest.approx([100.0, 83.0, 56.0])  # PO-101 is clipped at 100
+
+def test_critical_path_factor(engine_module):
+    orders = create_purchase_orders(DAY)
+    critical_paths = PriorityAgent()._calculate_critical_paths(orders, create_production_steps())
+    path_days = {po_id: data['total_time'] for po_id, data in critical_paths.items()}
+    priorities = engine_module.PriorityEngine(DAY).compute(orders, path_days)
+    assert priorities == pytest.approx(baseline_priorities(orders, DAY, path_days))
+    assert all(1 <= priority <= 100 for priority in priorities)
+
+def test_reference_date_sets_days_until_due(engine_module):
+    # Orders created for DAY, scored two days later: two days closer to the deadline
+    orders = create_purchase_orders(DAY)
+    later = DAY + datetime.timedelta(days=2)
+    priorities = engine_module.PriorityEngine(later).compute(orders)
+    assert priorities == pytest.approx(baseline_priorities(orders, later))
+    assert priorities == pytest.approx([100.0, 87.0, 60.0])
+
+def test_reference_date_defaults_to_today():
+    orders = create_purchase_orders(DAY)
+    assert PriorityEngine().compute(orders) == PriorityEngine(datetime.date.today()).compute(orders)
+
+def test_update_priorities_uses_the_reference_date():
+    # Relative to DAY the result must not depend on the date the test runs
+    orders = create_purchase_orders(DAY)
+    steps = create_production_steps()
+    PriorityAgent().update_priorities(orders, steps, reference_date=DAY)
+    path_days = {po_id: data['total_time']
+                 for po_id, data in PriorityAgent()._calculate_critical_paths(orders, steps).items()}
+    assert [po.effective_priority for po in orders] == pytest.approx(baseline_priorities(orders, DAY, path_days))
+
+def test_empty_orders():
+    assert PriorityEngine(DAY).compute([]) == []
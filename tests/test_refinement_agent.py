@@ -0,0 +1,62 @@
+import datetime
+import time
+import pytest
+
+pytest.importorskip("dotenv")
+
+from src.example_data import create_stations, create_employees, create_purchase_orders, create_production_steps
+from src.agents.step_sequencer import StepSequencer
+from src.agents.resource_assigner import ResourceAssigner
+from src.agents.constraints_agent import ConstraintsAgent
+from src.agents.refinement_agent import RefinementAgent
+
+DAY = datetime.date(2025, 2, 18)
+
+@pytest.fixture
+def problem():
+    dates = [DAY + datetime.timedelta(days=i) for i in range(10)]
+    steps = create_production_steps()
+    employees = create_employees(dates)
+    orders = create_purchase_orders(DAY)
+    schedule = StepSequencer(station_list=create_stations(), date_list=dates).create_schedule(orders, steps)
+    ResourceAssigner(employees).assign_resources(schedule, steps)
+    return schedule, steps, employees, orders
+
+def score(schedule):
+    return float(sum(1 for task in schedule if task.employee_id))
+
+def test_late_llm_answer_is_applied_to_the_schedule_it_was_asked_about(problem, monkeypatch):
+    schedule, steps, employees, orders = problem
+    agent = RefinementAgent()
+    applied_to = []
+
+    def slow_answer(*args):
+        time.sleep(0.3)  # Local search replaces the best schedule meanwhile
+        return '{"modifications": []}'
+
+    def record(result, scheduled_tasks, *args):
+        applied_to.append(scheduled_tasks)
+        return scheduled_tasks
+
+    monkeypatch.setattr(agent, "_request_improvements", slow_answer)
+    monkeypatch.setattr(agent, "_apply_improvements", record)
+    agent.refine_anytime(schedule, score, ConstraintsAgent(), steps, employees, orders, time_budget=1.0)
+
+    assert len(applied_to) == 1 and applied_to[0] is schedule
+
+@pytest.mark.parametrize("answer", ['{"modifications": 5}', '{"modifications": [5, "x", null]}', '[1, 2]'])
+def test_malformed_modifications_leave_the_schedule_unchanged(problem, answer):
+    schedule, steps, employees, _ = problem
+    agent = RefinementAgent()
+    result = agent._apply_improvements(answer, schedule, score, ConstraintsAgent(), steps, employees)
+    assert result is schedule
+
+def test_local_refinement_is_reproducible(problem, monkeypatch):
+    schedule, steps, employees, _ = problem
+    agent = RefinementAgent()
+    first = agent.refine_locally(schedule, score, ConstraintsAgent(), steps, employees)
+    # A slower clock must not change the result: the iteration cap ends the run, not the time budget
+    clock = time.perf_counter
+    monkeypatch.setattr(time, "perf_counter", lambda: clock() * 1.5)
+    second = agent.refine_locally(schedule, score, ConstraintsAgent(), steps, employees)
+    assert first == second
@@ -0,0 +1,27 @@
+import datetime
+import pytest
+
+pytest.importorskip("dotenv")
+
+from src.models.employee import Employee
+from src.models.production_step import ProductionStep
+from src.models.scheduled_task import ScheduledTask
+from src.agents.resource_assigner import ResourceAssigner
+
+DAY = datetime.date(2025, 2, 18)
+
+def test_matching_sizes_copies_per_activity():
+    # One X worker on the AM shift for three X tasks, ten O workers for ten O tasks
+    employees = [
+        Employee("X1", "X1", {"X"}, {DAY}),
+        Employee("X2", "X2", {"X"}, {DAY}, am_shift_available=False),
+    ] + [Employee(f"O{i}", f"O{i}", {"O"}, {DAY}) for i in range(10)]
+    steps = ([ProductionStep(f"SX{i}", "P", "X", 1, 0.1, 0, 0) for i in range(3)] +
+             [ProductionStep(f"SO{i}", "P", "O", 1, 0.1, 0, 0) for i in range(10)])
+    tasks = [ScheduledTask(f"S{i}", DAY, "AM", "P", step.step_id, step.activity_id)
+             for i, step in enumerate(steps)]
+
+    ResourceAssigner(employees, "matching").assign_resources(tasks, steps)
+
+    assert [task.employee_id for task in tasks[:3]] == ["X1"] * 3  # X2 is off shift
+    assert len({task.employee_id for task in tasks[3:]}) == 10
@@ -0,0 +1,28 @@
+import datetime
+import pytest
+
+pytest.importorskip("dotenv")
+
+from src.example_data import create_stations, create_employees, create_purchase_orders, create_production_steps
+from src.rolling_horizon import RollingHorizonScheduler
+
+START = datetime.date(2025, 2, 18)
+
+def test_windows_freeze_tasks_and_carry_units():
+    days = 12
+    scheduler = RollingHorizonScheduler(
+        create_purchase_orders(START), create_production_steps(),
+        create_employees([START + datetime.timedelta(days=i) for i in range(days)]), create_stations(),
+        window_days=6, freeze_days=3, max_iterations=1)
+    tasks = scheduler.run(START, days)
+
+    stats = scheduler.window_stats
+    assert len(stats) >= 2
+    assert [window["start"] for window in stats] == [START + datetime.timedelta(days=3 * i) for i in range(len(stats))]
+    assert all(window["frozen_tasks"] > 0 for window in stats)
+    assert len(tasks) == sum(window["frozen_tasks"] for window in stats)
+    assert len(scheduler.locked_assignments) == len(tasks)
+    # Units finished in earlier windows are not scheduled again
+    units = [(task.step_id, unit) for task in tasks for unit in range(task.units_start, task.units_end + 1)]
+    assert len(units) == len(set(units))
+    assert not scheduler.open_steps()  # The example orders fit in the horizon
@@ -0,0 +1,131 @@
+import datetime
+import random
+import pytest
+
+pytest.importorskip("dotenv")
+
+from src.models.scheduled_task import ScheduledTask
+from src.utils.score_state import ScoreState
+
+DAY = datetime.date(2025, 2, 18)
+DATES = [DAY + datetime.timedelta(days=i) for i in range(10)]
+STATIONS = [f"S{n}" for n in range(1, 13)]
+ACTIVITIES = [f"A{n}" for n in range(1, 5)]
+
+def baseline_score(tasks):
+    """The original SchedulingOrchestrator._score_schedule, without the clamp at zero."""
+    if not tasks:
+        return 0.0
+    shift_usage = {"AM": 0, "PM": 0}
+    station_shifts = {}
+    day_usage = {}
+    station_usage = {}
+    for task in tasks:
+        shift_usage[task.time_slot] += 1
+        station_shifts.setdefault((task.station_id, task.day), set()).add(task.time_slot)
+        day_usage[task.day] = day_usage.get(task.day, 0) + 1
+        station_usage[task.station_id] = station_usage.get(task.station_id, 0) + 1
+
+    total_slots = 12 * 10
+    am_utilization = shift_usage["AM"] / total_slots
+    pm_utilization = shift_usage["PM"] / total_slots
+    daily_penalty = sum((24 - count) * 20 for count in day_usage.values())
+    shift_imbalance_penalty = abs(am_utilization - pm_utilization) * 100
+    station_underuse_penalty = sum((20 - count) * 15 for count in station_usage.values())
+    full_day_bonus = sum(1 for shifts in station_shifts.values() if len(shifts) == 2) * 10
+    high_utilization_bonus = len(tasks) * 5
+
+    activity_changes = 0
+    current_activities = {}  # station_id -> activity_id
+    for task in sorted(tasks, key=lambda t: (t.day, t.time_slot)):
+        previous = current_activities.get(task.station_id)
+        if previous is not None and previous != task.activity_id:
+            activity_changes += 1
+        current_activities[task.station_id] = task.activity_id
+
+    score = ((am_utilization + pm_utilization) / 2) * 2000
+    score += full_day_bonus + high_utilization_bonus
+    score -= (daily_penalty + shift_imbalance_penalty + station_underuse_penalty + activity_changes * 10)
+    return score
+
+def random_task(rng, stations=STATIONS):
+    return ScheduledTask(
+        station_id=rng.choice(stations),
+        day=rng.choice(DATES),
+        time_slot=rng.choice(["AM", "PM"]),
+        purchase_order_id="PO1",
+        step_id="STEP1",
+        activity_id=rng.choice(ACTIVITIES),
+    )
+
+def random_schedule(rng, count, stations=STATIONS):
+    return [random_task(rng, stations) for _ in range(count)]
+
+def test_empty_schedule_scores_zero():
+    assert ScoreState.from_tasks([]).score() == 0.0
+
+@pytest.mark.parametrize("seed", range(20))
+def test_from_tasks_matches_baseline_score(seed):
+    rng = random.Random(seed)
+    # Few stations force tasks sharing a station and shift, where list order decides activity changes
+    stations = STATIONS[:rng.randint(1, len(STATIONS))]
+    tasks = random_schedule(rng, rng.randint(1, 300), stations)
+    state = ScoreState.from_tasks(tasks)
+    assert state.raw_score() == pytest.approx(baseline_score(tasks))
+    assert state.score() == pytest.approx(max(0, baseline_score(tasks)))
+
+def test_positive_score_matches_baseline():
+    # One task per station and shift on every day: a schedule the baseline scores above zero
+    tasks = [
+        ScheduledTask(station_id=station, day=day, time_slot=slot, purchase_order_id="PO1",
+                      step_id="STEP1", activity_id=ACTIVITIES[index % 2])
+        for day in DATES for index, station in enumerate(STATIONS) for slot in ("AM", "PM")
+    ]
+    assert baseline_score(tasks) > 0
+    assert ScoreState.from_tasks(tasks).score() == pytest.approx(baseline_score(tasks))
+
+@pytest.mark.parametrize("seed", range(10))
+def test_incremental_updates_match_rebuilt_state(seed):
+    rng = random.Random(seed)
+    stations = STATIONS[:rng.randint(1, 4)]
+    tasks = dict(enumerate(random_schedule(rng, 50, stations)))
+    state = ScoreState.from_tasks(tasks.values())
+    next_position = len(tasks)
+
+    for _ in range(300):
+        kind = rng.choice(["insert", "remove", "move"]) if tasks else "insert"
+        if kind == "insert":
+            tasks[next_position] = random_task(rng, stations)
+            state.insert(next_position, tasks[next_position])
+            next_position += 1
+        elif kind == "remove":
+            position = rng.choice(list(tasks))
+            del tasks[position]
+            state.remove(position)
+        else:
+            position = rng.choice(list(tasks))
+            moved = random_task(rng, stations)
+            tasks[position] = moved
+            state.move(position, station_id=moved.station_id, day=moved.day,
+                       time_slot=moved.time_slot, activity_id=moved.activity_id)
+
+        # Positions increase with insertion order, so the task list in position order is equivalent
+        ordered = [tasks[position] for position in sorted(tasks)]
+        assert len(state) == len(ordered)
+        assert state.raw_score() == pytest.approx(baseline_score(ordered))
+        assert state.raw_score() == pytest.approx(ScoreState.from_tasks(ordered).raw_score())
+
+def test_undo_restores_the_score():
+    rng = random.Random(7)
+    tasks = random_schedule(rng, 80, STATIONS[:3])
+    state = ScoreState.from_tasks(tasks)
+    before = state.raw_score()
+    undos = [
+        state.apply(("insert", 100, random_task(rng))),
+        state.apply(("remove", 3)),
+        state.apply(("move", 10, {"station_id": "S1", "time_slot": "PM", "activity_id": "A4"})),
+    ]
+    for undo in reversed(undos):
+        state.undo(undo)
+    assert state.raw_score() == pytest.approx(before)
+    assert state.raw_score() == pytest.approx(baseline_score(tasks))
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import pytest
+
+pytest.importorskip("dotenv")
+
+from src.service import SchedulingService, ServiceError, load_problem
+
+@pytest.fixture
+def service():
+    return SchedulingService(*load_problem(None, 5))
+
+def post_progress(service, payload):
+    return asyncio.run(service.handle("POST", "/progress", {}, json.dumps(payload).encode()))
+
+def test_progress_replaces_steps(service):
+    step_id, step = next(iter(service.steps.items()))
+    status, _, _ = post_progress(service, {"updates": [{"step_id": step_id, "percent_complete": 40}]})
+    assert status == 200
+    assert service.steps[step_id].percent_complete == 40.0
+    assert service.steps[step_id] is not step and step.percent_complete == 0.0
+
+@pytest.mark.parametrize("updates", [5, "updates", [5], [{"step_id": ["x"]}], [{"percent_complete": 1}]])
+def test_malformed_progress_is_rejected(service, updates):
+    with pytest.raises(ServiceError) as error:
+        post_progress(service, {"updates": updates})
+    assert error.value.status in (400, 404)
+
+def test_progress_is_all_or_nothing(service):
+    first, second = list(service.steps)[:2]
+    version = service.version
+    with pytest.raises(ServiceError) as error:
+        post_progress(service, {"updates": [{"step_id": first, "percent_complete": 50},
+                                            {"step_id": second, "percent_complete": "half"}]})
+    assert error.value.status == 400
+    assert service.steps[first].percent_complete == 0.0 and service.version == version
+
+def post_orders(service, payload):
+    return asyncio.run(service.handle("POST", "/orders", {}, json.dumps(payload).encode()))
+
+ORDER = {"id": "PO-NEW", "due_date": "2025-03-01", "base_priority": 50, "value": 10.0, "units": 5}
+STEP = {"step_id": "NEW-1", "purchase_order_id": "PO-NEW", "activity_id": "A1", "step_order": 1,
+        "duration_days": 0.5, "setup_time_days": 0.0, "teardown_time_days": 0.0}
+
+def test_orders_are_added(service):
+    second = dict(STEP, step_id="NEW-2", step_order=2, depends_on=["NEW-1"])
+    status, _, _ = post_orders(service, {"purchase_orders": [ORDER], "steps": [STEP, second]})
+    assert status == 200
+    assert service.orders["PO-NEW"].units == 5 and service.steps["NEW-2"].depends_on == ["NEW-1"]
+
+@pytest.mark.parametrize("payload", [
+    {"purchase_orders": [dict(ORDER, units="5")]},
+    {"purchase_orders": [dict(ORDER, units=0)]},
+    {"purchase_orders": [ORDER], "steps": [dict(STEP, duration_days="1")]},
+    {"purchase_orders": [ORDER], "steps": [dict(STEP, depends_on=["NO-SUCH-STEP"])]},
+    {"purchase_orders": [ORDER], "steps": [dict(STEP, depends_on=["NEW-2"]),
+                                           dict(STEP, step_id="NEW-2", depends_on=["NEW-1"])]},
+])
+def test_invalid_orders_are_rejected_without_changes(service, payload):
+    orders, steps, version = dict(service.orders), dict(service.steps), service.version
+    with pytest.raises(ServiceError) as error:
+        post_orders(service, payload)
+    assert error.value.status == 400
+    assert service.orders == orders and service.steps == steps and service.version == version
+
+def test_order_with_dependants_elsewhere_is_kept(service):
+    post_orders(service, {"purchase_orders": [ORDER], "steps": [dict(STEP, depends_on=[next(iter(service.steps))])]})
+    po_id = service.steps[next(iter(service.steps))].purchase_order_id
+    with pytest.raises(ServiceError) as error:
+        asyncio.run(service.handle("DELETE", f"/orders/{po_id}", {}, b""))
+    assert error.value.status == 400 and po_id in service.orders
+    status, _, _ = asyncio.run(service.handle("DELETE", "/orders/PO-NEW", {}, b""))
+    assert status == 200
@@ -0,0 +1,61 @@
+import datetime
+import multiprocessing
+import pickle
+import pytest
+
+pytest.importorskip("dotenv")
+
+from src.example_data import (create_activities, create_stations, create_employees,
+                              create_purchase_orders, create_production_steps)
+from src.utils.snapshot import ProblemInstance, write_snapshot
+
+START = datetime.date(2025, 2, 18)
+
+@pytest.fixture
+def problem():
+    dates = [START + datetime.timedelta(days=i) for i in range(10)]
+    employees = create_employees(dates)
+    employees[0].shift_availability = {START: {"AM"}}
+    return (create_purchase_orders(START), create_production_steps(), employees,
+            create_stations(), create_activities())
+
+@pytest.fixture
+def snapshot(tmp_path, problem):
+    path = str(tmp_path / "example.snap")
+    write_snapshot(path, *problem)
+    return path
+
+def test_round_trip(snapshot, problem):
+    with ProblemInstance(snapshot) as instance:
+        assert instance.load() == problem
+        steps = problem[1]
+        assert instance.step(steps[-1].step_id) == steps[-1]
+
+def test_pickle_reopens_the_file(snapshot, problem):
+    with ProblemInstance(snapshot) as instance:
+        data = pickle.dumps(instance)
+        assert len(data) < 200  # The path, not the records
+    with pickle.loads(data) as copy:
+        assert copy.path == snapshot and copy.load() == problem
+
+def _order_count(instance: ProblemInstance) -> int:
+    return len(instance.purchase_orders)
+
+def test_worker_processes_receive_the_snapshot(snapshot, problem):
+    with ProblemInstance(snapshot) as instance:
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            assert pool.map(_order_count, [instance]) == [len(problem[0])]
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "not.snap"
+    path.write_bytes(b"x" * 200)
+    with pytest.raises(ValueError, match="not a problem snapshot"):
+        ProblemInstance(str(path))
+
+def test_cli_writes_the_example_data(run_module, tmp_path, problem):
+    result = run_module("src.utils.snapshot", "example.snap", "--from-example", "--start", START.isoformat())
+    assert result.returncode == 0, result.stderr
+    with ProblemInstance(str(tmp_path / "example.snap")) as instance:
+        orders, steps, employees, stations, activities = instance.load()
+    assert (orders, steps, stations, activities) == (problem[0], problem[1], problem[3], problem[4])
+    assert [employee.id for employee in employees] == [employee.id for employee in problem[2]]